@@ -4,7 +4,10 @@
 # ============================================================================
 
 from .batch_analyze import router as batch_analyze_router
+from .jobs import router as jobs_router, get_job_manager
 
 __all__ = [
     "batch_analyze_router",
+    "jobs_router",
+    "get_job_manager",
 ]
@@ -5,44 +5,95 @@
 #
 # Execution Flow:
 # 1. Accept list of texts
-# 2. Normalize + hash each text
-# 3. Check cache for each text
-# 4. Split into cached / uncached texts
-# 5. Determine batch size (user-provided or adaptive)
-# 6. Chunk uncached texts into batches
-# 7. Run inference batch-by-batch
-# 8. Store new results in cache
-# 9. Merge cached + new results
-# 10. Return results in ORIGINAL ORDER
+# 2. Determine batch size (user-provided or adaptive)
+# 3. On the inference executor's bulk lane, NLP_BULK_CHUNK_SIZE unique
+#    texts per task (interactive and streaming requests run between
+#    chunks, see app.core.executor):
+#    - Collapse duplicate texts; hash each unique text once
+#    Then per model:
+#    a. Look up every text's cached raw output in one cache call
+#       (see app.core.model_cache)
+#    b. Bucket the misses into batches of similar token length
+#    c. Run only the misses and cache their outputs
+# 4. Summarize each text from its (cached or new) model outputs
+# 5. Return results in ORIGINAL ORDER
 #
 # Guarantees:
 # - Output order == input order
 # - Cached vs uncached results are indistinguishable
-# - No inference on cached inputs
+# - No inference on cached inputs (per model: outputs cached by /analyze,
+#   streaming or any other service are reused here, and vice versa)
+# - Identical texts in one request are inferred once
+# - Texts another request is already running are waited for, not re-run
+#   (single-flight, see app.core.singleflight)
+#
+# Streaming ingestion (/batch-analyze/stream):
+# - Request body is NDJSON read as it arrives (no 1,000-text cap)
+# - Lines are grouped into chunks; chunk N+1 is parsed while chunk N runs
+#   the same batch path (cache lookup -> batched inference)
+# - At most NLP_STREAM_MAX_INFLIGHT chunks are in flight; reading the body
+#   pauses until one finishes, so memory stays bounded for any input size
+# - Results are written as NDJSON in input order, or as each chunk
+#   completes (ordered=false, rows carry their id / index)
+#
+# Admission (see app.core.admission): /batch-analyze runs in the batch
+# class with its text count as cost; a stream holds one stream-class slot
+# until it ends. Shed requests get 429 with Retry-After.
+#
+# Configuration (env):
+# - NLP_STREAM_CHUNK_SIZE: texts per inference chunk (default: 64)
+# - NLP_STREAM_MAX_INFLIGHT: chunks running at once per stream (default: 2)
+# - NLP_STREAM_MAX_LINE_BYTES: longest accepted input line (default: 1 MiB)
 # ============================================================================
 
+import asyncio
+import json
 import logging
+import os
 import time
-from typing import Optional, List, Dict, Any
+from collections import Counter, deque
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Deque
 
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+from starlette.requests import ClientDisconnect
 
-from app.core.cache import InferenceCache, get_cache, normalize_text
+from app.core.cache import get_cache
 from app.core.batching import (
-    chunk_texts,
     BatchConfig,
     BatchingStats,
+    PaddingStats,
+    DEFAULT_BATCH_SIZE,
     MIN_BATCH_SIZE,
     MAX_BATCH_SIZE,
     calculate_num_batches,
 )
 from app.core.adaptive import get_batch_sizer
+from app.core.admission import (
+    BATCH_CLASS,
+    STREAM_CLASS,
+    get_admission_controller,
+    parse_deadline_ms,
+    release_after,
+)
+from app.core.executor import BULK_LANE, get_executor, run_inference
+from app.core.serialization import dumps
+from app.core.singleflight import get_single_flight
+from app.responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Batch Analysis"])
 
+# Streaming ingestion defaults
+DEFAULT_STREAM_CHUNK_SIZE = 64
+DEFAULT_STREAM_MAX_INFLIGHT = 2
+DEFAULT_STREAM_MAX_LINE_BYTES = 1024 * 1024
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 # ============================================================================
 # REQUEST / RESPONSE SCHEMAS
@@ -82,6 +133,37 @@ class BatchAnalyzeResponse(BaseModel):
 # INFERENCE HELPERS
 # ============================================================================
 
+def summarize_full_result(item: Any) -> Dict[str, Any]:
+    """Collapse a FullAnalysisResponse into the summary dict."""
+    sentiment_score = 0.0
+    confidence = 0.5
+    primary_emotion = "neutral"
+    entities = []
+
+    if item.finance_sentiment and item.finance_sentiment.ensemble:
+        sentiment_score = item.finance_sentiment.ensemble.raw_score
+        confidence = item.finance_sentiment.ensemble.confidence
+    elif item.social_sentiment:
+        label_map = {"positive": 0.5, "neutral": 0.0, "negative": -0.5}
+        sentiment_score = label_map.get(item.social_sentiment.label.lower(), 0.0)
+        confidence = item.social_sentiment.confidence
+
+    if item.emotion:
+        primary_emotion = item.emotion.primary_emotion
+        if item.emotion.primary_score > confidence:
+            confidence = item.emotion.primary_score
+
+    if item.ner and item.ner.entities:
+        entities = [e.entity for e in item.ner.entities[:10]]  # Limit to 10
+
+    return {
+        "sentiment": round(sentiment_score, 3),
+        "emotion": primary_emotion,
+        "entities": entities,
+        "confidence": round(confidence, 3),
+    }
+
+
 def run_single_inference(
     text: str,
     registry: Any,
@@ -90,46 +172,13 @@ def run_single_inference(
     Run full analysis on a single text using existing services.
 
     This calls the existing core engine without modification.
-    Returns a simplified result dict for caching.
+    Returns a simplified result dict.
     """
     from app.services import analyze_full
 
     try:
         result = analyze_full(text=text, registry=registry)
-
-        # Extract key metrics for cached result
-        sentiment_score = 0.0
-        confidence = 0.5
-        primary_emotion = "neutral"
-        entities = []
-
-        # Get sentiment from finance or social
-        if result.finance_sentiment and result.finance_sentiment.ensemble:
-            sentiment_score = result.finance_sentiment.ensemble.raw_score
-            confidence = result.finance_sentiment.ensemble.confidence
-        elif result.social_sentiment:
-            # Map label to score
-            label_map = {"positive": 0.5, "neutral": 0.0, "negative": -0.5}
-            sentiment_score = label_map.get(result.social_sentiment.label.lower(), 0.0)
-            confidence = result.social_sentiment.confidence
-
-        # Get emotion
-        if result.emotion:
-            primary_emotion = result.emotion.primary_emotion
-            # Use emotion confidence if higher
-            if result.emotion.primary_score > confidence:
-                confidence = result.emotion.primary_score
-
-        # Get entities
-        if result.ner and result.ner.entities:
-            entities = [e.text for e in result.ner.entities[:10]]  # Limit to 10
-
-        return {
-            "sentiment": round(sentiment_score, 3),
-            "emotion": primary_emotion,
-            "entities": entities,
-            "confidence": round(confidence, 3),
-        }
+        return summarize_full_result(result)
 
     except Exception as e:
         logger.error(f"Inference error: {e}")
@@ -145,49 +194,28 @@ def run_single_inference(
 def run_batch_inference(
     texts: List[str],
     registry: Any,
-) -> List[Dict[str, Any]]:
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Run full analysis on a batch of texts.
 
-    Uses existing batch_full_analysis for efficiency.
+    Uses existing batch_full_analysis with shared tokenization and length
+    bucketing: texts are tokenized once per vocabulary, grouped into
+    batches of similar token count, and results are returned in input order.
+
+    Returns:
+        Tuple of (summary dict per text, run stats: padding and
+        tokenize-vs-forward timing)
     """
-    from app.services import batch_full_analysis
+    from app.services import batch_full_analysis_with_stats
 
     try:
-        batch_result = batch_full_analysis(texts=texts, registry=registry)
-
-        results = []
-        for item in batch_result.results:
-            # Extract key metrics
-            sentiment_score = 0.0
-            confidence = 0.5
-            primary_emotion = "neutral"
-            entities = []
-
-            if item.finance_sentiment and item.finance_sentiment.ensemble:
-                sentiment_score = item.finance_sentiment.ensemble.raw_score
-                confidence = item.finance_sentiment.ensemble.confidence
-            elif item.social_sentiment:
-                label_map = {"positive": 0.5, "neutral": 0.0, "negative": -0.5}
-                sentiment_score = label_map.get(item.social_sentiment.label.lower(), 0.0)
-                confidence = item.social_sentiment.confidence
-
-            if item.emotion:
-                primary_emotion = item.emotion.primary_emotion
-                if item.emotion.primary_score > confidence:
-                    confidence = item.emotion.primary_score
-
-            if item.ner and item.ner.entities:
-                entities = [e.text for e in item.ner.entities[:10]]
-
-            results.append({
-                "sentiment": round(sentiment_score, 3),
-                "emotion": primary_emotion,
-                "entities": entities,
-                "confidence": round(confidence, 3),
-            })
-
-        return results
+        batch_result, run_stats = batch_full_analysis_with_stats(
+            texts=texts,
+            registry=registry,
+            batch_size=batch_size,
+        )
+        return [summarize_full_result(item) for item in batch_result.results], run_stats
 
     except Exception as e:
         logger.error(f"Batch inference error: {e}")
@@ -195,7 +223,65 @@ def run_batch_inference(
         return [
             {"sentiment": 0.0, "emotion": "neutral", "entities": [], "confidence": 0.0}
             for _ in texts
-        ]
+        ], {}
+
+
+def merge_run_stats(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-chunk run stats: counts and timings add up, the padding
+    ratio is recomputed, anything else keeps its first value."""
+    merged: Dict[str, Any] = {}
+    for stats in parts:
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                totals = merged.setdefault(key, {})
+                for name, amount in value.items():
+                    totals[name] = round(totals.get(name, 0) + amount, 2)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = round(merged.get(key, 0) + value, 2)
+            else:
+                merged.setdefault(key, value)
+
+    if "tokens_processed" in merged:
+        padding = PaddingStats(merged["tokens_processed"], merged.get("tokens_padded", 0))
+        merged["padding_ratio"] = round(padding.padding_ratio, 3)
+    return merged
+
+
+async def run_bulk_inference(
+    texts: List[str],
+    registry: Any,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    run_batch_inference on the executor's bulk lane, one task per chunk of
+    unique texts, so higher-priority requests run between chunks.
+
+    Every occurrence of a text goes in the same chunk, so duplicates are
+    still inferred once and per-text stats add up exactly.
+    """
+    counts = Counter(texts)
+
+    def run_chunk(chunk: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+        chunk_texts = [text for text in chunk for _ in range(counts[text])]
+        results, run_stats = run_batch_inference(chunk_texts, registry, batch_size)
+        return dict(zip(chunk_texts, results)), run_stats
+
+    parts = await get_executor().run_chunked(run_chunk, list(counts), lane=BULK_LANE)
+
+    by_text: Dict[str, Dict[str, Any]] = {}
+    for chunk_results, _ in parts:
+        by_text.update(chunk_results)
+    return [by_text[text] for text in texts], merge_run_stats([stats for _, stats in parts])
+
+
+def choose_batch_config(batch_size: Optional[int], pending_texts: int) -> BatchConfig:
+    """User-provided batch size, or an adaptive one from CPU load and hit ratio."""
+    if batch_size is not None:
+        return BatchConfig.from_user(batch_size)
+    return get_batch_sizer().compute_batch_size(
+        pending_texts=pending_texts,
+        cache_hit_ratio=get_cache().get_stats().get("hit_ratio", 0.0),
+    )
 
 
 # ============================================================================
@@ -221,9 +307,13 @@ async def batch_analyze(
     - If not provided: system determines based on CPU load
 
     **Caching:**
-    - Normalized text hashed as cache key
+    - Raw outputs cached per model, keyed by model revision and text hash
+    - Shared with every other analysis endpoint
     - 24-hour TTL
-    - Cached results returned instantly
+
+    **Admission:**
+    - Bounded concurrency; optional `X-Deadline-Ms` header
+    - 429 with Retry-After when over capacity or the deadline can't be met
     """
     start_time = time.time()
     texts = body.texts
@@ -232,101 +322,42 @@ async def batch_analyze(
     if total_texts == 0:
         return BatchAnalyzeResponse(results=[], stats={"total_texts": 0})
 
-    # Get cache and batch sizer
-    cache = get_cache()
-    batch_sizer = get_batch_sizer()
-
     # Get model registry from app state
     registry = request.app.state.models
 
     # =========================================================================
-    # Step 1: Check cache for all texts
-    # =========================================================================
-    cached_results: Dict[int, Dict[str, Any]] = {}  # index -> result
-    uncached_indices: List[int] = []
-    uncached_texts: List[str] = []
-
-    for i, text in enumerate(texts):
-        cached = cache.get(text)
-        if cached is not None:
-            cached_results[i] = cached
-        else:
-            uncached_indices.append(i)
-            uncached_texts.append(text)
-
-    cached_count = len(cached_results)
-    uncached_count = len(uncached_texts)
-
-    logger.info(f"Cache lookup: {cached_count}/{total_texts} hits")
-
-    # =========================================================================
-    # Step 2: Determine batch size
+    # Step 1: Determine batch size (user-provided or adaptive)
     # =========================================================================
-    if body.batch_size is not None:
-        # User-provided batch size
-        batch_config = BatchConfig.from_user(body.batch_size)
-    else:
-        # Adaptive batch size
-        cache_stats = cache.get_stats()
-        batch_config = batch_sizer.compute_batch_size(
-            pending_texts=uncached_count,
-            cache_hit_ratio=cache_stats.get("hit_ratio", 0.0),
-        )
-
+    batch_config = choose_batch_config(body.batch_size, total_texts)
     batch_size = batch_config.batch_size
-    num_batches = calculate_num_batches(uncached_count, batch_size)
 
     # =========================================================================
-    # Step 3: Process uncached texts in batches
+    # Step 2: Run inference (off the event loop, bulk lane) once admitted;
+    # per-model cache lookup and bucketing by token length happen inside
+    # the batch service
     # =========================================================================
-    new_results: Dict[int, Dict[str, Any]] = {}
-
-    if uncached_count > 0:
-        batch_num = 0
-        text_idx = 0
-
-        for batch_texts in chunk_texts(uncached_texts, batch_size):
-            batch_num += 1
-            logger.debug(f"Processing batch {batch_num}/{num_batches} ({len(batch_texts)} texts)")
-
-            # Run inference on batch
-            batch_results = run_batch_inference(batch_texts, registry)
-
-            # Map results back to original indices and cache them
-            for j, result in enumerate(batch_results):
-                original_idx = uncached_indices[text_idx + j]
-                original_text = texts[original_idx]
-
-                new_results[original_idx] = result
+    async with get_admission_controller().admit(
+        BATCH_CLASS, cost=total_texts, deadline_ms=parse_deadline_ms(request.headers)
+    ):
+        batch_results, run_stats = await run_bulk_inference(texts, registry, batch_size)
 
-                # Store in cache
-                cache.set(original_text, result)
+    cached_count = run_stats.pop("cached_texts", 0)
+    uncached_count = total_texts - cached_count
+    # Duplicates of an inferred text ride along with it
+    num_batches = calculate_num_batches(run_stats.get("inferred_texts", uncached_count), batch_size)
 
-            text_idx += len(batch_texts)
+    logger.info(
+        f"Cache lookup: {cached_count}/{total_texts} texts fully cached, "
+        f"{run_stats.get('duplicate_texts', 0)} duplicates"
+    )
 
     # =========================================================================
-    # Step 4: Merge results in original order
+    # Step 3: Results are already in original order
     # =========================================================================
-    final_results: List[AnalysisResult] = []
-
-    for i in range(total_texts):
-        if i in cached_results:
-            result_dict = cached_results[i]
-        elif i in new_results:
-            result_dict = new_results[i]
-        else:
-            # Should never happen, but fallback just in case
-            result_dict = {
-                "sentiment": 0.0,
-                "emotion": "neutral",
-                "entities": [],
-                "confidence": 0.0,
-            }
-
-        final_results.append(AnalysisResult(**result_dict))
+    final_results = [AnalysisResult(**result_dict) for result_dict in batch_results]
 
     # =========================================================================
-    # Step 5: Build stats
+    # Step 4: Build stats
     # =========================================================================
     elapsed_ms = int((time.time() - start_time) * 1000)
 
@@ -346,12 +377,294 @@ async def batch_analyze(
         f"{elapsed_ms}ms"
     )
 
-    return BatchAnalyzeResponse(
+    # Built and validated here: skip response_model re-validation
+    return FastJSONResponse(BatchAnalyzeResponse(
         results=final_results,
         stats={
             **stats.to_dict(),
+            **run_stats,
             "elapsed_ms": elapsed_ms,
         },
+    ))
+
+
+# ============================================================================
+# STREAMING INGESTION
+# ============================================================================
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = DEFAULT_STREAM_MAX_LINE_BYTES,
+) -> AsyncIterator[bytes]:
+    """
+    Split a byte stream into non-empty lines as it arrives.
+
+    A line longer than max_line_bytes is yielded as b"" (rejected by
+    parse_stream_line) and the rest of it is skipped.
+    """
+    buffer = bytearray()
+    oversized = False
+
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            end = buffer.find(b"\n")
+            if end < 0:
+                break
+            line = bytes(buffer[:end])
+            del buffer[:end + 1]
+            if oversized:
+                oversized = False
+            elif line.strip():
+                yield line
+
+        if len(buffer) > max_line_bytes:
+            if not oversized:
+                yield b""
+            oversized = True
+            buffer.clear()
+
+    if buffer.strip() and not oversized:
+        yield bytes(buffer)
+
+
+def parse_stream_line(line: bytes) -> Tuple[Any, str]:
+    """
+    Parse one NDJSON input line.
+
+    Accepts a JSON string or an object {"text": ..., "id": ...} (id
+    optional, echoed back).
+
+    Returns:
+        Tuple of (id or None, text)
+
+    Raises:
+        ValueError: If the line is not valid input
+    """
+    if not line:
+        raise ValueError("line too long")
+    try:
+        item = json.loads(line)
+    except ValueError:
+        raise ValueError("invalid JSON")
+
+    if isinstance(item, str):
+        item_id, text = None, item
+    elif isinstance(item, dict):
+        item_id, text = item.get("id"), item.get("text")
+    else:
+        raise ValueError("expected a string or an object with 'text'")
+
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("'text' must be a non-empty string")
+    return item_id, text
+
+
+async def stream_batch_analysis(
+    lines: AsyncIterator[bytes],
+    registry: Any,
+    batch_size: Optional[int] = None,
+    ordered: bool = True,
+    include_stats: bool = False,
+    chunk_size: Optional[int] = None,
+    max_inflight: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Analyze NDJSON input lines and yield NDJSON result rows.
+
+    Each row is {"index": n, "id": ..., **result} (id only when the input
+    line had one) or {"index": n, "error": "..."} for a rejected line.
+    With include_stats a final {"stats": {...}} row follows.
+    """
+    chunk_size = chunk_size or int(os.getenv("NLP_STREAM_CHUNK_SIZE", DEFAULT_STREAM_CHUNK_SIZE))
+    max_inflight = max_inflight or int(os.getenv("NLP_STREAM_MAX_INFLIGHT", DEFAULT_STREAM_MAX_INFLIGHT))
+
+    start_time = time.time()
+    totals = {"total_texts": 0, "errors": 0, "chunks": 0, "cached_texts": 0, "duplicate_texts": 0}
+
+    # (index, id, text or None, error or None) per input line
+    Item = Tuple[int, Any, Optional[str], Optional[str]]
+    in_flight: Deque[asyncio.Task] = deque()
+
+    async def run_chunk(items: List[Item]) -> List[Dict[str, Any]]:
+        texts = [text for _, _, text, error in items if error is None]
+        results: List[Dict[str, Any]] = []
+        if texts:
+            batch_config = choose_batch_config(batch_size, len(texts))
+            results, run_stats = await run_inference(
+                run_batch_inference, texts, registry, batch_config.batch_size, lane=BULK_LANE
+            )
+            totals["cached_texts"] += run_stats.get("cached_texts", 0)
+            totals["duplicate_texts"] += run_stats.get("duplicate_texts", 0)
+
+        rows = []
+        analyzed = iter(results)
+        for index, item_id, _, error in items:
+            row: Dict[str, Any] = {"index": index}
+            if item_id is not None:
+                row["id"] = item_id
+            if error is not None:
+                row["error"] = error
+            else:
+                row.update(next(analyzed))
+            rows.append(row)
+        return rows
+
+    def encode(rows: List[Dict[str, Any]]) -> bytes:
+        return b"".join(dumps(row) + b"\n" for row in rows)
+
+    async def finish_one() -> bytes:
+        """Wait for the oldest chunk (ordered) or whichever finishes first."""
+        if ordered:
+            return encode(await in_flight.popleft())
+
+        done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        finished = [task for task in in_flight if task in done]
+        remaining = [task for task in in_flight if task not in done]
+        in_flight.clear()
+        in_flight.extend(remaining)
+        return b"".join(encode(task.result()) for task in finished)
+
+    def submit(items: List[Item]) -> None:
+        totals["chunks"] += 1
+        in_flight.append(asyncio.ensure_future(run_chunk(items)))
+
+    try:
+        chunk: List[Item] = []
+        index = 0
+        async for line in lines:
+            try:
+                item_id, text = parse_stream_line(line)
+                chunk.append((index, item_id, text, None))
+            except ValueError as e:
+                totals["errors"] += 1
+                chunk.append((index, None, None, str(e)))
+            index += 1
+
+            if len(chunk) >= chunk_size:
+                submit(chunk)
+                chunk = []
+                # Backpressure: stop reading input while the pipeline is full
+                while len(in_flight) >= max_inflight:
+                    yield await finish_one()
+
+        if chunk:
+            submit(chunk)
+        while in_flight:
+            yield await finish_one()
+
+        totals["total_texts"] = index
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        logger.info(
+            f"Batch analyze stream complete: {index} lines ({totals['errors']} rejected, "
+            f"{totals['cached_texts']} cached) in {totals['chunks']} chunks, {elapsed_ms}ms"
+        )
+        if include_stats:
+            yield encode([{"stats": {**totals, "elapsed_ms": elapsed_ms}}])
+
+    except ClientDisconnect:
+        # Raised by request.stream() when the client drops mid-upload
+        logger.info(
+            f"Batch analyze stream: client disconnected after {index} lines, "
+            f"cancelling {len(in_flight)} chunks"
+        )
+
+    finally:
+        # Client went away: don't leave chunks running for nobody
+        for task in in_flight:
+            task.cancel()
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response for an endpoint still reading its request body.
+
+    Under ASGI < 2.4 Starlette's StreamingResponse listens for client
+    disconnect by calling receive() alongside the body stream, which
+    swallows body messages meant for request.stream() and stalls the
+    upload. Here the listener waits until the upload has been read
+    (`upload_done`, see read_upload): until then request.stream() is the
+    only reader and a disconnect surfaces from it (ClientDisconnect);
+    after that, disconnects are detected as usual.
+    """
+
+    def __init__(self, *args: Any, upload_done: asyncio.Event, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.upload_done = upload_done
+
+    async def listen_for_disconnect(self, receive) -> None:
+        await self.upload_done.wait()
+        await super().listen_for_disconnect(receive)
+
+
+async def read_upload(request: Request, done: asyncio.Event) -> AsyncIterator[bytes]:
+    """request.stream(), setting `done` once the body has been read (or the read failed)."""
+    try:
+        async for chunk in request.stream():
+            yield chunk
+    finally:
+        done.set()
+
+
+@router.post("/batch-analyze/stream")
+async def batch_analyze_stream(
+    request: Request,
+    ordered: bool = Query(True, description="Emit rows in input order (false: as chunks finish)"),
+    batch_size: Optional[int] = Query(
+        None,
+        ge=MIN_BATCH_SIZE,
+        le=MAX_BATCH_SIZE,
+        description=f"Optional batch size ({MIN_BATCH_SIZE}-{MAX_BATCH_SIZE}). If not provided, system determines optimal size.",
+    ),
+    stats: bool = Query(False, description="Append a final {\"stats\": ...} row"),
+) -> StreamingResponse:
+    """
+    Analyze an unbounded NDJSON stream of texts with bounded memory.
+
+    **Request body (application/x-ndjson), one item per line:**
+    ```
+    "Apple beats earnings expectations"
+    {"id": "row-2", "text": "Oil prices fall on supply glut"}
+    ```
+
+    **Response (application/x-ndjson), one row per input line:**
+    ```
+    {"index": 0, "sentiment": 0.62, "emotion": "joy", "entities": ["Apple"], "confidence": 0.91}
+    {"index": 1, "id": "row-2", "sentiment": -0.4, ...}
+    {"index": 2, "error": "invalid JSON"}
+    ```
+
+    Input is read, analyzed and answered chunk by chunk, so results start
+    flowing before the upload finishes. Same caching and batching as
+    /batch-analyze.
+    """
+    registry = request.app.state.models
+    ticket = await get_admission_controller().acquire(
+        STREAM_CLASS, deadline_ms=parse_deadline_ms(request.headers)
+    )
+    upload_done = asyncio.Event()
+
+    return DuplexStreamingResponse(
+        release_after(
+            stream_batch_analysis(
+                iter_ndjson_lines(
+                    read_upload(request, upload_done),
+                    int(os.getenv("NLP_STREAM_MAX_LINE_BYTES", DEFAULT_STREAM_MAX_LINE_BYTES)),
+                ),
+                registry,
+                batch_size=batch_size,
+                ordered=ordered,
+                include_stats=stats,
+            ),
+            ticket,
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        },
+        background=BackgroundTask(ticket.release),
+        upload_done=upload_done,
     )
 
 
@@ -360,10 +673,16 @@ async def batch_analyze(
 # ============================================================================
 
 @router.get("/batch-analyze/cache/stats")
-async def get_cache_stats() -> Dict[str, Any]:
-    """Get cache statistics."""
+async def get_cache_stats(request: Request) -> Dict[str, Any]:
+    """Get cache statistics, with output-cache hit ratios per model and
+    single-flight (coalesced miss) counters."""
     cache = get_cache()
-    return cache.get_stats()
+    registry = getattr(request.app.state, "models", None)
+    return {
+        **cache.get_stats(),
+        "models": registry.get_model_cache_stats() if registry is not None else {},
+        "single_flight": get_single_flight().get_stats(),
+    }
 
 
 @router.post("/batch-analyze/cache/clear", include_in_schema=False)
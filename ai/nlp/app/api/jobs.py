@@ -0,0 +1,789 @@
+# ============================================================================
+# BATCH JOBS API
+# Asynchronous batch analysis with background workers and result polling
+# ============================================================================
+#
+# Large backfills through /batch-analyze hold an HTTP connection open for
+# minutes and die on proxy timeouts. A job is submitted once and processed
+# in the background:
+#
+# 1. POST /jobs stores the texts on disk and queues the job (202)
+# 2. Worker tasks take jobs off an in-process queue and run them chunk by
+#    chunk through the batch inference path (same per-model cache,
+#    dedup, single-flight and bucketing as /batch-analyze) on the
+#    executor's bulk lane, below interactive and streaming requests
+# 3. Every chunk's results are committed with the job's progress, so a
+#    restart resumes after the last finished chunk instead of starting over
+# 4. GET /jobs/{id} reports progress, throughput and ETA;
+#    GET /jobs/{id}/results pages through results as they are produced
+#
+# Jobs wait for the required models (/ready) before running.
+#
+# Every gunicorn worker runs its own JobManager on the same database. A
+# worker claims a job atomically before running it: the claim takes a
+# queued job, or a running one whose lease has expired (its owner died),
+# and records the owner and lease in the job row. The lease is renewed
+# with every committed chunk; a worker that lost its lease stops. Expired
+# leases are rescanned periodically, so a dead worker's job is resumed by
+# another.
+#
+# Configuration (env):
+# - NLP_JOBS_PATH: SQLite file holding jobs and results
+#   (default: jobs.db in NLP_DATA_DIR)
+# - NLP_JOB_WORKERS: jobs processed concurrently (default: 1)
+# - NLP_JOB_CHUNK_SIZE: texts per chunk / checkpoint (default: 256)
+# - NLP_JOB_MAX_TEXTS: max texts per job (default: 100000)
+# - NLP_JOB_RETENTION_HOURS: finished jobs kept before purge (default: 168)
+# - NLP_JOB_LEASE_SECONDS: claim lease, longer than one chunk takes
+#   (default: 300)
+# ============================================================================
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from app.api.batch_analyze import AnalysisResult, choose_batch_config, summarize_full_result
+from app.core.batching import MAX_BATCH_SIZE, MIN_BATCH_SIZE
+from app.core.executor import BULK_LANE, get_executor
+from app.core.paths import data_path
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Batch Jobs"])
+
+
+# Defaults
+DEFAULT_JOBS_FILENAME = "jobs.db"
+DEFAULT_JOB_WORKERS = 1
+DEFAULT_JOB_CHUNK_SIZE = 256
+DEFAULT_JOB_MAX_TEXTS = 100_000
+DEFAULT_JOB_RETENTION_HOURS = 168
+DEFAULT_JOB_LEASE_SECONDS = 300.0
+
+# Results per page
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Seconds between readiness checks while models load
+READY_POLL_SECONDS = 1.0
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+UNFINISHED_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+# ============================================================================
+# REQUEST / RESPONSE SCHEMAS
+# ============================================================================
+
+class JobSubmitRequest(BaseModel):
+    """Request to submit a batch analysis job."""
+    texts: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=int(os.getenv("NLP_JOB_MAX_TEXTS", DEFAULT_JOB_MAX_TEXTS)),
+        description="Texts to analyze",
+    )
+    batch_size: Optional[int] = Field(
+        None,
+        ge=MIN_BATCH_SIZE,
+        le=MAX_BATCH_SIZE,
+        description=f"Optional batch size ({MIN_BATCH_SIZE}-{MAX_BATCH_SIZE}). If not provided, system determines optimal size.",
+    )
+
+
+class JobProgress(BaseModel):
+    """Job progress."""
+    total: int = Field(..., description="Texts in the job")
+    processed: int = Field(..., description="Texts analyzed so far")
+    percent: float = Field(..., description="Completion percentage")
+    throughput_per_sec: Optional[float] = Field(None, description="Texts analyzed per second of processing")
+    eta_seconds: Optional[float] = Field(None, description="Estimated seconds until completion")
+
+
+class JobResponse(BaseModel):
+    """Job status."""
+    id: str
+    status: JobStatus
+    created_at: float = Field(..., description="Submission time (epoch seconds)")
+    started_at: Optional[float] = Field(None, description="First processing time (epoch seconds)")
+    finished_at: Optional[float] = Field(None, description="Completion time (epoch seconds)")
+    progress: JobProgress
+    error: Optional[str] = None
+
+
+class JobResultItem(AnalysisResult):
+    """Single text result with its input position."""
+    index: int = Field(..., description="Position of the text in the submitted list")
+
+
+class JobResultsResponse(BaseModel):
+    """One page of job results."""
+    job_id: str
+    status: JobStatus
+    offset: int
+    total: int = Field(..., description="Texts in the job")
+    results: List[JobResultItem]
+    next_offset: Optional[int] = Field(None, description="Offset of the next page (None when this page reaches the end)")
+
+
+# ============================================================================
+# JOB STORE
+# ============================================================================
+
+@dataclass
+class JobRecord:
+    """A job's persisted state."""
+    id: str
+    status: JobStatus
+    total: int
+    processed: int
+    created_at: float
+    batch_size: Optional[int] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    active_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status not in UNFINISHED_STATUSES
+
+    def progress(self) -> Dict[str, Any]:
+        """Progress with throughput (per second of processing) and ETA."""
+        throughput = self.processed / self.active_seconds if self.active_seconds > 0 else None
+        eta = None
+        if throughput and not self.is_finished:
+            eta = round((self.total - self.processed) / throughput, 1)
+        return {
+            "total": self.total,
+            "processed": self.processed,
+            "percent": round(100 * self.processed / self.total, 1) if self.total else 100.0,
+            "throughput_per_sec": round(throughput, 2) if throughput else None,
+            "eta_seconds": eta,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress(),
+            "error": self.error,
+        }
+
+
+_JOB_COLUMNS = (
+    "id, status, total, processed, created_at, batch_size,"
+    " started_at, finished_at, active_seconds, error"
+)
+
+
+def _job_from_row(row: Tuple) -> JobRecord:
+    return JobRecord(
+        id=row[0],
+        status=JobStatus(row[1]),
+        total=row[2],
+        processed=row[3],
+        created_at=row[4],
+        batch_size=row[5],
+        started_at=row[6],
+        finished_at=row[7],
+        active_seconds=row[8],
+        error=row[9],
+    )
+
+
+def get_jobs_path() -> str:
+    """Get configured jobs database path (NLP_JOBS_PATH)."""
+    return os.getenv("NLP_JOBS_PATH") or data_path(DEFAULT_JOBS_FILENAME)
+
+
+class JobStore:
+    """
+    SQLite-backed jobs and per-text results.
+
+    Texts are stored with the job, so memory use does not grow with job
+    size and an interrupted job resumes from its unprocessed texts.
+    Results are written in input order; results for indices below
+    `processed` are final.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or get_jobs_path()
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " total INTEGER NOT NULL,"
+                " processed INTEGER NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL,"
+                " batch_size INTEGER,"
+                " started_at REAL,"
+                " finished_at REAL,"
+                " active_seconds REAL NOT NULL DEFAULT 0,"
+                " error TEXT,"
+                " owner TEXT,"
+                " lease_until REAL)"
+            )
+            # Databases created before leases
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_items ("
+                " job_id TEXT NOT NULL,"
+                " idx INTEGER NOT NULL,"
+                " text TEXT NOT NULL,"
+                " result TEXT,"
+                " PRIMARY KEY (job_id, idx)) WITHOUT ROWID"
+            )
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _transaction(self, statements: List[Tuple[str, Any]]) -> None:
+        """Run (sql, params) statements atomically; params may be a list of rows."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        self._conn.executemany(sql, params)
+                    else:
+                        self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def create(self, texts: List[str], batch_size: Optional[int] = None) -> JobRecord:
+        """Store a new queued job with its texts."""
+        job = JobRecord(
+            id=uuid4().hex,
+            status=JobStatus.QUEUED,
+            total=len(texts),
+            processed=0,
+            created_at=time.time(),
+            batch_size=batch_size,
+        )
+        self._transaction([
+            (
+                "INSERT INTO jobs (id, status, total, created_at, batch_size) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.status.value, job.total, job.created_at, job.batch_size),
+            ),
+            (
+                "INSERT INTO job_items (job_id, idx, text) VALUES (?, ?, ?)",
+                [(job.id, i, text) for i, text in enumerate(texts)],
+            ),
+        ])
+        return job
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return _job_from_row(row) if row else None
+
+    def list_jobs(self, limit: int = 50) -> List[JobRecord]:
+        """Most recently submitted jobs first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [_job_from_row(row) for row in rows]
+
+    def unfinished(self) -> List[JobRecord]:
+        """Queued or interrupted jobs, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                tuple(status.value for status in UNFINISHED_STATUSES),
+            ).fetchall()
+        return [_job_from_row(row) for row in rows]
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Atomically take a job for `owner`: a queued job, or a running one
+        whose lease has expired. Returns whether the claim succeeded.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, started_at = COALESCE(started_at, ?) "
+                "WHERE id = ? AND (status = ? OR (status = ? AND COALESCE(lease_until, 0) < ?))",
+                (
+                    JobStatus.RUNNING.value, owner, now + lease_seconds, now,
+                    job_id, JobStatus.QUEUED.value, JobStatus.RUNNING.value, now,
+                ),
+            )
+            return cursor.rowcount > 0
+
+    def expired(self) -> List[JobRecord]:
+        """Running jobs whose lease has expired (their owner is gone)."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE status = ? AND COALESCE(lease_until, 0) < ? "
+                "ORDER BY created_at",
+                (JobStatus.RUNNING.value, time.time()),
+            ).fetchall()
+        return [_job_from_row(row) for row in rows]
+
+    def set_status(
+        self,
+        job_id: str,
+        status: JobStatus,
+        error: Optional[str] = None,
+        owner: Optional[str] = None,
+    ) -> bool:
+        """
+        Move an unfinished job to a queued or finished `status` (running
+        jobs are taken with claim). Finished jobs never change, so a
+        cancel racing a worker always wins. With `owner`, applies only
+        while that owner holds the job. Returns whether it applied.
+        """
+        now = time.time()
+        unfinished = tuple(s.value for s in UNFINISHED_STATUSES)
+        sql = (
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL "
+            "WHERE id = ? AND status IN (?, ?)"
+        )
+        params: Tuple[Any, ...] = (
+            status.value, error, None if status == JobStatus.QUEUED else now, job_id, *unfinished,
+        )
+        if owner is not None:
+            sql += " AND owner = ?"
+            params += (owner,)
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            return cursor.rowcount > 0
+
+    def next_chunk(self, job_id: str, size: int) -> List[Tuple[int, str]]:
+        """Next unprocessed (index, text) pairs in input order."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT idx, text FROM job_items WHERE job_id = ? AND result IS NULL "
+                "ORDER BY idx LIMIT ?",
+                (job_id, size),
+            ).fetchall()
+
+    def save_chunk(
+        self,
+        job_id: str,
+        results: List[Tuple[int, Dict[str, Any]]],
+        seconds: float,
+        owner: str,
+        lease_seconds: float,
+    ) -> bool:
+        """
+        Commit a chunk's results together with the job's progress and
+        renew `owner`'s lease. Nothing is written if another worker has
+        taken the job over; returns whether `owner` still holds it.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                owned = self._conn.execute(
+                    "UPDATE jobs SET processed = processed + ?, active_seconds = active_seconds + ?, "
+                    "lease_until = ? WHERE id = ? AND owner = ?",
+                    (len(results), seconds, time.time() + lease_seconds, job_id, owner),
+                ).rowcount > 0
+                if owned:
+                    self._conn.executemany(
+                        "UPDATE job_items SET result = ? WHERE job_id = ? AND idx = ?",
+                        [(json.dumps(result), job_id, idx) for idx, result in results],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return owned
+
+    def results(self, job_id: str, offset: int, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Processed results with index in [offset, offset + limit)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, result FROM job_items WHERE job_id = ? AND idx >= ? AND idx < ? "
+                "AND result IS NOT NULL ORDER BY idx",
+                (job_id, offset, offset + limit),
+            ).fetchall()
+        return [(idx, json.loads(result)) for idx, result in rows]
+
+    def purge_finished(self, older_than: float) -> int:
+        """Delete jobs (and results) that finished before `older_than`. Returns count."""
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (older_than,),
+            ).fetchall()]
+        if ids:
+            self._transaction([
+                ("DELETE FROM job_items WHERE job_id = ?", [(job_id,) for job_id in ids]),
+                ("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in ids]),
+            ])
+        return len(ids)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def run_job_chunk(
+    texts: List[str],
+    registry: Any,
+    batch_size: int,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze one chunk of a job (blocking; runs on the inference executor).
+
+    Unlike run_batch_inference, failures propagate so the job is marked
+    failed instead of storing neutral fallbacks.
+    """
+    from app.services import batch_full_analysis_with_stats
+
+    batch_result, _ = batch_full_analysis_with_stats(texts=texts, registry=registry, batch_size=batch_size)
+    return [summarize_full_result(item) for item in batch_result.results]
+
+
+class JobManager:
+    """
+    In-process job queue with asyncio worker tasks.
+
+    Several managers (one per gunicorn worker) may share a database;
+    jobs are claimed atomically, so each runs in one manager at a time.
+
+    Args:
+        store: JobStore (default: one at NLP_JOBS_PATH)
+        workers: Jobs processed concurrently (default: NLP_JOB_WORKERS)
+        chunk_size: Texts per chunk / checkpoint (default: NLP_JOB_CHUNK_SIZE)
+        lease_seconds: Claim lease (default: NLP_JOB_LEASE_SECONDS)
+    """
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+    ):
+        self._store = store
+        self._workers = workers or int(os.getenv("NLP_JOB_WORKERS", DEFAULT_JOB_WORKERS))
+        self._chunk_size = chunk_size or int(os.getenv("NLP_JOB_CHUNK_SIZE", DEFAULT_JOB_CHUNK_SIZE))
+        self._lease_seconds = lease_seconds or float(
+            os.getenv("NLP_JOB_LEASE_SECONDS", DEFAULT_JOB_LEASE_SECONDS)
+        )
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._registry: Any = None
+        self._running_jobs: Dict[str, float] = {}
+
+        # Statistics
+        self._stats = {
+            "submitted": 0,
+            "resumed": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "taken_over": 0,
+            "texts_processed": 0,
+        }
+
+    @property
+    def store(self) -> JobStore:
+        if self._store is None:
+            self._store = JobStore()
+        return self._store
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self, registry: Any) -> None:
+        """Resume unfinished jobs and start the worker tasks."""
+        if self._tasks:
+            logger.warning("Job manager already running")
+            return
+
+        self._registry = registry
+        self._queue = asyncio.Queue()
+
+        retention_hours = float(os.getenv("NLP_JOB_RETENTION_HOURS", DEFAULT_JOB_RETENTION_HOURS))
+        purged = await asyncio.to_thread(self.store.purge_finished, time.time() - retention_hours * 3600)
+
+        # Jobs interrupted by a restart pick up after their last chunk
+        unfinished = await asyncio.to_thread(self.store.unfinished)
+        for job in unfinished:
+            self._queue.put_nowait(job.id)
+        self._stats["resumed"] += len(unfinished)
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self._workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._recover_expired(), name="job-lease-scan"))
+        logger.info(
+            f"Job manager started: {self._workers} workers, {len(unfinished)} jobs resumed, "
+            f"{purged} expired jobs purged ({self.store.path})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the workers; running jobs resume on the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        logger.info("Job manager stopped")
+
+    async def submit(self, texts: List[str], batch_size: Optional[int] = None) -> JobRecord:
+        """Persist and queue a job."""
+        if self._queue is None:
+            raise RuntimeError("Job manager is not running")
+        job = await asyncio.to_thread(self.store.create, texts, batch_size)
+        self._queue.put_nowait(job.id)
+        self._stats["submitted"] += 1
+        logger.info(f"Job {job.id} queued: {job.total} texts")
+        return job
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[JobRecord]:
+        """Cancel a queued or running job (a running job stops after its current chunk)."""
+        if self.store.set_status(job_id, JobStatus.CANCELLED):
+            self._stats["cancelled"] += 1
+            logger.info(f"Job {job_id} cancelled")
+        return self.store.get(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                self._stats["failed"] += 1
+                await asyncio.to_thread(
+                    self.store.set_status, job_id, JobStatus.FAILED, str(e), self._owner
+                )
+            finally:
+                self._running_jobs.pop(job_id, None)
+                self._queue.task_done()
+
+    async def _recover_expired(self) -> None:
+        """Queue jobs whose owner stopped renewing its lease."""
+        while True:
+            await asyncio.sleep(self._lease_seconds)
+            for job in await asyncio.to_thread(self.store.expired):
+                if job.id not in self._running_jobs:
+                    logger.info(f"Job {job.id}: lease expired, queued for takeover")
+                    self._queue.put_nowait(job.id)
+
+    async def _wait_until_ready(self) -> None:
+        is_ready = getattr(self._registry, "is_ready", None)
+        if is_ready is None:
+            return
+
+        from app.models import get_ready_models
+
+        while not is_ready(get_ready_models()):
+            await asyncio.sleep(READY_POLL_SECONDS)
+
+    async def _run_job(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job.is_finished:
+            return
+
+        await self._wait_until_ready()
+        if not await asyncio.to_thread(self.store.claim, job_id, self._owner, self._lease_seconds):
+            return  # Cancelled while queued, or running in another worker
+        self._running_jobs[job_id] = time.time()
+
+        while True:
+            # Cancellation is checked between chunks
+            job = await asyncio.to_thread(self.store.get, job_id)
+            if job is None or job.status != JobStatus.RUNNING:
+                return
+
+            chunk = await asyncio.to_thread(self.store.next_chunk, job_id, self._chunk_size)
+            if not chunk:
+                break
+
+            texts = [text for _, text in chunk]
+            batch_config = choose_batch_config(job.batch_size, len(texts))
+
+            start = time.perf_counter()
+            # Bulk lane, in executor-sized pieces: interactive requests run in between
+            parts = await get_executor().run_chunked(
+                run_job_chunk, texts, self._registry, batch_config.batch_size, lane=BULK_LANE
+            )
+            results = [result for part in parts for result in part]
+            elapsed = time.perf_counter() - start
+
+            owned = await asyncio.to_thread(
+                self.store.save_chunk,
+                job_id,
+                [(idx, result) for (idx, _), result in zip(chunk, results)],
+                elapsed,
+                self._owner,
+                self._lease_seconds,
+            )
+            if not owned:
+                logger.warning(f"Job {job_id}: lease lost to another worker, stopping")
+                self._stats["taken_over"] += 1
+                return
+            self._stats["texts_processed"] += len(chunk)
+
+        if await asyncio.to_thread(
+            self.store.set_status, job_id, JobStatus.COMPLETED, None, self._owner
+        ):
+            self._stats["completed"] += 1
+            logger.info(f"Job {job_id} completed: {job.total} texts")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self._workers,
+            "chunk_size": self._chunk_size,
+            "owner": self._owner,
+            "lease_seconds": self._lease_seconds,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": list(self._running_jobs),
+            **self._stats,
+        }
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create singleton job manager instance."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
+
+
+# ============================================================================
+# JOB ENDPOINTS
+# ============================================================================
+
+def _get_job_or_404(job_id: str) -> JobRecord:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(body: JobSubmitRequest) -> JobResponse:
+    """
+    Submit texts for background analysis.
+
+    Returns immediately with the job id; poll `GET /jobs/{id}` for
+    progress and page through `GET /jobs/{id}/results`. Jobs are kept on
+    disk and resume after a restart.
+    """
+    manager = get_job_manager()
+    if not manager.is_running:
+        raise HTTPException(status_code=503, detail="Job workers are not running")
+
+    job = await manager.submit(body.texts, body.batch_size)
+    return JobResponse(**job.to_dict())
+
+
+@router.get("/jobs", response_model=List[JobResponse])
+async def list_jobs(limit: int = Query(50, ge=1, le=500)) -> List[JobResponse]:
+    """Most recently submitted jobs."""
+    jobs = await asyncio.to_thread(get_job_manager().store.list_jobs, limit)
+    return [JobResponse(**job.to_dict()) for job in jobs]
+
+
+@router.get("/jobs/stats")
+async def job_stats() -> Dict[str, Any]:
+    """Worker and queue statistics."""
+    return get_job_manager().get_stats()
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str) -> JobResponse:
+    """Job status, progress, throughput and ETA."""
+    job = await asyncio.to_thread(_get_job_or_404, job_id)
+    return JobResponse(**job.to_dict())
+
+
+@router.get("/jobs/{job_id}/results", response_model=JobResultsResponse)
+async def get_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first result"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Results per page"),
+) -> JobResultsResponse:
+    """
+    Page through results in input order.
+
+    Available while the job runs: a page holds the results produced so
+    far. `next_offset` is None once the page reaches the end of the job.
+    """
+    job = await asyncio.to_thread(_get_job_or_404, job_id)
+    rows = await asyncio.to_thread(get_job_manager().store.results, job_id, offset, limit)
+
+    end = min(offset + limit, job.total)
+    return JobResultsResponse(
+        job_id=job.id,
+        status=job.status,
+        offset=offset,
+        total=job.total,
+        results=[JobResultItem(index=idx, **result) for idx, result in rows],
+        next_offset=end if end < job.total else None,
+    )
+
+
+@router.delete("/jobs/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str) -> JobResponse:
+    """Cancel a queued or running job. Results produced so far are kept."""
+    await asyncio.to_thread(_get_job_or_404, job_id)
+    job = await asyncio.to_thread(get_job_manager().cancel, job_id)
+    return JobResponse(**job.to_dict())
@@ -6,8 +6,10 @@
 from .cache import (
     InferenceCache,
     get_cache,
+    shutdown_cache,
     normalize_text,
     hash_text,
+    hash_texts,
 )
 from .batching import (
     chunk_texts,
@@ -18,13 +20,26 @@ from .adaptive import (
     get_batch_sizer,
     SystemMetrics,
 )
+from .executor import (
+    InferenceExecutor,
+    get_executor,
+    run_inference,
+    shutdown_executor,
+)
+from .parallel import (
+    ModelGroupRunner,
+    get_group_runner,
+    shutdown_group_runner,
+)
 
 __all__ = [
     # Cache
     "InferenceCache",
     "get_cache",
+    "shutdown_cache",
     "normalize_text",
     "hash_text",
+    "hash_texts",
     # Batching
     "chunk_texts",
     "BatchConfig",
@@ -32,4 +47,13 @@ __all__ = [
     "AdaptiveBatchSizer",
     "get_batch_sizer",
     "SystemMetrics",
+    # Executor
+    "InferenceExecutor",
+    "get_executor",
+    "run_inference",
+    "shutdown_executor",
+    # Parallel model groups
+    "ModelGroupRunner",
+    "get_group_runner",
+    "shutdown_group_runner",
 ]
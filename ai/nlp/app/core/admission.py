@@ -0,0 +1,315 @@
+# ============================================================================
+# ADMISSION CONTROL
+# Bounded concurrency and load shedding for inference endpoints
+# ============================================================================
+#
+# Without a limit, a burst of batch calls queues unbounded CPU work on the
+# inference executor and every request's latency explodes. Requests are
+# admitted per endpoint class (single, batch, stream):
+# - At most `max_concurrent` requests of a class run at once
+# - At most `max_queue` more wait for a slot; beyond that, reject
+# - If the client sent a deadline (X-Deadline-Ms: milliseconds it is
+#   willing to wait) and the estimated queue wait exceeds it, reject now
+#   rather than doing work whose answer arrives too late
+#
+# Rejections carry a Retry-After hint (estimated queue wait, seconds) and
+# become HTTP 429 responses.
+#
+# Queue wait estimate per class: queued work plus half the running work,
+# in cost units (texts), times the smoothed service time per unit,
+# divided by max_concurrent.
+#
+# Configuration (env):
+# - NLP_ADMISSION: enable admission control (default: true)
+# - NLP_ADMISSION_LIMITS: per-class overrides "class=concurrent:queue,..."
+#   (default: single=32:256,batch=4:16,stream=16:64)
+# ============================================================================
+
+import asyncio
+import logging
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Endpoint classes
+SINGLE_CLASS = "single"
+BATCH_CLASS = "batch"
+STREAM_CLASS = "stream"
+
+# Client deadline header (milliseconds the client will wait)
+DEADLINE_HEADER = "X-Deadline-Ms"
+
+# Smoothing for service time per cost unit
+EWMA_ALPHA = 0.2
+
+
+@dataclass
+class AdmissionLimit:
+    """Concurrency and queue bound for one endpoint class."""
+    max_concurrent: int
+    max_queue: int
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"max_concurrent": self.max_concurrent, "max_queue": self.max_queue}
+
+
+DEFAULT_LIMITS = {
+    SINGLE_CLASS: AdmissionLimit(max_concurrent=32, max_queue=256),
+    BATCH_CLASS: AdmissionLimit(max_concurrent=4, max_queue=16),
+    STREAM_CLASS: AdmissionLimit(max_concurrent=16, max_queue=64),
+}
+
+
+def is_admission_enabled() -> bool:
+    """Whether admission control is on (NLP_ADMISSION)."""
+    return os.getenv("NLP_ADMISSION", "true").lower() in ("1", "true", "yes", "on")
+
+
+def get_admission_limits() -> Dict[str, AdmissionLimit]:
+    """Default limits with NLP_ADMISSION_LIMITS overrides applied."""
+    limits = dict(DEFAULT_LIMITS)
+    configured = os.getenv("NLP_ADMISSION_LIMITS", "")
+    for entry in filter(None, (part.strip() for part in configured.split(","))):
+        try:
+            name, spec = entry.split("=", 1)
+            concurrent, queue = spec.split(":", 1)
+            limits[name.strip()] = AdmissionLimit(max(1, int(concurrent)), max(0, int(queue)))
+        except ValueError:
+            logger.warning(f"Ignoring invalid NLP_ADMISSION_LIMITS entry: '{entry}'")
+    return limits
+
+
+def parse_deadline_ms(headers: Mapping[str, str]) -> Optional[float]:
+    """Client deadline from X-Deadline-Ms (None if absent or invalid)."""
+    value = headers.get(DEADLINE_HEADER)
+    if value is None:
+        return None
+    try:
+        deadline = float(value)
+    except ValueError:
+        return None
+    return deadline if deadline > 0 else None
+
+
+class AdmissionRejected(Exception):
+    """Request shed by admission control (HTTP 429)."""
+
+    def __init__(self, endpoint_class: str, reason: str, retry_after: float):
+        self.endpoint_class = endpoint_class
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"{endpoint_class} requests over capacity ({reason})")
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After value: whole seconds, at least 1."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class _Lane:
+    """Admission state for one endpoint class."""
+
+    def __init__(self, limit: AdmissionLimit):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit.max_concurrent)
+        self.in_flight = 0
+        self.in_flight_cost = 0
+        self.waiting = 0
+        self.queued_cost = 0
+        self.ms_per_unit: Optional[float] = None
+
+        self.stats = {
+            "admitted": 0,
+            "rejected_queue_full": 0,
+            "rejected_deadline": 0,
+            "rejected_deadline_expired": 0,
+            "total_queue_ms": 0.0,
+        }
+
+    def estimate_wait_ms(self) -> float:
+        if self.ms_per_unit is None:
+            return 0.0
+        if self.in_flight < self.limit.max_concurrent:
+            return 0.0
+        work = self.queued_cost + self.in_flight_cost / 2
+        return work * self.ms_per_unit / self.limit.max_concurrent
+
+    def record_service(self, cost: int, elapsed_ms: float) -> None:
+        sample = elapsed_ms / max(1, cost)
+        if self.ms_per_unit is None:
+            self.ms_per_unit = sample
+        else:
+            self.ms_per_unit += EWMA_ALPHA * (sample - self.ms_per_unit)
+
+
+class AdmissionTicket:
+    """A granted slot. release() is idempotent."""
+
+    def __init__(self, lane: Optional[_Lane], cost: int):
+        self._lane = lane
+        self._cost = cost
+        self._started = time.perf_counter()
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        lane = self._lane
+        if lane is None:
+            return
+        lane.in_flight -= 1
+        lane.in_flight_cost -= self._cost
+        lane.record_service(self._cost, (time.perf_counter() - self._started) * 1000)
+        lane.semaphore.release()
+
+
+class AdmissionController:
+    """
+    Per-endpoint-class concurrency and queue limits.
+
+    Used from the event loop only (no locking needed).
+
+    Args:
+        limits: Limits per endpoint class (default: get_admission_limits())
+        enabled: Admit everything when False (default: NLP_ADMISSION)
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, AdmissionLimit]] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self._enabled = is_admission_enabled() if enabled is None else enabled
+        self._limits = limits if limits is not None else get_admission_limits()
+        self._lanes: Dict[str, _Lane] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def _lane(self, endpoint_class: str) -> _Lane:
+        lane = self._lanes.get(endpoint_class)
+        if lane is None:
+            limit = self._limits.get(endpoint_class, DEFAULT_LIMITS[BATCH_CLASS])
+            lane = self._lanes[endpoint_class] = _Lane(limit)
+        return lane
+
+    def estimate_wait_ms(self, endpoint_class: str) -> float:
+        """Estimated queue wait for a request arriving now."""
+        return self._lane(endpoint_class).estimate_wait_ms()
+
+    def _reject(self, lane: _Lane, endpoint_class: str, reason: str, wait_ms: float) -> AdmissionRejected:
+        lane.stats[f"rejected_{reason}"] += 1
+        logger.warning(
+            f"Shedding {endpoint_class} request ({reason}): {lane.in_flight} running, "
+            f"{lane.waiting} queued, est. wait {wait_ms:.0f}ms"
+        )
+        return AdmissionRejected(endpoint_class, reason, wait_ms / 1000)
+
+    async def acquire(
+        self,
+        endpoint_class: str,
+        cost: int = 1,
+        deadline_ms: Optional[float] = None,
+    ) -> AdmissionTicket:
+        """
+        Wait for a slot.
+
+        Args:
+            endpoint_class: single, batch or stream
+            cost: Work units (texts) the request carries
+            deadline_ms: Longest the client will wait for its answer
+
+        Raises:
+            AdmissionRejected: Queue full, estimated wait past the deadline,
+                or the deadline expired while queued
+        """
+        if not self._enabled:
+            return AdmissionTicket(None, cost)
+
+        lane = self._lane(endpoint_class)
+        wait_ms = lane.estimate_wait_ms()
+
+        saturated = lane.in_flight >= lane.limit.max_concurrent or lane.waiting > 0
+        if saturated and lane.waiting >= lane.limit.max_queue:
+            raise self._reject(lane, endpoint_class, "queue_full", wait_ms)
+        if deadline_ms is not None and wait_ms > deadline_ms:
+            raise self._reject(lane, endpoint_class, "deadline", wait_ms)
+
+        lane.waiting += 1
+        lane.queued_cost += cost
+        queued_at = time.perf_counter()
+        try:
+            if deadline_ms is None:
+                await lane.semaphore.acquire()
+            else:
+                await asyncio.wait_for(lane.semaphore.acquire(), deadline_ms / 1000)
+        except asyncio.TimeoutError:
+            raise self._reject(lane, endpoint_class, "deadline_expired", lane.estimate_wait_ms())
+        finally:
+            lane.waiting -= 1
+            lane.queued_cost -= cost
+
+        lane.in_flight += 1
+        lane.in_flight_cost += cost
+        lane.stats["admitted"] += 1
+        lane.stats["total_queue_ms"] += (time.perf_counter() - queued_at) * 1000
+        return AdmissionTicket(lane, cost)
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        endpoint_class: str,
+        cost: int = 1,
+        deadline_ms: Optional[float] = None,
+    ) -> AsyncIterator[AdmissionTicket]:
+        """Hold a slot for the duration of the block."""
+        ticket = await self.acquire(endpoint_class, cost, deadline_ms)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lanes = {}
+        for name, lane in self._lanes.items():
+            admitted = lane.stats["admitted"]
+            lanes[name] = {
+                **lane.limit.to_dict(),
+                "in_flight": lane.in_flight,
+                "waiting": lane.waiting,
+                "est_wait_ms": round(lane.estimate_wait_ms(), 1),
+                "ms_per_text": round(lane.ms_per_unit, 2) if lane.ms_per_unit is not None else None,
+                **{key: value for key, value in lane.stats.items() if key != "total_queue_ms"},
+                "avg_queue_ms": round(lane.stats["total_queue_ms"] / admitted, 2) if admitted else 0.0,
+            }
+        return {"enabled": self._enabled, "classes": lanes}
+
+
+async def release_after(stream: AsyncIterator[Any], ticket: AdmissionTicket) -> AsyncIterator[Any]:
+    """Relay a streaming body, releasing the ticket once it ends or is dropped."""
+    try:
+        async for item in stream:
+            yield item
+    finally:
+        ticket.release()
+
+
+# Singleton instance
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create singleton admission controller."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
+
@@ -0,0 +1,377 @@
+# ============================================================================
+# INFERENCE BACKENDS
+# PyTorch, ONNX Runtime and dynamic-INT8 ONNX pipelines per model
+# ============================================================================
+#
+# Full-precision PyTorch is the reference backend. On CPU, the same models
+# exported to ONNX (and optionally dynamic-INT8 quantized) run noticeably
+# faster with a smaller memory footprint, at a small accuracy cost.
+#
+# Backends are selected per model:
+# - torch: transformers pipeline (default)
+# - onnx: exported FP32 ONNX graph on ONNX Runtime
+# - onnx-int8: exported graph with dynamic INT8 weight quantization
+#
+# Exports are cached on disk, so only the first start pays for them.
+# An optional drift check compares the ONNX pipeline against PyTorch on a
+# fixed sample; if label agreement is below the threshold the model falls
+# back to PyTorch. The check runs inference, so it is skipped while models
+# are preloaded in the gunicorn master (see drift_check_suspended); the
+# reference pipeline is freed once the check is done.
+#
+# Requires optimum[onnxruntime] (optional); without it, ONNX selections
+# fall back to torch with a warning.
+#
+# Configuration (env):
+# - NLP_BACKEND: default backend for all models (default: torch)
+# - NLP_BACKEND_<MODEL>: per model, e.g. NLP_BACKEND_NER_MODEL=onnx-int8
+# - NLP_ONNX_DIR: export cache directory (default: onnx in NLP_DATA_DIR)
+# - NLP_ONNX_QUANT_ARCH: avx2 | avx512 | avx512_vnni | arm64 (default: avx2)
+# - NLP_ONNX_DRIFT_CHECK: compare against PyTorch at load (default: false)
+# - NLP_ONNX_MIN_AGREEMENT: min label agreement to keep ONNX (default: 0.95)
+# ============================================================================
+
+import gc
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from app.core.paths import data_path
+
+logger = logging.getLogger(__name__)
+
+# ONNX Runtime via optimum is optional
+try:
+    from optimum.onnxruntime import (
+        ORTModelForSequenceClassification,
+        ORTModelForTokenClassification,
+        ORTQuantizer,
+    )
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+
+# Backend names
+TORCH = "torch"
+ONNX = "onnx"
+ONNX_INT8 = "onnx-int8"
+BACKENDS = (TORCH, ONNX, ONNX_INT8)
+
+# Defaults
+DEFAULT_ONNX_DIRNAME = "onnx"
+DEFAULT_QUANT_ARCH = "avx2"
+DEFAULT_MIN_AGREEMENT = 0.95
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
+# Fixed sample for drift checks (finance, social, emotion and NER cues)
+DRIFT_SAMPLE_TEXTS = [
+    "Apple reported record quarterly revenue and raised its dividend.",
+    "Shares of Tesla plunged after the company missed delivery estimates.",
+    "The Federal Reserve left interest rates unchanged on Wednesday.",
+    "$NVDA to the moon, best earnings call I've ever heard 🚀",
+    "Honestly so tired of this market, everything is red again.",
+    "I can't believe they cut 10,000 jobs, this is terrifying.",
+    "Goldman Sachs upgraded Microsoft to buy with a $450 target.",
+    "Oil prices were flat as OPEC weighed output cuts in Vienna.",
+]
+
+
+def get_backend(model_key: str) -> str:
+    """Get configured backend for a model (NLP_BACKEND_<KEY>, then NLP_BACKEND)."""
+    backend = os.getenv(f"NLP_BACKEND_{model_key.upper()}") or os.getenv("NLP_BACKEND", TORCH)
+    backend = backend.lower()
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown backend '{backend}' for {model_key}, using '{TORCH}'")
+        return TORCH
+    return backend
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+# =============================================================================
+# Drift Check
+# =============================================================================
+
+@dataclass
+class DriftReport:
+    """Agreement between a candidate backend and the PyTorch reference."""
+    samples: int
+    label_agreement: float
+    max_score_delta: float
+    mean_score_delta: float
+
+    def to_dict(self) -> dict:
+        return {
+            "samples": self.samples,
+            "label_agreement": round(self.label_agreement, 4),
+            "max_score_delta": round(self.max_score_delta, 4),
+            "mean_score_delta": round(self.mean_score_delta, 4),
+        }
+
+
+def _prediction_keys(output: Any) -> Dict[Any, float]:
+    """
+    Reduce one pipeline output to {key: score}.
+
+    Classification: the top label. NER: every (entity_group, start, end).
+    """
+    if isinstance(output, dict):
+        return {output["label"]: output["score"]}
+
+    entries = list(output or [])
+    if entries and isinstance(entries[0], list):
+        entries = entries[0]
+    if not entries:
+        return {}
+
+    if "entity_group" in entries[0] or "entity" in entries[0]:
+        return {
+            (e.get("entity_group", e.get("entity")), e.get("start"), e.get("end")): e["score"]
+            for e in entries
+        }
+
+    top = max(entries, key=lambda e: e["score"])
+    return {top["label"]: top["score"]}
+
+
+def compare_outputs(reference: Sequence[Any], candidate: Sequence[Any]) -> DriftReport:
+    """
+    Compare pipeline outputs for the same inputs.
+
+    A sample agrees when both backends predict the same label (or the
+    same entity spans for NER). Score deltas are measured on matching
+    predictions.
+    """
+    agreed = 0
+    deltas: List[float] = []
+
+    for ref, cand in zip(reference, candidate):
+        ref_keys = _prediction_keys(ref)
+        cand_keys = _prediction_keys(cand)
+        if ref_keys.keys() == cand_keys.keys():
+            agreed += 1
+        deltas.extend(
+            abs(ref_keys[key] - cand_keys[key])
+            for key in ref_keys.keys() & cand_keys.keys()
+        )
+
+    samples = len(reference)
+    return DriftReport(
+        samples=samples,
+        label_agreement=agreed / samples if samples else 1.0,
+        max_score_delta=max(deltas, default=0.0),
+        mean_score_delta=sum(deltas) / len(deltas) if deltas else 0.0,
+    )
+
+
+def check_drift(
+    reference_pipe: Callable[..., Any],
+    candidate_pipe: Callable[..., Any],
+    texts: Sequence[str] = DRIFT_SAMPLE_TEXTS,
+) -> DriftReport:
+    """Run both pipelines over `texts` and compare their predictions."""
+    texts = list(texts)
+    return compare_outputs(reference_pipe(texts), candidate_pipe(texts))
+
+
+# =============================================================================
+# ONNX Export & Loading
+# =============================================================================
+
+def _onnx_dir(model_name: str, variant: str) -> str:
+    root = os.getenv("NLP_ONNX_DIR") or data_path(DEFAULT_ONNX_DIRNAME)
+    return os.path.join(root, model_name.replace("/", "__"), variant)
+
+
+def _quantization_config() -> Any:
+    arch = os.getenv("NLP_ONNX_QUANT_ARCH", DEFAULT_QUANT_ARCH).lower()
+    factory = getattr(AutoQuantizationConfig, arch, None)
+    if factory is None:
+        logger.warning(f"Unknown NLP_ONNX_QUANT_ARCH '{arch}', using '{DEFAULT_QUANT_ARCH}'")
+        factory = getattr(AutoQuantizationConfig, DEFAULT_QUANT_ARCH)
+    # Dynamic quantization: INT8 weights, activations quantized at runtime
+    return factory(is_static=False, per_channel=False)
+
+
+def load_onnx_model(task: str, model_name: str, quantize: bool = False) -> Any:
+    """
+    Load (exporting and quantizing on first use) an ONNX Runtime model.
+
+    Args:
+        task: Pipeline task ('ner' loads a token classifier, anything else
+            a sequence classifier)
+        model_name: HuggingFace model identifier
+        quantize: Apply dynamic INT8 quantization
+
+    Returns:
+        optimum ORTModel instance
+    """
+    if not ONNX_AVAILABLE:
+        raise ImportError("ONNX backend requires: pip install optimum[onnxruntime]")
+
+    model_cls = (
+        ORTModelForTokenClassification if task in ("ner", "token-classification")
+        else ORTModelForSequenceClassification
+    )
+
+    fp32_dir = _onnx_dir(model_name, "fp32")
+    if not os.path.isdir(fp32_dir):
+        logger.info(f"Exporting {model_name} to ONNX: {fp32_dir}")
+        model_cls.from_pretrained(model_name, export=True).save_pretrained(fp32_dir)
+
+    if not quantize:
+        return model_cls.from_pretrained(fp32_dir)
+
+    int8_dir = _onnx_dir(model_name, "int8")
+    if not os.path.exists(os.path.join(int8_dir, QUANTIZED_FILE_NAME)):
+        logger.info(f"Quantizing {model_name} to dynamic INT8: {int8_dir}")
+        quantizer = ORTQuantizer.from_pretrained(fp32_dir)
+        quantizer.quantize(save_dir=int8_dir, quantization_config=_quantization_config())
+
+    return model_cls.from_pretrained(int8_dir, file_name=QUANTIZED_FILE_NAME)
+
+
+def build_onnx_pipeline(
+    task: str,
+    model_name: str,
+    device: int,
+    quantize: bool = False,
+    **kwargs: Any,
+) -> Any:
+    """Build a transformers-compatible pipeline on an ONNX Runtime model."""
+    from optimum.pipelines import pipeline as ort_pipeline
+    from transformers import AutoTokenizer
+
+    model = load_onnx_model(task, model_name, quantize=quantize)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return ort_pipeline(
+        task,
+        model=model,
+        tokenizer=tokenizer,
+        accelerator="ort",
+        device=device,
+        **kwargs,
+    )
+
+
+# =============================================================================
+# Backend Registry
+# =============================================================================
+
+@dataclass
+class BackendInfo:
+    """How a model was loaded."""
+    model_name: str
+    requested: str
+    backend: str
+    load_ms: float = 0.0
+    drift: Optional[DriftReport] = None
+    fallback_reason: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "requested": self.requested,
+            "backend": self.backend,
+            "load_ms": round(self.load_ms, 1),
+            "drift": self.drift.to_dict() if self.drift else None,
+            "fallback_reason": self.fallback_reason,
+        }
+
+
+_backend_info: Dict[str, BackendInfo] = {}
+_backend_lock = threading.Lock()
+_drift_check_suspended = False
+
+
+@contextmanager
+def drift_check_suspended() -> Iterator[None]:
+    """Skip NLP_ONNX_DRIFT_CHECK for pipelines built inside the block."""
+    global _drift_check_suspended
+    previous, _drift_check_suspended = _drift_check_suspended, True
+    try:
+        yield
+    finally:
+        _drift_check_suspended = previous
+
+
+def build_pipeline(
+    task: str,
+    model_name: str,
+    device: int,
+    backend: str,
+    torch_factory: Callable[[], Any],
+    **kwargs: Any,
+) -> Any:
+    """
+    Build a pipeline on the requested backend, falling back to PyTorch.
+
+    Args:
+        task: Pipeline task type
+        model_name: HuggingFace model identifier
+        device: Device index (0 for GPU, -1 for CPU)
+        backend: One of BACKENDS
+        torch_factory: Zero-arg callable building the PyTorch pipeline
+        **kwargs: Pipeline arguments (same as for the PyTorch pipeline)
+
+    Returns:
+        Loaded pipeline (ONNX, or PyTorch on fallback)
+    """
+    start = time.perf_counter()
+    info = BackendInfo(model_name=model_name, requested=backend, backend=TORCH)
+    pipe = None
+
+    if backend != TORCH:
+        try:
+            pipe = build_onnx_pipeline(
+                task, model_name, device, quantize=(backend == ONNX_INT8), **kwargs
+            )
+            info.backend = backend
+
+            if _env_flag("NLP_ONNX_DRIFT_CHECK") and _drift_check_suspended:
+                logger.info(f"{model_name} [{backend}] drift check skipped (preload)")
+            elif _env_flag("NLP_ONNX_DRIFT_CHECK"):
+                reference = torch_factory()
+                info.drift = check_drift(reference, pipe)
+                min_agreement = float(os.getenv("NLP_ONNX_MIN_AGREEMENT", DEFAULT_MIN_AGREEMENT))
+                logger.info(f"{model_name} [{backend}] drift vs torch: {info.drift.to_dict()}")
+
+                if info.drift.label_agreement < min_agreement:
+                    info.fallback_reason = (
+                        f"label agreement {info.drift.label_agreement:.2f} < {min_agreement:.2f}"
+                    )
+                    pipe, info.backend = reference, TORCH
+                else:
+                    del reference
+                    gc.collect()
+        except Exception as e:
+            info.fallback_reason = str(e)
+            pipe = None
+
+        if info.fallback_reason:
+            logger.warning(f"{model_name}: {backend} backend unavailable, using torch ({info.fallback_reason})")
+
+    if pipe is None:
+        pipe = torch_factory()
+
+    info.load_ms = (time.perf_counter() - start) * 1000
+    with _backend_lock:
+        _backend_info[model_name] = info
+
+    return pipe
+
+
+def get_backend_info() -> Dict[str, dict]:
+    """Backend, load time and drift report per loaded model."""
+    with _backend_lock:
+        return {name: info.to_dict() for name, info in _backend_info.items()}
@@ -7,10 +7,12 @@
 # - Batch size is computed ONCE per request
 # - No dynamic resizing mid-batch
 # - CPU-safe limits enforced
+# - Mixed-length inputs are bucketed by token count (padding is paid per
+#   batch at the longest row, so similar lengths batch together)
 # ============================================================================
 
 import logging
-from typing import List, TypeVar, Iterator
+from typing import Any, Callable, List, Sequence, TypeVar, Iterator
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -88,6 +90,90 @@ def chunk_texts(texts: List[T], batch_size: int) -> Iterator[List[T]]:
         yield texts[i:i + batch_size]
 
 
+def bucket_by_length(lengths: Sequence[int], batch_size: int) -> List[List[int]]:
+    """
+    Group item indices into batches of similar token length.
+
+    Indices are sorted by length (stable, so equal lengths keep arrival
+    order) and then chunked, so each batch pads only to the length of its
+    own longest row instead of the longest row in the request.
+
+    Args:
+        lengths: Token count per item (same order as the items)
+        batch_size: Maximum items per batch
+
+    Returns:
+        List of index batches; together they cover every index exactly once
+
+    Example:
+        >>> bucket_by_length([50, 3, 48, 4], 2)
+        [[1, 3], [2, 0]]
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return list(chunk_texts(order, batch_size))
+
+
+def run_in_buckets(
+    fn: Callable[..., List[Any]],
+    items: Sequence[T],
+    buckets: List[List[int]],
+) -> List[Any]:
+    """
+    Run a batch callable once per bucket and restore original order.
+
+    `fn` is called as fn(batch_items, batch_size=len(batch_items)) and must
+    return one result per item (HuggingFace pipeline convention).
+    """
+    results: List[Any] = [None] * len(items)
+
+    for bucket in buckets:
+        batch_results = fn([items[i] for i in bucket], batch_size=len(bucket))
+        for i, result in zip(bucket, batch_results):
+            results[i] = result
+
+    return results
+
+
+@dataclass
+class PaddingStats:
+    """
+    Token accounting for a batched run.
+
+    tokens_processed counts real (non-pad) tokens; tokens_padded counts
+    pad positions added to bring each row up to its batch's longest row.
+    """
+    tokens_processed: int = 0
+    tokens_padded: int = 0
+
+    @classmethod
+    def from_buckets(cls, lengths: Sequence[int], buckets: List[List[int]]) -> "PaddingStats":
+        """Compute padding cost of running `buckets` over items with `lengths`."""
+        stats = cls()
+        for bucket in buckets:
+            if not bucket:
+                continue
+            bucket_lengths = [lengths[i] for i in bucket]
+            longest = max(bucket_lengths)
+            stats.tokens_processed += sum(bucket_lengths)
+            stats.tokens_padded += longest * len(bucket_lengths) - sum(bucket_lengths)
+        return stats
+
+    @property
+    def padding_ratio(self) -> float:
+        """Fraction of computed positions that were padding."""
+        total = self.tokens_processed + self.tokens_padded
+        if total == 0:
+            return 0.0
+        return self.tokens_padded / total
+
+    def to_dict(self) -> dict:
+        return {
+            "tokens_processed": self.tokens_processed,
+            "tokens_padded": self.tokens_padded,
+            "padding_ratio": round(self.padding_ratio, 3),
+        }
+
+
 def calculate_num_batches(total_items: int, batch_size: int) -> int:
     """Calculate number of batches needed."""
     if total_items <= 0:
@@ -1,34 +1,70 @@
 # ============================================================================
 # INFERENCE CACHE
-# In-memory TTL cache for analysis results
+# In-memory LRU/TTL cache for analysis results
 # ============================================================================
 #
 # Features:
 # - Text normalization for consistent cache keys
-# - SHA-256 hashing for key generation
-# - TTL-based expiration
-# - Thread-safe (single worker deployment)
-# - Redis-upgrade-ready interface
+# - SHA-256 hashing for key generation, once per text per request
+#   (hash_texts); bulk get/set take the precomputed keys
+# - O(1) get/set: OrderedDict in LRU order (hits move to the end,
+#   evictions pop from the front)
+# - Lazy TTL expiry via a time wheel: keys are bucketed by expiry second
+#   and whole buckets are dropped as time passes - no full scans
+# - Bounded by entry count AND approximate value bytes
+# - Thread-safe (inference threads and the event loop share it)
+# - Optional second tier (cache_backends): persistent SQLite file so
+#   restarts start warm, or Redis shared by all workers and replicas.
+#   Read-through on memory miss, write-behind on set; an unreachable
+#   backend degrades to memory-only
 #
 # Cache rules:
 # - Lookup MUST precede inference
 # - Expired entries MUST be removed
 # - Cache failure MUST NOT crash inference
+#
+# Configuration (env):
+# - NLP_CACHE_TTL_SECONDS: default entry TTL (default: 86400)
+# - NLP_CACHE_MAX_ENTRIES: max entries (default: 10000)
+# - NLP_CACHE_MAX_BYTES: max approximate value bytes (default: 256 MB)
+# - NLP_CACHE_BACKEND: second tier, sqlite | redis | none (see cache_backends)
 # ============================================================================
 
 import hashlib
+import json
 import logging
+import os
 import re
+import sys
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Dict, Any, List, Tuple
-from datetime import datetime, timedelta, timezone
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+
+from app.core.cache_backends import (
+    NO_BACKEND,
+    REDIS_BACKEND,
+    CacheBackend,
+    GuardedBackend,
+    WriteBehindWriter,
+    get_cache_backend_name,
+)
+from app.core.cache_disk import SQLiteCacheBackend, get_disk_path
+from app.core.cache_redis import RedisCacheBackend
 
 logger = logging.getLogger(__name__)
 
 
 # TTL Configuration
 DEFAULT_TTL_SECONDS = 86400  # 24 hours
-MAX_CACHE_SIZE = 10000  # Maximum entries before cleanup
+MAX_CACHE_SIZE = 10000  # Maximum entries before eviction
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # Maximum approximate value bytes
+
+# Expiry bucket width (seconds)
+WHEEL_RESOLUTION_SECONDS = 1.0
+
+_WHITESPACE = re.compile(r'\s+')
 
 
 def normalize_text(text: str) -> str:
@@ -50,7 +86,7 @@ def normalize_text(text: str) -> str:
     normalized = normalized.strip()
 
     # Collapse repeated spaces to single space
-    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized)
 
     return normalized
 
@@ -65,38 +101,141 @@ def hash_text(text: str) -> str:
     return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
 
 
+def hash_texts(texts: List[str]) -> List[str]:
+    """
+    Cache keys for many texts (one normalization and hash per text).
+
+    Compute keys once per request and pass them to get_many_by_key /
+    set_many_by_key instead of re-hashing at every step.
+    """
+    return [hash_text(text) for text in texts]
+
+
 @dataclass
 class CacheEntry:
-    """Single cache entry with TTL tracking."""
+    """Single cache entry with TTL tracking (epoch seconds)."""
     value: Dict[str, Any]
-    created_at: datetime
-    expires_at: datetime
+    created_at: float
+    expires_at: float
+    size_bytes: int = 0
     hit_count: int = 0
 
     @property
     def is_expired(self) -> bool:
-        return datetime.now(timezone.utc) > self.expires_at
+        return time.time() > self.expires_at
 
     def record_hit(self) -> None:
         self.hit_count += 1
 
 
+def estimate_size(value: Any) -> int:
+    """Approximate memory cost of a cached value (compact JSON length)."""
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class TimeWheel:
+    """
+    Expiry index: keys bucketed by expiry tick.
+
+    add/discard are O(1); advance() returns the keys of every bucket whose
+    tick has fully passed, touching only those buckets. A key may be
+    returned after it was refreshed - callers re-check the entry.
+    """
+
+    def __init__(self, resolution: float = WHEEL_RESOLUTION_SECONDS):
+        self._resolution = resolution
+        self._buckets: Dict[int, set] = {}
+        self._cursor = self._tick(time.time())
+
+    def _tick(self, timestamp: float) -> int:
+        return int(timestamp // self._resolution)
+
+    def add(self, key: str, expires_at: float) -> None:
+        self._buckets.setdefault(self._tick(expires_at), set()).add(key)
+
+    def discard(self, key: str, expires_at: float) -> None:
+        tick = self._tick(expires_at)
+        bucket = self._buckets.get(tick)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[tick]
+
+    def advance(self, now: float) -> List[str]:
+        """Pop keys from all buckets that ended before `now`."""
+        current = self._tick(now)
+        if current <= self._cursor:
+            return []
+
+        # After a long idle gap, visiting existing buckets beats stepping ticks
+        if current - self._cursor > len(self._buckets):
+            ticks = [tick for tick in self._buckets if tick < current]
+        else:
+            ticks = range(self._cursor, current)
+
+        due: List[str] = []
+        for tick in ticks:
+            bucket = self._buckets.pop(tick, None)
+            if bucket:
+                due.extend(bucket)
+
+        self._cursor = current
+        return due
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
 class InferenceCache:
     """
-    In-memory TTL cache for inference results.
+    In-memory LRU/TTL cache for inference results.
 
-    Designed to be Redis-upgrade-ready:
-    - Simple get/set interface
+    - Simple get/set interface (by text, or by precomputed key)
     - TTL-based expiration
     - Key normalization built-in
 
-    Thread-safety: Safe for single-worker deployment.
-    For multi-worker, upgrade to Redis.
+    All operations are O(1) amortized. When either bound (entries or
+    bytes) is exceeded, least-recently-used entries are evicted.
+
+    With a second-tier `backend`, memory misses read through to it (hits
+    are promoted with their remaining TTL) and sets are written behind in
+    batches. The backend is wrapped in a circuit breaker, so failures
+    degrade to memory-only instead of failing or slowing requests.
+
+    Thread-safety: Safe for multi-threaded use within one process.
+    Workers share results only through the backend.
     """
 
-    def __init__(self, default_ttl: int = DEFAULT_TTL_SECONDS):
-        self._cache: Dict[str, CacheEntry] = {}
-        self._default_ttl = default_ttl
+    def __init__(
+        self,
+        default_ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._wheel = TimeWheel()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self._default_ttl = default_ttl or int(
+            os.getenv("NLP_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+        )
+        self._max_entries = max_entries or int(
+            os.getenv("NLP_CACHE_MAX_ENTRIES", MAX_CACHE_SIZE)
+        )
+        self._max_bytes = max_bytes or int(
+            os.getenv("NLP_CACHE_MAX_BYTES", MAX_CACHE_BYTES)
+        )
+
+        # Second tier
+        if backend is not None and not isinstance(backend, GuardedBackend):
+            backend = GuardedBackend(backend)
+        self._backend = backend
+        self._writer = WriteBehindWriter(backend) if backend is not None else None
 
         # Statistics
         self._stats = {
@@ -105,15 +244,169 @@ class InferenceCache:
             "sets": 0,
             "evictions": 0,
             "expired_cleanups": 0,
+            "backend_hits": 0,
         }
 
     def _make_key(self, text: str) -> str:
         """Generate cache key from text."""
         return hash_text(text)
 
-    def get(self, text: str) -> Optional[Dict[str, Any]]:
+    # -------------------------------------------------------------------------
+    # Internal (caller holds the lock)
+    # -------------------------------------------------------------------------
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size_bytes
+            self._wheel.discard(key, entry.expires_at)
+        return entry
+
+    def _expire_due(self, now: float) -> None:
+        """Drop entries from expiry buckets that have fully passed."""
+        for key in self._wheel.advance(now):
+            entry = self._cache.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._remove(key)
+                self._stats["expired_cleanups"] += 1
+
+    def _evict_to_fit(self) -> None:
+        """Evict least-recently-used entries until within both bounds."""
+        while self._cache and (
+            len(self._cache) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            key, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size_bytes
+            self._wheel.discard(key, entry.expires_at)
+            self._stats["evictions"] += 1
+
+    def _get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        """Memory lookup. Misses are counted by the caller (the backend may still hit)."""
+        entry = self._cache.get(key)
+
+        if entry is None:
+            return None
+
+        if entry.expires_at <= now:
+            # Remove expired entry
+            self._remove(key)
+            self._stats["expired_cleanups"] += 1
+            return None
+
+        # Cache hit
+        self._cache.move_to_end(key)
+        entry.record_hit()
+        self._stats["hits"] += 1
+        return entry.value
+
+    def _set(self, key: str, value: Dict[str, Any], expires_at: float, now: float) -> None:
+        self._remove(key)
+
+        entry = CacheEntry(
+            value=value,
+            created_at=now,
+            expires_at=expires_at,
+            size_bytes=estimate_size(value) + len(key),
+        )
+        self._cache[key] = entry
+        self._bytes += entry.size_bytes
+        self._wheel.add(key, entry.expires_at)
+
+        self._evict_to_fit()
+
+    def _get_from_backend(self, keys: List[str], now: float) -> Dict[str, Dict[str, Any]]:
+        """Read through to the second tier (one round trip); promote hits."""
+        found: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        remote: List[str] = []
+        for key in keys:
+            # Written-behind but not yet flushed
+            item = self._writer.pending(key)
+            if item is not None and item[2] > now:
+                found[key] = (item[1], item[2])
+            else:
+                remote.append(key)
+
+        if remote:
+            found.update(self._backend.get_many(remote))
+        if not found:
+            return {}
+
+        with self._lock:
+            for key, (value, expires_at) in found.items():
+                # A concurrent set() may have stored a fresher value meanwhile
+                if key not in self._cache:
+                    self._set(key, value, expires_at, now)
+            self._stats["backend_hits"] += len(found)
+        return {key: value for key, (value, _) in found.items()}
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def get_many_by_key(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
         """
-        Get cached result for text.
+        Get cached results for precomputed keys (see hash_texts).
+
+        One memory pass under a single lock, then one backend round trip
+        for every memory miss. Returns a value (or None) per key, in order.
+        Expired entries are removed on access.
+        """
+        try:
+            now = time.time()
+            with self._lock:
+                self._expire_due(now)
+                values = [self._get(key, now) for key in keys]
+
+            missing = [i for i, value in enumerate(values) if value is None]
+            if missing and self._backend is not None:
+                # Backend I/O happens outside the memory lock
+                fetched = self._get_from_backend(list({keys[i]: None for i in missing}), now)
+                for i in missing:
+                    values[i] = fetched.get(keys[i])
+                missing = [i for i in missing if values[i] is None]
+
+            with self._lock:
+                self._stats["misses"] += len(missing)
+            return values
+
+        except Exception as e:
+            # Cache failure must not crash inference
+            logger.error(f"Cache get error: {e}")
+            with self._lock:
+                self._stats["misses"] += len(keys)
+            return [None] * len(keys)
+
+    def set_many_by_key(
+        self,
+        items: List[Tuple[str, Dict[str, Any]]],
+        ttl: Optional[int] = None,
+    ) -> int:
+        """
+        Store (key, result) pairs under one lock; queue them for the
+        backend in one write-behind batch. Returns count stored.
+        """
+        if not items:
+            return 0
+        try:
+            now = time.time()
+            expires_at = now + (ttl or self._default_ttl)
+            with self._lock:
+                self._expire_due(now)
+                for key, value in items:
+                    self._set(key, value, expires_at, now)
+                self._stats["sets"] += len(items)
+            if self._writer is not None:
+                self._writer.put_many([(key, value, expires_at) for key, value in items])
+            return len(items)
+
+        except Exception as e:
+            # Cache failure must not crash inference
+            logger.error(f"Cache set error: {e}")
+            return 0
+
+    def get_by_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached result by precomputed key (see hash_text).
 
         Returns None if:
         - Key not found
@@ -121,31 +414,28 @@ class InferenceCache:
 
         Expired entries are removed on access.
         """
-        try:
-            key = self._make_key(text)
-            entry = self._cache.get(key)
+        return self.get_many_by_key([key])[0]
 
-            if entry is None:
-                self._stats["misses"] += 1
-                return None
+    def set_by_key(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """Store result under a precomputed key. Returns False on error."""
+        return self.set_many_by_key([(key, value)], ttl) == 1
 
-            if entry.is_expired:
-                # Remove expired entry
-                del self._cache[key]
-                self._stats["misses"] += 1
-                self._stats["expired_cleanups"] += 1
-                return None
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached result for text.
 
-            # Cache hit
-            entry.record_hit()
-            self._stats["hits"] += 1
-            return entry.value
+        Returns None if:
+        - Key not found
+        - Entry expired
 
-        except Exception as e:
-            # Cache failure must not crash inference
-            logger.error(f"Cache get error: {e}")
-            self._stats["misses"] += 1
-            return None
+        Expired entries are removed on access.
+        """
+        return self.get_by_key(self._make_key(text))
 
     def set(
         self,
@@ -164,32 +454,7 @@ class InferenceCache:
         Returns:
             True if stored successfully, False on error
         """
-        try:
-            # Cleanup if cache is full
-            if len(self._cache) >= MAX_CACHE_SIZE:
-                self._cleanup_expired()
-
-                # If still full, evict oldest entries
-                if len(self._cache) >= MAX_CACHE_SIZE:
-                    self._evict_oldest(MAX_CACHE_SIZE // 10)
-
-            key = self._make_key(text)
-            ttl_seconds = ttl or self._default_ttl
-            now = datetime.now(timezone.utc)
-
-            self._cache[key] = CacheEntry(
-                value=value,
-                created_at=now,
-                expires_at=now + timedelta(seconds=ttl_seconds),
-            )
-
-            self._stats["sets"] += 1
-            return True
-
-        except Exception as e:
-            # Cache failure must not crash inference
-            logger.error(f"Cache set error: {e}")
-            return False
+        return self.set_by_key(self._make_key(text), value, ttl)
 
     def get_many(self, texts: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
         """
@@ -197,10 +462,7 @@ class InferenceCache:
 
         Returns dict mapping original text to result (or None if not cached).
         """
-        results = {}
-        for text in texts:
-            results[text] = self.get(text)
-        return results
+        return dict(zip(texts, self.get_many_by_key(hash_texts(texts))))
 
     def set_many(
         self,
@@ -217,67 +479,61 @@ class InferenceCache:
         Returns:
             Number of items successfully stored
         """
-        success_count = 0
-        for text, value in items:
-            if self.set(text, value, ttl):
-                success_count += 1
-        return success_count
-
-    def _cleanup_expired(self) -> int:
-        """Remove all expired entries. Returns count removed."""
-        now = datetime.now(timezone.utc)
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.expires_at < now
-        ]
-
-        for key in expired_keys:
-            del self._cache[key]
-
-        self._stats["expired_cleanups"] += len(expired_keys)
-        logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
-        return len(expired_keys)
-
-    def _evict_oldest(self, count: int) -> int:
-        """Evict oldest entries. Returns count evicted."""
-        if count <= 0 or not self._cache:
-            return 0
-
-        # Sort by created_at
-        sorted_keys = sorted(
-            self._cache.keys(),
-            key=lambda k: self._cache[k].created_at
+        keys = hash_texts([text for text, _ in items])
+        return self.set_many_by_key(
+            [(key, value) for key, (_, value) in zip(keys, items)], ttl
         )
 
-        evicted = 0
-        for key in sorted_keys[:count]:
-            del self._cache[key]
-            evicted += 1
-
-        self._stats["evictions"] += evicted
-        logger.debug(f"Evicted {evicted} oldest cache entries")
-        return evicted
-
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        total_requests = self._stats["hits"] + self._stats["misses"]
-        hit_ratio = (
-            self._stats["hits"] / total_requests
-            if total_requests > 0
-            else 0.0
-        )
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["backend_hits"]
+            total_requests = hits + self._stats["misses"]
+            hit_ratio = (
+                hits / total_requests
+                if total_requests > 0
+                else 0.0
+            )
 
-        return {
-            **self._stats,
-            "size": len(self._cache),
-            "hit_ratio": round(hit_ratio, 3),
-            "total_requests": total_requests,
-        }
+            return {
+                **self._stats,
+                "size": len(self._cache),
+                "bytes": self._bytes,
+                "max_entries": self._max_entries,
+                "max_bytes": self._max_bytes,
+                "hit_ratio": round(hit_ratio, 3),
+                "total_requests": total_requests,
+                "backend": self._backend_stats(),
+            }
+
+    def _backend_stats(self) -> Optional[Dict[str, Any]]:
+        if self._backend is None:
+            return None
+        return {**self._backend.get_stats(), "write_behind": self._writer.get_stats()}
+
+    def flush(self) -> int:
+        """Write queued entries to the second tier now. Returns count written."""
+        if self._writer is None:
+            return 0
+        return self._writer.flush()
+
+    def close(self) -> None:
+        """Flush pending writes and close the second tier."""
+        if self._backend is None:
+            return
+        self._writer.close()
+        self._backend.close()
 
     def clear(self) -> int:
         """Clear all cache entries. Returns count cleared."""
-        count = len(self._cache)
-        self._cache.clear()
+        with self._lock:
+            count = len(self._cache)
+            self._cache.clear()
+            self._wheel.clear()
+            self._bytes = 0
+        if self._backend is not None:
+            self._writer.flush()
+            self._backend.clear()
         logger.info(f"Cache cleared: {count} entries removed")
         return count
 
@@ -286,9 +542,47 @@ class InferenceCache:
 _cache: Optional[InferenceCache] = None
 
 
+def create_cache_backend(name: Optional[str] = None) -> Optional[CacheBackend]:
+    """
+    Open the configured second-tier backend (NLP_CACHE_BACKEND).
+
+    Returns None (memory-only) when disabled or when the backend cannot
+    be created; a backend that becomes unreachable later is handled by
+    its circuit breaker.
+    """
+    name = name or get_cache_backend_name()
+    if name == NO_BACKEND:
+        return None
+
+    try:
+        if name == REDIS_BACKEND:
+            backend = RedisCacheBackend()
+            logger.info("Inference cache second tier: redis")
+            return backend
+
+        path = get_disk_path()
+        if not path:
+            return None
+        backend = SQLiteCacheBackend(path)
+        logger.info(f"Inference cache second tier: sqlite ({path})")
+        return backend
+    except Exception as e:
+        # Cache failure must not crash inference; run memory-only
+        logger.warning(f"Cache backend '{name}' unavailable, running memory-only: {e}")
+        return None
+
+
 def get_cache() -> InferenceCache:
     """Get or create singleton cache instance."""
     global _cache
     if _cache is None:
-        _cache = InferenceCache()
+        _cache = InferenceCache(backend=create_cache_backend())
     return _cache
+
+
+def shutdown_cache() -> None:
+    """Flush and close the singleton cache's second tier."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
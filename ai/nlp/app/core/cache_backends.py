@@ -0,0 +1,310 @@
+# ============================================================================
+# CACHE BACKENDS
+# Second-tier stores behind the in-memory InferenceCache
+# ============================================================================
+#
+# The memory tier is per process. A backend adds a second tier that is
+# persistent (SQLite, cache_disk) or shared by every worker and replica
+# (Redis, cache_redis). All backends speak the same bulk interface:
+# - get_many(keys) -> {key: (value, expires_at)} in one round trip
+# - set_many([(key, value, expires_at)]) in one transaction / pipeline
+#
+# Writes reach the backend through WriteBehindWriter (batched, off the
+# request path). Every backend is wrapped in GuardedBackend: after repeated
+# failures the circuit opens and the cache runs memory-only until a trial
+# call succeeds, so an unreachable backend never adds latency per request.
+#
+# Configuration (env):
+# - NLP_CACHE_BACKEND: sqlite | redis | none (default: sqlite)
+# - NLP_CACHE_BACKEND_FAILURES: consecutive failures that open the
+#   circuit (default: 3)
+# - NLP_CACHE_BACKEND_COOLDOWN: seconds before retrying an open circuit
+#   (default: 30)
+# - NLP_CACHE_DISK_FLUSH_MS: max delay before queued writes flush (default: 500)
+# - NLP_CACHE_DISK_BATCH: queued writes that trigger an early flush (default: 256)
+# ============================================================================
+
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Backend names
+SQLITE_BACKEND = "sqlite"
+REDIS_BACKEND = "redis"
+NO_BACKEND = "none"
+CACHE_BACKENDS = (SQLITE_BACKEND, REDIS_BACKEND, NO_BACKEND)
+
+# Defaults
+DEFAULT_FLUSH_MS = 500
+DEFAULT_FLUSH_BATCH = 256
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN_SECONDS = 30.0
+PURGE_INTERVAL_SECONDS = 3600
+
+# (key, value, expires_at)
+StoredItem = Tuple[str, Dict[str, Any], float]
+
+
+def get_cache_backend_name() -> str:
+    """Get configured second-tier backend (NLP_CACHE_BACKEND)."""
+    name = os.getenv("NLP_CACHE_BACKEND", SQLITE_BACKEND).lower()
+    if name not in CACHE_BACKENDS:
+        logger.warning(f"Unknown cache backend '{name}', using '{SQLITE_BACKEND}'")
+        return SQLITE_BACKEND
+    return name
+
+
+def _to_builtin(value: Any) -> Any:
+    """JSON fallback for numpy scalars and other non-native values."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def encode_value(value: Any) -> str:
+    return json.dumps(value, default=_to_builtin, separators=(",", ":"))
+
+
+class CacheBackend(ABC):
+    """
+    Bulk key/value store with per-entry expiry (epoch seconds).
+
+    Keys are cache keys (hash_text output); values are JSON-serializable.
+    Implementations raise on failure; GuardedBackend turns failures into
+    misses and dropped writes.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        """Look up keys; returns {key: (value, expires_at)} for live entries."""
+
+    @abstractmethod
+    def set_many(self, items: List[StoredItem]) -> int:
+        """Store entries in one round trip. Returns count written."""
+
+    def purge_expired(self) -> int:
+        """Delete expired entries (no-op for stores that expire natively)."""
+        return 0
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete every entry."""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+    def close(self) -> None:
+        pass
+
+
+class GuardedBackend(CacheBackend):
+    """
+    Circuit breaker around a backend.
+
+    After `failure_threshold` consecutive errors the circuit opens: reads
+    return nothing and writes are dropped without touching the backend.
+    Once `cooldown` seconds have passed one trial call goes through; on
+    success the circuit closes again.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        failure_threshold: Optional[int] = None,
+        cooldown: Optional[float] = None,
+    ):
+        self._backend = backend
+        self.name = backend.name
+        self._failure_threshold = failure_threshold or int(
+            os.getenv("NLP_CACHE_BACKEND_FAILURES", DEFAULT_FAILURE_THRESHOLD)
+        )
+        self._cooldown = cooldown if cooldown is not None else float(
+            os.getenv("NLP_CACHE_BACKEND_COOLDOWN", DEFAULT_COOLDOWN_SECONDS)
+        )
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+        self._stats = {"errors": 0, "trips": 0, "short_circuited": 0}
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def _allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self._cooldown:
+                # Half-open: let this call try; a failure re-opens the circuit
+                self._opened_at = time.monotonic()
+                return True
+            self._stats["short_circuited"] += 1
+            return False
+
+    def _record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Cache backend '{self.name}' reachable again, circuit closed")
+            self._failures = 0
+            self._opened_at = None
+
+    def _record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self._failures += 1
+            self._stats["errors"] += 1
+            if self._failures >= self._failure_threshold and self._opened_at is None:
+                self._opened_at = time.monotonic()
+                self._stats["trips"] += 1
+                logger.warning(
+                    f"Cache backend '{self.name}' failing ({error}), "
+                    f"running memory-only for {self._cooldown:.0f}s"
+                )
+
+    def _call(self, method: str, default: Any, *args: Any) -> Any:
+        if not self._allow():
+            return default
+        try:
+            result = getattr(self._backend, method)(*args)
+        except Exception as e:
+            self._record_failure(e)
+            return default
+        self._record_success()
+        return result
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        return self._call("get_many", {}, list(keys))
+
+    def set_many(self, items: List[StoredItem]) -> int:
+        return self._call("set_many", 0, items)
+
+    def purge_expired(self) -> int:
+        return self._call("purge_expired", 0)
+
+    def clear(self) -> None:
+        self._call("clear", None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            circuit = {
+                "circuit": "open" if self._opened_at is not None else "closed",
+                **self._stats,
+            }
+        try:
+            return {**self._backend.get_stats(), **circuit}
+        except Exception as e:
+            return {"backend": self.name, "stats_error": str(e), **circuit}
+
+    def close(self) -> None:
+        try:
+            self._backend.close()
+        except Exception as e:
+            logger.warning(f"Error closing cache backend '{self.name}': {e}")
+
+
+class WriteBehindWriter:
+    """
+    Batches cache writes to a backend on a background thread.
+
+    Writes for the same key coalesce while queued (last one wins). The
+    queue flushes every flush_ms, or as soon as `batch_size` writes are
+    waiting. Queued values stay readable via pending() until written.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        flush_ms: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self._backend = backend
+        self._flush_interval = (
+            flush_ms if flush_ms is not None
+            else float(os.getenv("NLP_CACHE_DISK_FLUSH_MS", DEFAULT_FLUSH_MS))
+        ) / 1000
+        self._batch_size = batch_size or int(os.getenv("NLP_CACHE_DISK_BATCH", DEFAULT_FLUSH_BATCH))
+
+        self._pending: Dict[str, StoredItem] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._last_purge = time.time()
+
+        self._stats = {"queued": 0, "flushes": 0, "failed_flushes": 0}
+
+        self._thread = threading.Thread(target=self._run, name="cache-write-behind", daemon=True)
+        self._thread.start()
+
+    def put(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._pending[key] = (key, value, expires_at)
+            self._stats["queued"] += 1
+            full = len(self._pending) >= self._batch_size
+        if full:
+            self._wakeup.set()
+
+    def put_many(self, items: List[StoredItem]) -> None:
+        with self._lock:
+            for item in items:
+                self._pending[item[0]] = item
+            self._stats["queued"] += len(items)
+            full = len(self._pending) >= self._batch_size
+        if full:
+            self._wakeup.set()
+
+    def pending(self, key: str) -> Optional[StoredItem]:
+        """A queued (not yet written) entry for key, if any."""
+        with self._lock:
+            return self._pending.get(key)
+
+    def flush(self) -> int:
+        """Write everything queued now. Returns count written."""
+        with self._lock:
+            batch, self._pending = list(self._pending.values()), {}
+        if not batch:
+            return 0
+
+        try:
+            written = self._backend.set_many(batch)
+            self._stats["flushes"] += 1
+            return written
+        except Exception as e:
+            # Cache failure must not crash inference; drop the batch
+            self._stats["failed_flushes"] += 1
+            logger.error(f"Cache write-behind flush failed ({len(batch)} entries): {e}")
+            return 0
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+            if time.time() - self._last_purge > PURGE_INTERVAL_SECONDS:
+                self._last_purge = time.time()
+                try:
+                    self._backend.purge_expired()
+                except Exception as e:
+                    logger.warning(f"Cache purge failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending)}
+
+    def close(self) -> None:
+        """Stop the thread and flush what's left."""
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
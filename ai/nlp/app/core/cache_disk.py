@@ -0,0 +1,163 @@
+# ============================================================================
+# DISK CACHE TIER
+# Persistent SQLite backend behind the in-memory InferenceCache
+# ============================================================================
+#
+# The in-memory cache starts cold on every deploy, so the same trending
+# headlines are re-run through every model after each restart. This tier
+# keeps results on disk, keyed by the same SHA-256 as the memory tier:
+# - Read-through: a memory miss checks disk; hits are promoted to memory
+#   with their remaining TTL
+# - Write-behind: sets are queued and written in batches (one transaction
+#   per flush) by a background thread, never on the request path
+# - Expired rows are purged periodically
+#
+# SQLite in WAL mode allows concurrent readers and serializes writers
+# across processes, so gunicorn workers can share one file.
+#
+# Configuration (env):
+# - NLP_CACHE_DISK_PATH: database file; empty disables the tier
+#   (default: inference_cache.db in NLP_DATA_DIR, see paths)
+# ============================================================================
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app.core.cache_backends import SQLITE_BACKEND, CacheBackend, StoredItem, encode_value
+from app.core.paths import data_path
+
+
+# Defaults
+DEFAULT_DISK_FILENAME = "inference_cache.db"
+
+# SQLite limits bound parameters per statement
+_QUERY_CHUNK = 500
+
+
+def get_disk_path() -> str:
+    """Get configured database path (NLP_CACHE_DISK_PATH; empty disables)."""
+    path = os.getenv("NLP_CACHE_DISK_PATH")
+    return data_path(DEFAULT_DISK_FILENAME) if path is None else path
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite-backed key/value store with per-entry expiry.
+
+    Keys are cache keys (hash_text output); values are JSON documents.
+    """
+
+    name = SQLITE_BACKEND
+
+    def __init__(self, path: str):
+        self._path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)"
+            )
+
+        # Statistics
+        self._stats = {
+            "reads": 0,
+            "read_hits": 0,
+            "writes": 0,
+            "write_batches": 0,
+            "purged": 0,
+        }
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        """Look up keys; returns {key: (value, expires_at)} for live entries."""
+        keys = list(keys)
+        found: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        now = time.time()
+
+        with self._lock:
+            for i in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[i:i + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, expires_at FROM cache "
+                    f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+                for key, value, expires_at in rows:
+                    found[key] = (json.loads(value), expires_at)
+
+            self._stats["reads"] += len(keys)
+            self._stats["read_hits"] += len(found)
+
+        return found
+
+    def set_many(self, items: List[StoredItem]) -> int:
+        """Upsert entries in one transaction. Returns count written."""
+        if not items:
+            return 0
+
+        rows = [(key, encode_value(value), expires_at) for key, value, expires_at in items]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._stats["writes"] += len(rows)
+            self._stats["write_batches"] += 1
+        return len(rows)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows. Returns count removed."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            self._stats["purged"] += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                size_bytes = os.path.getsize(self._path)
+            except OSError:
+                size_bytes = 0
+            return {
+                "backend": self.name,
+                "path": self._path,
+                "file_bytes": size_bytes,
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,143 @@
+# ============================================================================
+# REDIS CACHE TIER
+# Shared result cache for every worker and replica
+# ============================================================================
+#
+# With the SQLite tier each host keeps its own file; with Redis every
+# gunicorn worker and every replica reads and writes one cache, so a text
+# analyzed anywhere is a hit everywhere.
+#
+# - Reads: one MGET per get_many (chunked for very large batches)
+# - Writes: one non-transactional pipeline of SET ... PX per flush
+# - Expiry is native (PX); values carry their absolute expiry so a promoted
+#   entry keeps its remaining TTL in the memory tier
+#
+# Any server speaking the Redis protocol works (Redis, Valkey, KeyDB,
+# Dragonfly). Requires the redis package (optional).
+#
+# Configuration (env):
+# - NLP_REDIS_URL: server URL (default: redis://localhost:6379/0)
+# - NLP_REDIS_PREFIX: key prefix (default: nlp:cache:)
+# - NLP_REDIS_TIMEOUT_MS: connect/socket timeout (default: 200)
+# ============================================================================
+
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.cache_backends import REDIS_BACKEND, CacheBackend, StoredItem, encode_value
+
+# Redis client is optional
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# Defaults
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+DEFAULT_KEY_PREFIX = "nlp:cache:"
+DEFAULT_TIMEOUT_MS = 200
+
+# Keys per MGET / SCAN-delete round trip
+_COMMAND_CHUNK = 1000
+
+
+def connect_redis(url: Optional[str] = None) -> Any:
+    """Create a Redis client from NLP_REDIS_URL with short timeouts."""
+    if not REDIS_AVAILABLE:
+        raise ImportError("Redis cache backend requires: pip install redis")
+
+    timeout = float(os.getenv("NLP_REDIS_TIMEOUT_MS", DEFAULT_TIMEOUT_MS)) / 1000
+    return redis.Redis.from_url(
+        url or os.getenv("NLP_REDIS_URL", DEFAULT_REDIS_URL),
+        socket_timeout=timeout,
+        socket_connect_timeout=timeout,
+    )
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis-protocol key/value store.
+
+    Args:
+        client: Redis client (or compatible, e.g. fakeredis); created from
+            NLP_REDIS_URL when omitted
+        prefix: Namespace for cache keys
+    """
+
+    name = REDIS_BACKEND
+
+    def __init__(self, client: Any = None, prefix: Optional[str] = None):
+        self._client = client if client is not None else connect_redis()
+        self._prefix = prefix if prefix is not None else os.getenv(
+            "NLP_REDIS_PREFIX", DEFAULT_KEY_PREFIX
+        )
+
+        # Statistics
+        self._stats = {
+            "reads": 0,
+            "read_hits": 0,
+            "writes": 0,
+            "round_trips": 0,
+        }
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        """Look up keys with MGET; returns {key: (value, expires_at)}."""
+        keys = list(keys)
+        found: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        now = time.time()
+
+        for i in range(0, len(keys), _COMMAND_CHUNK):
+            chunk = keys[i:i + _COMMAND_CHUNK]
+            raw = self._client.mget([self._prefix + key for key in chunk])
+            self._stats["round_trips"] += 1
+            for key, payload in zip(chunk, raw):
+                if payload is None:
+                    continue
+                entry = json.loads(payload)
+                if entry["e"] > now:
+                    found[key] = (entry["v"], entry["e"])
+
+        self._stats["reads"] += len(keys)
+        self._stats["read_hits"] += len(found)
+        return found
+
+    def set_many(self, items: List[StoredItem]) -> int:
+        """Write entries in one pipeline. Returns count written."""
+        now = time.time()
+        live = [(key, value, expires_at) for key, value, expires_at in items if expires_at > now]
+        if not live:
+            return 0
+
+        pipe = self._client.pipeline(transaction=False)
+        for key, value, expires_at in live:
+            pipe.set(
+                self._prefix + key,
+                encode_value({"e": expires_at, "v": value}),
+                px=max(1, int((expires_at - now) * 1000)),
+            )
+        pipe.execute()
+
+        self._stats["round_trips"] += 1
+        self._stats["writes"] += len(live)
+        return len(live)
+
+    def clear(self) -> None:
+        """Delete every key under the prefix."""
+        batch = []
+        for key in self._client.scan_iter(match=self._prefix + "*", count=_COMMAND_CHUNK):
+            batch.append(key)
+            if len(batch) >= _COMMAND_CHUNK:
+                self._client.delete(*batch)
+                batch = []
+        if batch:
+            self._client.delete(*batch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "prefix": self._prefix, **self._stats}
+
+    def close(self) -> None:
+        self._client.close()
@@ -0,0 +1,402 @@
+# ============================================================================
+# INFERENCE EXECUTOR
+# Dedicated thread pool for blocking model inference
+# ============================================================================
+#
+# HuggingFace pipelines are synchronous and CPU-bound. Calling them from an
+# `async def` handler blocks the event loop, stalling /health, SSE streams and
+# every other in-flight request for the duration of the forward pass.
+#
+# All service calls go through this executor instead:
+# - Pool size derived from cores / intra-op threads (configurable)
+# - Queue depth and wait-time metrics for observability
+# - Never runs inference on the event loop thread
+#
+# Priority lanes:
+# Dashboard calls, SSE streams and bulk backfills share the same workers.
+# Each task is queued in a lane and a free worker always takes the oldest
+# task of the highest non-empty lane:
+#   interactive (single-text endpoints) > streaming (SSE) > bulk (batch)
+# Bulk requests are split into chunks queued as separate tasks
+# (run_chunked), so interactive work waits for at most one chunk rather
+# than a whole 1,000-text backfill. A lower lane passed over
+# NLP_LANE_MAX_SKIPS times in a row gets the next worker, so bulk work
+# still progresses under sustained interactive load.
+#
+# Configuration (env):
+# - NLP_INFERENCE_WORKERS: worker thread count (default: cores // intra-op)
+# - NLP_INTRA_OP_THREADS: torch intra-op threads per forward pass
+# - NLP_BULK_CHUNK_SIZE: texts per bulk task (default: 64)
+# - NLP_LANE_MAX_SKIPS: times a waiting lane is passed over before it runs
+#   anyway (default: 16)
+# ============================================================================
+
+import asyncio
+import functools
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+
+T = TypeVar('T')
+
+# Priority lanes, highest first
+INTERACTIVE_LANE = "interactive"
+STREAMING_LANE = "streaming"
+BULK_LANE = "bulk"
+LANES = (INTERACTIVE_LANE, STREAMING_LANE, BULK_LANE)
+
+# Defaults
+DEFAULT_BULK_CHUNK_SIZE = 64
+DEFAULT_MAX_SKIPS = 16
+LATENCY_WINDOW = 1024
+
+# (call, future, lane, submitted_at)
+_Task = Tuple[Callable[[], Any], Future, str, float]
+
+
+def _detect_intra_op_threads() -> int:
+    """
+    Determine torch intra-op threads per forward pass.
+
+    Uses NLP_INTRA_OP_THREADS if set (and applies it to torch),
+    otherwise reports torch's current setting. Falls back to 1
+    if torch is unavailable.
+    """
+    configured = os.getenv("NLP_INTRA_OP_THREADS")
+
+    try:
+        import torch
+
+        if configured:
+            torch.set_num_threads(max(1, int(configured)))
+        return max(1, torch.get_num_threads())
+    except ImportError:
+        return max(1, int(configured)) if configured else 1
+    except Exception as e:
+        logger.warning(f"Failed to configure intra-op threads: {e}")
+        return 1
+
+
+def default_worker_count(intra_op_threads: int) -> int:
+    """
+    Compute default inference worker count.
+
+    Each worker runs one forward pass that itself uses `intra_op_threads`
+    cores, so cores // intra_op_threads keeps the CPU busy without
+    oversubscribing it. Always at least 1.
+    """
+    configured = os.getenv("NLP_INFERENCE_WORKERS")
+    if configured:
+        return max(1, int(configured))
+
+    num_cpus = os.cpu_count() or 1
+    return max(1, num_cpus // max(1, intra_op_threads))
+
+
+def bulk_chunk_size() -> int:
+    """Texts per bulk task (NLP_BULK_CHUNK_SIZE)."""
+    return max(1, int(os.getenv("NLP_BULK_CHUNK_SIZE", DEFAULT_BULK_CHUNK_SIZE)))
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+class _LaneStats:
+    """Counters and recent latencies for one priority lane."""
+
+    def __init__(self) -> None:
+        self.queue: Deque[_Task] = deque()
+        self.skips = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        # Submit -> finish and submit -> start, most recent LATENCY_WINDOW tasks
+        self.latency_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.wait_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latency = sorted(self.latency_ms)
+        wait = sorted(self.wait_ms)
+        return {
+            "queued": len(self.queue),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "p50_ms": round(percentile(latency, 50), 2),
+            "p99_ms": round(percentile(latency, 99), 2),
+            "p50_wait_ms": round(percentile(wait, 50), 2),
+            "p99_wait_ms": round(percentile(wait, 99), 2),
+        }
+
+
+class InferenceExecutor:
+    """
+    Worker threads dedicated to blocking model inference, fed by
+    priority lanes.
+
+    Usage:
+        result = await executor.run(analyze_emotion, text=..., emotion_model=...)
+        parts = await executor.run_chunked(run_batch, texts, registry, lane=BULK_LANE)
+
+    Metrics:
+    - queue_depth: tasks submitted but not yet started
+    - in_flight: tasks currently running
+    - wait time: submit -> start latency (queueing delay)
+    - run time: start -> finish latency (inference cost)
+    - lanes: per lane queue length and p50/p99 latency and wait
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        intra_op_threads: Optional[int] = None,
+        max_skips: Optional[int] = None,
+    ):
+        self._intra_op_threads = intra_op_threads or _detect_intra_op_threads()
+        self._max_workers = max_workers or default_worker_count(self._intra_op_threads)
+        self._max_skips = max_skips if max_skips is not None else int(
+            os.getenv("NLP_LANE_MAX_SKIPS", DEFAULT_MAX_SKIPS)
+        )
+
+        self._lock = threading.Lock()
+        self._work_ready = threading.Condition(self._lock)
+        self._lanes = {lane: _LaneStats() for lane in LANES}
+        self._stopped = False
+
+        # Live gauges
+        self._queue_depth = 0
+        self._in_flight = 0
+
+        # Statistics
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "total_run_ms": 0.0,
+        }
+
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"inference_{i}", daemon=True)
+            for i in range(self._max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        logger.info(
+            f"Inference executor: {self._max_workers} workers, "
+            f"{self._intra_op_threads} intra-op threads each"
+        )
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def _next_task(self) -> Optional[_Task]:
+        """Pop the next task (lock held): highest lane first, unless a lower
+        lane has been passed over max_skips times."""
+        waiting = [lane for lane in LANES if self._lanes[lane].queue]
+        if not waiting:
+            return None
+
+        chosen = waiting[0]
+        for lane in waiting[1:]:
+            if self._lanes[lane].skips >= self._max_skips:
+                chosen = lane
+                break
+        for lane in waiting:
+            self._lanes[lane].skips = 0 if lane == chosen else self._lanes[lane].skips + 1
+
+        self._queue_depth -= 1
+        return self._lanes[chosen].queue.popleft()
+
+    def _worker(self) -> None:
+        while True:
+            with self._work_ready:
+                task = self._next_task()
+                while task is None and not self._stopped:
+                    self._work_ready.wait()
+                    task = self._next_task()
+                if task is None:
+                    return
+
+            call, future, lane, submitted_at = task
+            stats = self._lanes[lane]
+            if not future.set_running_or_notify_cancel():
+                # Caller went away while queued
+                with self._lock:
+                    stats.cancelled += 1
+                continue
+
+            started_at = time.perf_counter()
+            wait_ms = (started_at - submitted_at) * 1000
+            with self._lock:
+                self._in_flight += 1
+                self._stats["total_wait_ms"] += wait_ms
+                self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+                stats.wait_ms.append(wait_ms)
+
+            error: Optional[BaseException] = None
+            try:
+                result = call()
+            except BaseException as e:
+                error = e
+
+            # Record before resolving, so callers see their own task counted
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._in_flight -= 1
+                self._stats["total_run_ms"] += (finished_at - started_at) * 1000
+                self._stats["failed" if error else "completed"] += 1
+                stats.latency_ms.append((finished_at - submitted_at) * 1000)
+                if error:
+                    stats.failed += 1
+                else:
+                    stats.completed += 1
+
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def submit(self, call: Callable[[], T], lane: str = INTERACTIVE_LANE) -> "Future[T]":
+        """Queue a blocking callable in a lane. Returns its future."""
+        if lane not in self._lanes:
+            raise ValueError(f"Unknown inference lane '{lane}' (expected one of {LANES})")
+
+        future: Future = Future()
+        with self._work_ready:
+            if self._stopped:
+                raise RuntimeError("Inference executor is shut down")
+            self._lanes[lane].queue.append((call, future, lane, time.perf_counter()))
+            self._lanes[lane].submitted += 1
+            self._queue_depth += 1
+            self._stats["submitted"] += 1
+            self._work_ready.notify()
+        return future
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        lane: str = INTERACTIVE_LANE,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Run a blocking callable on the inference workers and await its result.
+
+        Exceptions raised by `fn` propagate to the caller unchanged. If the
+        caller is cancelled before a worker picks the task up, it never runs.
+
+        `lane` is taken by run() itself; to pass a `lane` keyword through to
+        `fn`, bind it first with functools.partial.
+        """
+        future = self.submit(functools.partial(fn, *args, **kwargs), lane)
+        return await asyncio.wrap_future(future)
+
+    async def run_chunked(
+        self,
+        fn: Callable[..., T],
+        items: Sequence[Any],
+        *args: Any,
+        chunk_size: Optional[int] = None,
+        lane: str = BULK_LANE,
+        **kwargs: Any,
+    ) -> List[T]:
+        """
+        Run fn(chunk, *args, **kwargs) for each chunk of items, each chunk
+        a separate task, so higher-priority work runs between chunks.
+
+        Returns:
+            fn's result per chunk, in chunk order
+        """
+        size = chunk_size or bulk_chunk_size()
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        return list(await asyncio.gather(
+            *(self.run(fn, chunk, *args, lane=lane, **kwargs) for chunk in chunks)
+        ))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics."""
+        with self._lock:
+            finished = self._stats["completed"] + self._stats["failed"]
+            started = finished + self._in_flight
+
+            return {
+                "max_workers": self._max_workers,
+                "intra_op_threads": self._intra_op_threads,
+                "queue_depth": self._queue_depth,
+                "in_flight": self._in_flight,
+                "submitted": self._stats["submitted"],
+                "completed": self._stats["completed"],
+                "failed": self._stats["failed"],
+                "avg_wait_ms": round(self._stats["total_wait_ms"] / started, 2) if started else 0.0,
+                "max_wait_ms": round(self._stats["max_wait_ms"], 2),
+                "avg_run_ms": round(self._stats["total_run_ms"] / finished, 2) if finished else 0.0,
+                "bulk_chunk_size": bulk_chunk_size(),
+                "lane_max_skips": self._max_skips,
+                "lanes": {lane: stats.to_dict() for lane, stats in self._lanes.items()},
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers, cancelling tasks that haven't started."""
+        with self._work_ready:
+            self._stopped = True
+            for stats in self._lanes.values():
+                while stats.queue:
+                    _, future, _, _ = stats.queue.popleft()
+                    future.cancel()
+                    stats.cancelled += 1
+            self._queue_depth = 0
+            self._work_ready.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        logger.info("Inference executor shut down")
+
+
+# Singleton instance
+_executor: Optional[InferenceExecutor] = None
+
+
+def get_executor() -> InferenceExecutor:
+    """Get or create singleton inference executor."""
+    global _executor
+    if _executor is None:
+        _executor = InferenceExecutor()
+    return _executor
+
+
+async def run_inference(
+    fn: Callable[..., T],
+    *args: Any,
+    lane: str = INTERACTIVE_LANE,
+    **kwargs: Any,
+) -> T:
+    """Run a blocking inference callable on the shared inference executor."""
+    return await get_executor().run(fn, *args, lane=lane, **kwargs)
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut down the singleton executor (if created)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
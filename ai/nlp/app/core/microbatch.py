@@ -0,0 +1,148 @@
+# ============================================================================
+# DYNAMIC MICRO-BATCHING
+# Coalesce concurrent single-text requests into one padded forward pass
+# ============================================================================
+#
+# Single-text endpoints (/sentiment/finance, /sentiment/social, /emotion,
+# /ner) each ran a batch-of-one pipeline call per HTTP request. On CPU
+# that leaves most of the transformer's throughput unused.
+#
+# A MicroBatcher sits in front of one pipeline:
+# - Requests are queued with an asyncio future each
+# - The queue is flushed when it reaches max_batch_size OR when the
+#   oldest request has waited max_wait_ms
+# - One pipeline call runs the whole batch on the inference executor
+# - Results (or the exception) are fanned back to the waiting futures
+#
+# Configuration (env):
+# - NLP_MICROBATCH_MAX_WAIT_MS: max time to hold a request (default: 10)
+# - NLP_MICROBATCH_MAX_SIZE: max texts per coalesced batch (default: 16)
+# ============================================================================
+
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .executor import InferenceExecutor, get_executor
+
+logger = logging.getLogger(__name__)
+
+
+# Micro-batching defaults
+DEFAULT_MAX_WAIT_MS = 10.0
+DEFAULT_MAX_BATCH_SIZE = 16
+
+
+class MicroBatcher:
+    """
+    Async micro-batcher for a single pipeline.
+
+    The pipeline must accept a list of texts and return one result per
+    text, in order (standard HuggingFace pipeline behavior for list input).
+    `submit()` returns that per-text result, i.e. the same value as
+    `pipeline([text])[0]`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pipeline: Callable[..., List[Any]],
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        executor: Optional[InferenceExecutor] = None,
+    ):
+        self.name = name
+        self._pipeline = pipeline
+        self._max_batch_size = max_batch_size or int(
+            os.getenv("NLP_MICROBATCH_MAX_SIZE", DEFAULT_MAX_BATCH_SIZE)
+        )
+        self._max_wait = (
+            max_wait_ms if max_wait_ms is not None
+            else float(os.getenv("NLP_MICROBATCH_MAX_WAIT_MS", DEFAULT_MAX_WAIT_MS))
+        ) / 1000
+        self._executor = executor
+
+        # Pending (text, future) pairs and the flush timer for them
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Strong references to running batch tasks (avoid early GC)
+        self._tasks: set[asyncio.Task] = set()
+
+        # Statistics
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "max_batch_seen": 0,
+            "failed_batches": 0,
+        }
+
+    async def submit(self, text: str) -> Any:
+        """Queue a text for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self._pending.append((text, future))
+        self._stats["requests"] += 1
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Detach the pending batch and schedule its execution."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = []
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Run one padded pipeline call and fan results out to waiters."""
+        texts = [text for text, _ in batch]
+        self._stats["batches"] += 1
+        self._stats["batched_requests"] += len(texts)
+        self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(texts))
+
+        executor = self._executor or get_executor()
+        try:
+            results = await executor.run(self._pipeline, texts, batch_size=len(texts))
+            if len(results) != len(texts):
+                raise RuntimeError(
+                    f"{self.name}: pipeline returned {len(results)} results for {len(texts)} texts"
+                )
+        except Exception as e:
+            self._stats["failed_batches"] += 1
+            logger.error(f"Micro-batch inference failed for {self.name}: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # A waiter may have been cancelled (client went away)
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batcher statistics."""
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "max_batch_size": self._max_batch_size,
+            "max_wait_ms": round(self._max_wait * 1000, 2),
+            "avg_batch_size": round(self._stats["batched_requests"] / batches, 2) if batches else 0.0,
+        }
@@ -0,0 +1,260 @@
+# ============================================================================
+# MODEL OUTPUT CACHE
+# Per-model raw pipeline outputs in the shared InferenceCache
+# ============================================================================
+#
+# Caching one collapsed summary per text only helps the endpoint that
+# produced it. Caching each model's raw pipeline output instead lets every
+# service reuse it: /analyze, /sentiment/*, /emotion, /entities, streaming,
+# batch and the intelligence layer all build their responses from the same
+# raw outputs, so an identical text never re-runs a model it already ran
+# through.
+#
+# Keys: "<model id>@<revision>/<variant>:<sha256 of model input>"
+# - revision is the checkpoint commit the weights were loaded from
+# - variant covers everything else that changes outputs: backend
+#   (torch / onnx / onnx-int8), long-text mode and max length
+# - the model input is the cleaned text (whitespace already collapsed by
+#   prepare_text). Case is kept: cased models (NER, RoBERTa) give different
+#   outputs for "APPLE" and "apple"
+#
+# CachedPipeline wraps a loaded pipeline (the same extension point as
+# ChunkedClassifier / LazyPipeline / RemotePipeline): calls look up every
+# input, run only the misses through the model in one call, and store the
+# new outputs. Paths that bypass the pipeline call (shared encodings in
+# batch full analysis) use lookup() / store() directly.
+#
+# Bulk path: a batch hashes each unique input once (hash_model_inputs) and
+# passes the hashes to lookup() / store() for every model; lookups and
+# stores are one cache call (one backend round trip) per model. Identical
+# inputs within a call are inferred once, and concurrent calls missing the
+# same key wait on one computation (app.core.singleflight).
+#
+# Configuration (env):
+# - NLP_MODEL_CACHE: cache raw model outputs (default: true)
+# ============================================================================
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.cache import InferenceCache, get_cache
+from app.core.singleflight import Flight, SingleFlight, get_single_flight
+
+logger = logging.getLogger(__name__)
+
+
+# Revision used when the checkpoint commit is unknown (e.g. local exports)
+UNVERSIONED = "unversioned"
+
+
+def is_model_cache_enabled() -> bool:
+    """Whether raw model outputs are cached (NLP_MODEL_CACHE)."""
+    return os.getenv("NLP_MODEL_CACHE", "true").lower() in ("1", "true", "yes", "on")
+
+
+def hash_model_input(text: str) -> str:
+    """SHA-256 of the exact (cleaned) model input."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_model_inputs(texts: Sequence[str]) -> List[str]:
+    """hash_model_input for many texts; compute once, share across models."""
+    return [hash_model_input(text) for text in texts]
+
+
+def model_cache_id(
+    model_name: str,
+    revision: Optional[str] = None,
+    variant: str = "",
+) -> str:
+    """Identity of a model's outputs: name, checkpoint revision and variant."""
+    cache_id = f"{model_name}@{revision or UNVERSIONED}"
+    return f"{cache_id}/{variant}" if variant else cache_id
+
+
+def get_model_revision(pipe: Any) -> str:
+    """Checkpoint commit hash a pipeline's weights were loaded from."""
+    config = getattr(getattr(pipe, "model", None), "config", None)
+    return getattr(config, "_commit_hash", None) or UNVERSIONED
+
+
+class CachedPipeline:
+    """
+    Pipeline wrapper that serves repeated inputs from the cache.
+
+    Call semantics match the wrapped pipeline: a list returns one result
+    per input; a single string returns [result] for classifiers
+    (`single_as_list=True`) or the bare result for token classification.
+    Other attributes (tokenizer, model, ...) are delegated.
+
+    Args:
+        pipe: Loaded pipeline (or pipeline-like callable)
+        cache_id: Output identity from model_cache_id()
+        single_as_list: Whether a single-string call returns [result]
+        cache: InferenceCache to use (default: the shared singleton)
+        flights: SingleFlight to coalesce concurrent misses with (default:
+            the shared singleton)
+    """
+
+    def __init__(
+        self,
+        pipe: Any,
+        cache_id: str,
+        single_as_list: bool = True,
+        cache: Optional[InferenceCache] = None,
+        flights: Optional[SingleFlight] = None,
+    ):
+        self.pipeline = pipe
+        self.cache_id = cache_id
+        self._single_as_list = single_as_list
+        self._cache = cache
+        self._flights = flights
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "coalesced": 0}
+
+    @property
+    def cache(self) -> InferenceCache:
+        return self._cache if self._cache is not None else get_cache()
+
+    @property
+    def flights(self) -> SingleFlight:
+        return self._flights if self._flights is not None else get_single_flight()
+
+    def key_for(self, text: str) -> str:
+        return f"{self.cache_id}:{hash_model_input(text)}"
+
+    def keys_for(self, texts: Sequence[str], hashes: Optional[Sequence[str]] = None) -> List[str]:
+        if hashes is None:
+            hashes = hash_model_inputs(texts)
+        return [f"{self.cache_id}:{digest}" for digest in hashes]
+
+    def lookup(
+        self,
+        texts: Sequence[str],
+        hashes: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], List[int]]:
+        """
+        Look up cached outputs in one cache call.
+
+        Args:
+            texts: Model inputs
+            hashes: Precomputed hash_model_inputs(texts), to hash once per
+                request rather than once per model
+
+        Returns:
+            Tuple of (result per text, None where missing; indices of the
+            missing texts)
+        """
+        results = self.cache.get_many_by_key(self.keys_for(texts, hashes))
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        with self._lock:
+            self._stats["hits"] += len(texts) - len(missing)
+            self._stats["misses"] += len(missing)
+        return results, missing
+
+    def store(
+        self,
+        texts: Sequence[str],
+        results: Sequence[Any],
+        hashes: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Cache freshly computed outputs (None results are skipped)."""
+        items = [
+            (key, result)
+            for key, result in zip(self.keys_for(texts, hashes), results)
+            if result is not None
+        ]
+        stored = self.cache.set_many_by_key(items)
+        with self._lock:
+            self._stats["stored"] += stored
+
+    def begin_flight(self, keys: Sequence[str]) -> Flight:
+        """
+        Claim missed keys (see keys_for) before computing them.
+
+        Keys another request is already computing land in
+        Flight.following; compute only Flight.leading, store, resolve()
+        and close the flight, then wait() for the rest.
+        """
+        flight = self.flights.begin(keys)
+        with self._lock:
+            self._stats["coalesced"] += len(flight.following)
+        return flight
+
+    def __call__(self, inputs: Any, **kwargs: Any) -> Any:
+        single = isinstance(inputs, str)
+        texts = [inputs] if single else list(inputs)
+
+        hashes = hash_model_inputs(texts)
+        results, missing = self.lookup(texts, hashes)
+        if missing:
+            keys = self.keys_for(texts, hashes)
+
+            # Identical inputs in one call run once
+            unique: Dict[str, int] = {}
+            for i in missing:
+                unique.setdefault(keys[i], i)
+
+            # Concurrent calls missing the same input wait for one run
+            with self.begin_flight(list(unique)) as flight:
+                values = self._compute(
+                    [i for key, i in unique.items() if key in flight.leading],
+                    texts, hashes, keys, kwargs,
+                )
+                flight.resolve(values)
+
+            values.update(flight.wait())
+            values.update(self._compute(
+                [unique[key] for key in flight.following if key not in values],
+                texts, hashes, keys, kwargs,
+            ))
+            for i in missing:
+                results[i] = values.get(keys[i])
+
+        if single:
+            return results if self._single_as_list else results[0]
+        return results
+
+    def _compute(
+        self,
+        indices: List[int],
+        texts: List[str],
+        hashes: List[str],
+        keys: List[str],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run texts[indices] through the model and cache them; key -> output."""
+        if not indices:
+            return {}
+        outputs = self.pipeline([texts[i] for i in indices], **kwargs)
+        self.store([texts[i] for i in indices], outputs, [hashes[i] for i in indices])
+        return {keys[i]: output for i, output in zip(indices, outputs)}
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not set in __init__
+        if name.startswith("__") or name == "pipeline":
+            raise AttributeError(name)
+        return getattr(self.pipeline, name)
+
+    def __repr__(self) -> str:
+        return f"CachedPipeline({self.cache_id})"
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "cache_id": self.cache_id,
+                **self._stats,
+                "hit_ratio": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+def unwrap_cached(pipe: Any) -> Any:
+    """The pipeline inside a CachedPipeline (or pipe itself)."""
+    return pipe.pipeline if isinstance(pipe, CachedPipeline) else pipe
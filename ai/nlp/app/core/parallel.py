@@ -0,0 +1,243 @@
+# ============================================================================
+# PARALLEL MODEL GROUPS
+# Run the independent pipelines of full analysis concurrently
+# ============================================================================
+#
+# Full analysis runs finbert, finbert_tone, twitter, emotion and NER over
+# the same input. None depends on another, but they ran one after another,
+# so wall time was the SUM of all forward passes.
+#
+# In parallel mode each model (group) runs on its own thread from a small
+# dedicated pool, and wall time approaches the SLOWEST model instead:
+# - Each model gets an intra-op thread budget (total // models running) so
+#   five concurrent forward passes don't oversubscribe the cores
+# - The pool is separate from the inference executor: the orchestrating
+#   call already holds an executor worker, and fanning out onto the same
+#   pool could deadlock when it is small
+# - Sequential mode runs the same tasks in order on the calling thread
+#
+# Budgets are applied with torch.set_num_threads() inside the worker. With
+# OpenMP builds (the default CPU wheels) that setting is per thread.
+#
+# Configuration (env):
+# - NLP_FULL_ANALYSIS_MODE: sequential | parallel (default: sequential)
+# - NLP_FULL_ANALYSIS_THREADS: total intra-op threads shared by models
+#   (default: cpu count)
+# - NLP_INTRA_OP_THREADS_<MODEL>: fixed budget for one model,
+#   e.g. NLP_INTRA_OP_THREADS_NER_MODEL=4
+# ============================================================================
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Torch is optional here (thread budgets are skipped without it)
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+# Full analysis execution modes
+SEQUENTIAL = "sequential"
+PARALLEL = "parallel"
+FULL_ANALYSIS_MODES = (SEQUENTIAL, PARALLEL)
+
+# One worker per full-analysis model
+DEFAULT_GROUP_WORKERS = 5
+
+# (result, exception) per task - exactly one is set
+Outcome = Tuple[Any, Optional[BaseException]]
+
+
+def get_full_analysis_mode() -> str:
+    """Get full analysis execution mode (NLP_FULL_ANALYSIS_MODE)."""
+    mode = os.getenv("NLP_FULL_ANALYSIS_MODE", SEQUENTIAL).lower()
+    if mode not in FULL_ANALYSIS_MODES:
+        logger.warning(f"Unknown NLP_FULL_ANALYSIS_MODE '{mode}', using '{SEQUENTIAL}'")
+        return SEQUENTIAL
+    return mode
+
+
+def thread_budgets(keys: list[str], total_threads: Optional[int] = None) -> Dict[str, int]:
+    """
+    Split intra-op threads between concurrently running models.
+
+    Models with NLP_INTRA_OP_THREADS_<KEY> set get that budget; the rest
+    share what is left of the total evenly. Always at least 1 each.
+    """
+    total = total_threads or int(
+        os.getenv("NLP_FULL_ANALYSIS_THREADS", os.cpu_count() or 1)
+    )
+
+    budgets: Dict[str, int] = {}
+    for key in keys:
+        configured = os.getenv(f"NLP_INTRA_OP_THREADS_{key.upper()}")
+        if configured:
+            budgets[key] = max(1, int(configured))
+
+    remaining = [key for key in keys if key not in budgets]
+    if remaining:
+        share = max(1, (total - sum(budgets.values())) // len(remaining))
+        for key in remaining:
+            budgets[key] = share
+
+    return budgets
+
+
+def _with_thread_budget(fn: Callable[[], Any], threads: Optional[int]) -> Callable[[], Any]:
+    """Wrap a task to run with `threads` intra-op threads on its worker."""
+
+    def wrapper() -> Any:
+        if not TORCH_AVAILABLE or not threads:
+            return fn()
+        previous = torch.get_num_threads()
+        torch.set_num_threads(threads)
+        try:
+            return fn()
+        finally:
+            torch.set_num_threads(previous)
+
+    return wrapper
+
+
+class ModelGroupRunner:
+    """
+    Runs a set of independent model tasks, sequentially or in parallel.
+
+    Usage:
+        outcomes = runner.run({
+            "finance": lambda: analyze_finance_sentiment(...),
+            "ner": lambda: analyze_entities(...),
+        })
+        result, error = outcomes["ner"]
+
+    Failures are isolated: one task raising doesn't affect the others.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        total_threads: Optional[int] = None,
+    ):
+        self._mode = mode or get_full_analysis_mode()
+        self._max_workers = max_workers or DEFAULT_GROUP_WORKERS
+        self._total_threads = total_threads
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._stats = {
+            "runs": 0,
+            "tasks": 0,
+            "failed_tasks": 0,
+            "total_wall_ms": 0.0,
+            "total_task_ms": 0.0,
+        }
+
+        if self._mode == PARALLEL:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="model-group",
+            )
+            logger.info(f"Full analysis: parallel model groups ({self._max_workers} workers)")
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def _timed(self, fn: Callable[[], Any]) -> Callable[[], Tuple[Outcome, float]]:
+        """Wrap a task to capture its outcome and duration."""
+
+        def wrapper() -> Tuple[Outcome, float]:
+            start = time.perf_counter()
+            try:
+                outcome: Outcome = (fn(), None)
+            except Exception as e:
+                outcome = (None, e)
+            return outcome, (time.perf_counter() - start) * 1000
+
+        return wrapper
+
+    def run(self, tasks: Dict[str, Callable[[], Any]]) -> Dict[str, Outcome]:
+        """
+        Run all tasks and wait for them.
+
+        Returns:
+            Dict of task key -> (result, exception)
+        """
+        start = time.perf_counter()
+        timed: Dict[str, Tuple[Outcome, float]] = {}
+
+        if self._pool is None or len(tasks) <= 1:
+            for key, fn in tasks.items():
+                timed[key] = self._timed(fn)()
+        else:
+            budgets = thread_budgets(list(tasks), self._total_threads)
+            futures = {
+                key: self._pool.submit(self._timed(_with_thread_budget(fn, budgets[key])))
+                for key, fn in tasks.items()
+            }
+            timed = {key: future.result() for key, future in futures.items()}
+
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self._stats["runs"] += 1
+            self._stats["tasks"] += len(tasks)
+            self._stats["total_wall_ms"] += wall_ms
+            for (_, error), task_ms in timed.values():
+                self._stats["total_task_ms"] += task_ms
+                if error is not None:
+                    self._stats["failed_tasks"] += 1
+
+        return {key: outcome for key, (outcome, _) in timed.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get runner statistics (speedup = summed task time / wall time)."""
+        with self._lock:
+            runs = self._stats["runs"]
+            wall = self._stats["total_wall_ms"]
+            return {
+                "mode": self._mode,
+                "max_workers": self._max_workers if self._pool else 1,
+                "runs": runs,
+                "tasks": self._stats["tasks"],
+                "failed_tasks": self._stats["failed_tasks"],
+                "avg_wall_ms": round(wall / runs, 2) if runs else 0.0,
+                "avg_task_sum_ms": round(self._stats["total_task_ms"] / runs, 2) if runs else 0.0,
+                "speedup": round(self._stats["total_task_ms"] / wall, 2) if wall else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker pool (if any)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+# Singleton instance
+_runner: Optional[ModelGroupRunner] = None
+
+
+def get_group_runner() -> ModelGroupRunner:
+    """Get or create singleton model group runner."""
+    global _runner
+    if _runner is None:
+        _runner = ModelGroupRunner()
+    return _runner
+
+
+def shutdown_group_runner(wait: bool = True) -> None:
+    """Shut down the singleton runner (if created)."""
+    global _runner
+    if _runner is not None:
+        _runner.shutdown(wait=wait)
+        _runner = None
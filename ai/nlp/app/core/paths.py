@@ -0,0 +1,28 @@
+# ============================================================================
+# DATA PATHS
+# Where the service keeps its persistent files
+# ============================================================================
+#
+# The disk cache, the jobs database and ONNX exports default to paths
+# under one data directory. It is absolute (not relative to the working
+# directory), so running the service or tests from a source checkout never
+# writes databases into the tree.
+#
+# Configuration (env):
+# - NLP_DATA_DIR: directory for service data (default: ~/.cache/nlp)
+# ============================================================================
+
+import os
+
+# Defaults
+DEFAULT_DATA_DIR = os.path.join("~", ".cache", "nlp")
+
+
+def get_data_dir() -> str:
+    """Get the absolute service data directory (NLP_DATA_DIR)."""
+    return os.path.abspath(os.path.expanduser(os.getenv("NLP_DATA_DIR") or DEFAULT_DATA_DIR))
+
+
+def data_path(filename: str) -> str:
+    """Absolute path of a file in the data directory."""
+    return os.path.join(get_data_dir(), filename)
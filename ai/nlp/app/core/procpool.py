@@ -0,0 +1,532 @@
+# ============================================================================
+# PROCESS-POOL INFERENCE
+# Model registry in separate worker processes, reached over local IPC
+# ============================================================================
+#
+# In thread mode, HTTP handling and inference share one process and one
+# GIL: request parsing, pydantic validation and SSE formatting contend
+# with the Python parts of every forward pass (tokenization, pipeline
+# pre/post-processing).
+#
+# In process mode the FastAPI app is a thin router:
+# - N inference processes each own a ModelRegistry
+# - The app's registry slots hold RemotePipeline proxies with the same
+#   call semantics as a pipeline, so services, micro-batchers and the
+#   inference executor are unchanged (executor threads block on IPC with
+#   the GIL released)
+# - Tasks go over one shared queue; whichever process is free takes it
+# - Inputs and outputs travel through pre-allocated shared-memory slots
+#   owned by the app process: a payload is pickled straight into a slot
+#   and the worker writes its result back into the same slot. Only small
+#   control tuples go through the queue. Tiny payloads (and payloads that
+#   don't fit a slot) are sent inline instead
+# - Each worker records the call it is running in a shared array, so if
+#   it dies only that call fails (and its slot is freed); queued calls go
+#   to the surviving processes.
+#   A call that outlives NLP_PROCESS_CALL_TIMEOUT fails, but keeps its
+#   slot until the result arrives or its process is gone
+#
+# Configuration (env):
+# - NLP_INFERENCE_MODE: thread | process (default: thread)
+# - NLP_INFERENCE_PROCESSES: inference processes (default: 1); each
+#   holds a full copy of the models
+# - NLP_PROCESS_START_METHOD: spawn | forkserver | fork (default: spawn)
+# - NLP_SHM_SLOTS: shared-memory slots, i.e. max in-flight calls
+#   (default: 4 per process)
+# - NLP_SHM_SLOT_BYTES: slot capacity (default: 8 MB)
+# - NLP_SHM_MIN_BYTES: payloads up to this size go inline (default: 1024)
+# - NLP_PROCESS_CALL_TIMEOUT: seconds to wait for one call (default: 300)
+# ============================================================================
+
+import importlib
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import pickle
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Inference modes
+THREAD_MODE = "thread"
+PROCESS_MODE = "process"
+INFERENCE_MODES = (THREAD_MODE, PROCESS_MODE)
+
+# Defaults
+DEFAULT_REGISTRY_FACTORY = "app.models:load_all_models"
+DEFAULT_SLOTS_PER_PROCESS = 4
+DEFAULT_SLOT_BYTES = 8 * 1024 * 1024
+DEFAULT_MIN_SHM_BYTES = 1024
+READY_TIMEOUT_SECONDS = 1800
+DEFAULT_CALL_TIMEOUT_SECONDS = 300.0
+
+# Seconds between liveness checks of the inference processes
+WORKER_CHECK_SECONDS = 1.0
+
+# Control message tags (worker -> app)
+_READY = "__ready__"
+_RESULT = "__result__"
+
+# Running-call entry of an idle worker
+_IDLE = -1
+
+
+def get_inference_mode() -> str:
+    """Get inference mode (NLP_INFERENCE_MODE)."""
+    mode = os.getenv("NLP_INFERENCE_MODE", THREAD_MODE).lower()
+    if mode not in INFERENCE_MODES:
+        logger.warning(f"Unknown NLP_INFERENCE_MODE '{mode}', using '{THREAD_MODE}'")
+        return THREAD_MODE
+    return mode
+
+
+def _resolve(path: str) -> Any:
+    """Import 'module:attribute'."""
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# =============================================================================
+# Worker Process
+# =============================================================================
+
+def _report_models(registry: Any) -> Dict[str, dict]:
+    """Load state per model key, as reported to the app process."""
+    load_states = getattr(registry, "load_states", None)
+    if load_states:
+        return {key: state.to_dict() for key, state in load_states.items()}
+    return {
+        key: {"key": key, "name": key, "state": "loaded", "load_ms": None, "error": None}
+        for key, value in vars(registry).items()
+        if not key.startswith("_") and callable(value)
+    }
+
+
+def _worker_main(
+    worker_id: int,
+    tasks: "mp.Queue",
+    results: "mp.Queue",
+    running: Any,
+    registry_factory: str,
+    factory_kwargs: Dict[str, Any],
+    intra_op_threads: Optional[int],
+) -> None:
+    """
+    Inference process: load the registry, then serve tasks until None.
+
+    running[worker_id] holds the request id being served (written before
+    the call, so the app knows which call a crashed process took).
+    """
+    if intra_op_threads:
+        os.environ.setdefault("NLP_INTRA_OP_THREADS", str(intra_op_threads))
+        try:
+            import torch
+            torch.set_num_threads(intra_op_threads)
+        except ImportError:
+            pass
+
+    # The app process caches model outputs; caching here too would only
+    # duplicate entries
+    os.environ["NLP_MODEL_CACHE"] = "false"
+
+    registry = _resolve(registry_factory)(**factory_kwargs)
+    results.put((_READY, worker_id, os.getpid(), _report_models(registry)))
+
+    slots: Dict[str, shared_memory.SharedMemory] = {}
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        request_id, model_key, slot_name, nbytes, inline = task
+        running[worker_id] = request_id
+        try:
+            if slot_name is not None:
+                slot = slots.get(slot_name)
+                if slot is None:
+                    slot = slots[slot_name] = shared_memory.SharedMemory(name=slot_name)
+                inputs, kwargs = pickle.loads(slot.buf[:nbytes])
+            else:
+                inputs, kwargs = pickle.loads(inline)
+
+            pipe = getattr(registry, model_key, None)
+            if pipe is None:
+                raise RuntimeError(f"{model_key} is not loaded in inference process {worker_id}")
+
+            payload = pickle.dumps((True, pipe(inputs, **kwargs)), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            payload = pickle.dumps((False, f"{type(e).__name__}: {e}"))
+
+        # Write back into the request's slot when it fits
+        if slot_name is not None and len(payload) <= slots[slot_name].size:
+            slots[slot_name].buf[:len(payload)] = payload
+            results.put((_RESULT, request_id, len(payload), None))
+        else:
+            results.put((_RESULT, request_id, len(payload), payload))
+        running[worker_id] = _IDLE
+
+    for slot in slots.values():
+        slot.close()
+
+
+# =============================================================================
+# App-side Pool
+# =============================================================================
+
+class InferenceProcessPool:
+    """
+    Pool of inference processes with shared-memory payload slots.
+
+    Usage:
+        pool = InferenceProcessPool(processes=2)
+        models = pool.start()                   # blocks until loaded
+        result = pool.call("finbert", ["text"], batch_size=1)
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        registry_factory: str = DEFAULT_REGISTRY_FACTORY,
+        factory_kwargs: Optional[Dict[str, Any]] = None,
+        slots: Optional[int] = None,
+        slot_bytes: Optional[int] = None,
+        min_shm_bytes: Optional[int] = None,
+        start_method: Optional[str] = None,
+        call_timeout: Optional[float] = None,
+    ):
+        self._processes = processes or int(os.getenv("NLP_INFERENCE_PROCESSES", "1"))
+        self._registry_factory = registry_factory
+        self._factory_kwargs = factory_kwargs or {}
+        self._n_slots = slots or int(
+            os.getenv("NLP_SHM_SLOTS", DEFAULT_SLOTS_PER_PROCESS * self._processes)
+        )
+        self._slot_bytes = slot_bytes or int(os.getenv("NLP_SHM_SLOT_BYTES", DEFAULT_SLOT_BYTES))
+        self._min_shm_bytes = (
+            min_shm_bytes if min_shm_bytes is not None
+            else int(os.getenv("NLP_SHM_MIN_BYTES", DEFAULT_MIN_SHM_BYTES))
+        )
+        self._call_timeout = call_timeout or float(
+            os.getenv("NLP_PROCESS_CALL_TIMEOUT", DEFAULT_CALL_TIMEOUT_SECONDS)
+        )
+        self._ctx = mp.get_context(start_method or os.getenv("NLP_PROCESS_START_METHOD", "spawn"))
+
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._workers: Dict[int, Any] = {}
+        self._slots: Dict[str, shared_memory.SharedMemory] = {}
+        self._free_slots: "queue.Queue[str]" = queue.Queue()
+
+        self._pending: Dict[int, Tuple[Future, Optional[str], float]] = {}
+        # Request id each process is serving (_IDLE when none)
+        self._running = self._ctx.Array("q", [_IDLE] * self._processes, lock=False)
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._ready_count = 0
+        self._models: Dict[str, dict] = {}
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Statistics
+        self._stats = {
+            "requests": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "lost_to_exit": 0,
+            "shm_payloads": 0,
+            "inline_payloads": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "total_roundtrip_ms": 0.0,
+        }
+
+    @property
+    def models(self) -> Dict[str, dict]:
+        """Model load states reported by the first ready process."""
+        return self._models
+
+    def start(self, timeout: float = READY_TIMEOUT_SECONDS) -> Dict[str, dict]:
+        """
+        Allocate payload slots, start the processes and wait until every
+        process has loaded its registry.
+
+        Returns:
+            Load state per model key
+
+        Raises:
+            RuntimeError: An inference process exited while loading
+            TimeoutError: Not every process was ready within `timeout`
+        """
+        # One tracker shared with children, so slot registrations balance
+        resource_tracker.ensure_running()
+        for _ in range(self._n_slots):
+            slot = shared_memory.SharedMemory(create=True, size=self._slot_bytes)
+            self._slots[slot.name] = slot
+            self._free_slots.put(slot.name)
+
+        cores = os.cpu_count() or 1
+        intra_op = None if os.getenv("NLP_INTRA_OP_THREADS") else max(1, cores // self._processes)
+
+        for worker_id in range(self._processes):
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(
+                    worker_id, self._tasks, self._results, self._running,
+                    self._registry_factory, self._factory_kwargs, intra_op,
+                ),
+                name=f"inference-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            self._workers[worker_id] = process
+
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="inference-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+        deadline = time.monotonic() + timeout
+        while not self._ready.wait(WORKER_CHECK_SECONDS):
+            dead = [p for p in self._workers.values() if not p.is_alive()]
+            if dead:
+                self.shutdown()
+                raise RuntimeError(
+                    f"Inference process {dead[0].name} exited while loading (code {dead[0].exitcode})"
+                )
+            if time.monotonic() > deadline:
+                self.shutdown()
+                raise TimeoutError(f"Inference processes not ready after {timeout:.0f}s")
+
+        logger.info(
+            f"Inference process pool: {self._processes} processes, "
+            f"{self._n_slots} x {self._slot_bytes // 1024} KB shared-memory slots"
+        )
+        return self._models
+
+    def _dispatch(self) -> None:
+        """Resolve futures from worker results; fail them if a worker dies."""
+        checked_at = time.monotonic()
+        while not self._closed:
+            if time.monotonic() - checked_at >= WORKER_CHECK_SECONDS:
+                self._check_workers()
+                checked_at = time.monotonic()
+            try:
+                message = self._results.get(timeout=WORKER_CHECK_SECONDS)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            if message[0] == _READY:
+                _, worker_id, pid, models = message
+                logger.info(f"Inference process {worker_id} ready (pid {pid})")
+                with self._lock:
+                    self._ready_count += 1
+                    if not self._models:
+                        self._models = models
+                    if self._ready_count == self._processes:
+                        self._ready.set()
+                continue
+
+            _, request_id, nbytes, inline = message
+            with self._lock:
+                entry = self._pending.pop(request_id, None)
+            if entry is None:
+                continue
+            future, slot_name, submitted_at = entry
+
+            try:
+                if inline is None:
+                    ok, value = pickle.loads(self._slots[slot_name].buf[:nbytes])
+                    self._count("shm_payloads")
+                else:
+                    ok, value = pickle.loads(inline)
+                    self._count("inline_payloads")
+            except Exception as e:
+                ok, value = False, f"Failed to decode result: {e}"
+            finally:
+                if slot_name is not None:
+                    self._free_slots.put(slot_name)
+
+            with self._lock:
+                self._stats["bytes_out"] += nbytes
+                self._stats["total_roundtrip_ms"] += (time.perf_counter() - submitted_at) * 1000
+                if not ok:
+                    self._stats["failed"] += 1
+
+            if future.done():
+                continue  # Timed out in call()
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+
+    def _check_workers(self) -> None:
+        """
+        Fail the calls taken by an inference process that has died.
+
+        Their slots are freed: the process that could still write them is
+        gone. Calls no process has taken yet stay queued for the others,
+        unless none is left.
+        """
+        # start() reports processes that die while loading
+        if self._closed or not self._ready.is_set():
+            return
+        dead = {worker_id for worker_id, p in self._workers.items() if not p.is_alive()}
+        if not dead:
+            return
+
+        for worker_id in dead:
+            process = self._workers.pop(worker_id)
+            logger.error(f"Inference process {process.name} exited (code {process.exitcode})")
+
+        with self._lock:
+            if self._workers:
+                lost = [self._running[worker_id] for worker_id in dead]
+            else:
+                lost = list(self._pending)
+            entries = [self._pending.pop(rid) for rid in lost if rid in self._pending]
+            self._stats["lost_to_exit"] += len(entries)
+
+        for future, slot_name, _ in entries:
+            if slot_name is not None:
+                self._free_slots.put(slot_name)
+            if not future.done():
+                future.set_exception(RuntimeError("Inference process exited"))
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def call(self, model_key: str, inputs: Any, **kwargs: Any) -> Any:
+        """
+        Run `registry.<model_key>(inputs, **kwargs)` in an inference process (blocking).
+
+        Raises:
+            RuntimeError: The model raised, or its process exited
+            TimeoutError: No result within NLP_PROCESS_CALL_TIMEOUT seconds
+        """
+        if self._closed or not self._workers:
+            raise RuntimeError("Inference process pool is not running")
+
+        payload = pickle.dumps((inputs, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+        request_id = next(self._ids)
+        future: Future = Future()
+
+        slot_name = None
+        if self._min_shm_bytes < len(payload) <= self._slot_bytes:
+            slot_name = self._free_slots.get()
+            self._slots[slot_name].buf[:len(payload)] = payload
+
+        with self._lock:
+            self._pending[request_id] = (future, slot_name, time.perf_counter())
+            self._stats["requests"] += 1
+            self._stats["bytes_in"] += len(payload)
+
+        if slot_name is not None:
+            self._tasks.put((request_id, model_key, slot_name, len(payload), None))
+        else:
+            self._tasks.put((request_id, model_key, None, len(payload), payload))
+
+        try:
+            return future.result(self._call_timeout)
+        except FutureTimeoutError:
+            # The slot stays in use until the result arrives or the process
+            # holding the call exits (see _dispatch and _check_workers)
+            if not future.cancel():
+                return future.result()
+            self._count("timeouts")
+            raise TimeoutError(f"{model_key}: no result from the inference process after {self._call_timeout:.0f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            completed = self._stats["shm_payloads"] + self._stats["inline_payloads"]
+            return {
+                "processes": self._processes,
+                "alive": sum(1 for p in self._workers.values() if p.is_alive()),
+                "slots": self._n_slots,
+                "free_slots": self._free_slots.qsize(),
+                "slot_bytes": self._slot_bytes,
+                "in_flight": len(self._pending),
+                **{k: v for k, v in self._stats.items() if k != "total_roundtrip_ms"},
+                "avg_roundtrip_ms": (
+                    round(self._stats["total_roundtrip_ms"] / completed, 2) if completed else 0.0
+                ),
+            }
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop the processes and release the shared-memory slots."""
+        if self._closed:
+            return
+        self._closed = True
+
+        for _ in self._workers:
+            self._tasks.put(None)
+        for process in self._workers.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+        for slot in self._slots.values():
+            slot.close()
+            slot.unlink()
+        self._slots.clear()
+        logger.info("Inference process pool shut down")
+
+
+class RemotePipeline:
+    """
+    Pipeline proxy that runs a model in the inference process pool.
+
+    Call semantics match the wrapped pipeline (str -> list, list -> one
+    result per text), so it can be used anywhere a pipeline is. It has
+    no tokenizer or model attributes, so paths that need them (shared
+    encodings) use the plain pipeline call instead.
+    """
+
+    def __init__(self, pool: InferenceProcessPool, model_key: str):
+        self._pool = pool
+        self.model_key = model_key
+
+    def __call__(self, inputs: Any, **kwargs: Any) -> Any:
+        return self._pool.call(self.model_key, inputs, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"RemotePipeline({self.model_key!r})"
+
+
+# Singleton instance
+_pool: Optional[InferenceProcessPool] = None
+
+
+def get_process_pool() -> Optional[InferenceProcessPool]:
+    """Get the running process pool (None in thread mode)."""
+    return _pool
+
+
+def start_process_pool(**kwargs: Any) -> InferenceProcessPool:
+    """Create and start the singleton process pool (blocking until ready)."""
+    global _pool
+    if _pool is None:
+        pool = InferenceProcessPool(**kwargs)
+        pool.start()
+        _pool = pool
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the singleton pool (if started)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
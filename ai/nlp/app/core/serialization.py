@@ -0,0 +1,90 @@
+# ============================================================================
+# JSON SERIALIZATION
+# Fast JSON encoding for SSE events and large batch responses
+# ============================================================================
+#
+# Every SSE event, WebSocket message and NDJSON line is one JSON encode on
+# the event loop, and batch responses encode thousands of nested results
+# at once. The stdlib encoder is several times slower than orjson on these
+# payloads, so dumps() uses orjson when it is installed (optional) and
+# falls back to json otherwise. Output is compact UTF-8 either way.
+#
+# Pydantic models are encoded with model_dump_json (pydantic-core, no
+# intermediate dicts); see dumps_model.
+#
+# Values JSON has no type for: numpy scalars/arrays are encoded natively
+# by orjson or via .item(), pydantic models via model_dump(), anything
+# else via str(). Payloads orjson rejects (e.g. integers beyond 64 bits)
+# are retried with json.
+#
+# Configuration (env):
+# - NLP_FAST_JSON: use orjson when installed (default: true)
+# ============================================================================
+
+import json
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# orjson backend name / stdlib backend name
+ORJSON_BACKEND = "orjson"
+JSON_BACKEND = "json"
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+)
+
+
+def is_fast_json_enabled() -> bool:
+    """Whether orjson is used (installed and NLP_FAST_JSON on)."""
+    return ORJSON_AVAILABLE and os.getenv("NLP_FAST_JSON", "true").lower() in ("1", "true", "yes", "on")
+
+
+# Resolved once: dumps() runs per event
+_use_orjson = is_fast_json_enabled()
+
+
+def get_json_backend() -> str:
+    """Backend dumps() uses: orjson or json."""
+    return ORJSON_BACKEND if _use_orjson else JSON_BACKEND
+
+
+def _to_builtin(value: Any) -> Any:
+    """Fallback for values JSON has no type for."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode value as compact UTF-8 JSON."""
+    if _use_orjson:
+        try:
+            return orjson.dumps(value, default=_to_builtin, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(
+        value, default=_to_builtin, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps_str(value: Any) -> str:
+    """dumps() as text (SSE frames, WebSocket text messages)."""
+    return dumps(value).decode("utf-8")
+
+
+def dumps_model(model: Any) -> bytes:
+    """Encode a pydantic model without building intermediate dicts."""
+    return model.model_dump_json().encode("utf-8")
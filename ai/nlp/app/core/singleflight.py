@@ -0,0 +1,222 @@
+# ============================================================================
+# SINGLE-FLIGHT INFERENCE
+# Concurrent cache misses for the same input wait on one computation
+# ============================================================================
+#
+# When a headline goes viral, many concurrent /analyze and /batch-analyze
+# requests miss the cache for the same text before any of them has stored
+# a result, and every one of them runs the models. Single-flight makes the
+# first request the leader for each (model, text hash) key; concurrent
+# requests for a key that is already in flight follow it and wait for the
+# leader's output instead of running inference.
+#
+# Protocol (one Flight per call or request):
+# 1. begin(keys): keys not in flight are led by this caller, the rest are
+#    followed (a future per key)
+# 2. The leader runs inference, stores outputs in the cache, then
+#    resolve()s them; closing the flight fails any key left unresolved
+# 3. Followers wait() only after closing their own flight, so a leader
+#    never waits on anyone and two requests cannot deadlock. A key whose
+#    leader failed or timed out is computed by the follower itself
+#
+# Keys are output-cache keys (model id + SHA-256 of the model input, see
+# app.core.model_cache).
+#
+# Configuration (env):
+# - NLP_SINGLE_FLIGHT: coalesce concurrent misses (default: true)
+# - NLP_SINGLE_FLIGHT_TIMEOUT: max seconds a follower waits (default: 30)
+# ============================================================================
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+# Defaults
+DEFAULT_WAIT_TIMEOUT_SECONDS = 30.0
+
+
+def is_single_flight_enabled() -> bool:
+    """Whether concurrent misses are coalesced (NLP_SINGLE_FLIGHT)."""
+    return os.getenv("NLP_SINGLE_FLIGHT", "true").lower() in ("1", "true", "yes", "on")
+
+
+class LeaderFailed(RuntimeError):
+    """The leading request ended without producing an output for a key."""
+
+
+class Flight:
+    """
+    One caller's share of in-flight keys.
+
+    Attributes:
+        leading: Keys this caller must compute and resolve()
+        following: Keys another caller is computing (key -> future)
+    """
+
+    def __init__(
+        self,
+        group: "SingleFlight",
+        leading: Set[str],
+        following: Dict[str, Future],
+        owned: Dict[str, Future],
+    ):
+        self._group = group
+        self.leading = leading
+        self.following = following
+        self._owned = owned
+
+    def resolve(self, values: Dict[str, Any]) -> None:
+        """Publish computed outputs for led keys to their followers."""
+        for key, value in values.items():
+            future = self._owned.pop(key, None)
+            if future is not None:
+                self._group._finish(key, future)
+                future.set_result(value)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """Fail every led key not resolved (followers compute it themselves)."""
+        owned, self._owned = self._owned, {}
+        for key, future in owned.items():
+            self._group._finish(key, future)
+            future.set_exception(error or LeaderFailed(key))
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for followed keys. Call after close().
+
+        Returns:
+            Dict of key -> output for followed keys whose leader succeeded;
+            failed or timed-out keys are omitted
+        """
+        return self._group._wait(self.following, timeout)
+
+    def __enter__(self) -> "Flight":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(exc)
+
+
+class SingleFlight:
+    """
+    Registry of in-flight keys shared by every request in the process.
+
+    Thread-safe: inference runs on executor threads.
+
+    Args:
+        enabled: Coalesce concurrent misses (default: NLP_SINGLE_FLIGHT)
+        timeout: Max seconds a follower waits (default: NLP_SINGLE_FLIGHT_TIMEOUT)
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, timeout: Optional[float] = None):
+        self._enabled = is_single_flight_enabled() if enabled is None else enabled
+        self._timeout = timeout if timeout is not None else float(
+            os.getenv("NLP_SINGLE_FLIGHT_TIMEOUT", DEFAULT_WAIT_TIMEOUT_SECONDS)
+        )
+
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._stats = {
+            "led": 0,
+            "coalesced": 0,
+            "coalesced_requests": 0,
+            "leader_failures": 0,
+            "timeouts": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def begin(self, keys: Iterable[str]) -> Flight:
+        """Lead keys nobody is computing; follow the rest."""
+        leading: Set[str] = set()
+        following: Dict[str, Future] = {}
+        owned: Dict[str, Future] = {}
+
+        keys = list(dict.fromkeys(keys))
+        if not self._enabled:
+            return Flight(self, set(keys), following, owned)
+
+        with self._lock:
+            for key in keys:
+                future = self._in_flight.get(key)
+                if future is not None:
+                    following[key] = future
+                else:
+                    future = Future()
+                    self._in_flight[key] = future
+                    owned[key] = future
+                    leading.add(key)
+
+            self._stats["led"] += len(leading)
+            self._stats["coalesced"] += len(following)
+            if following:
+                self._stats["coalesced_requests"] += 1
+
+        return Flight(self, leading, following, owned)
+
+    def _finish(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def _wait(self, following: Dict[str, Future], timeout: Optional[float]) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        if not following:
+            return values
+
+        deadline = time.monotonic() + (self._timeout if timeout is None else timeout)
+        failures = timeouts = 0
+        for key, future in following.items():
+            try:
+                value = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                timeouts += 1
+                continue
+            except Exception:
+                failures += 1
+                continue
+            if value is not None:
+                values[key] = value
+
+        if failures or timeouts:
+            logger.warning(
+                f"Single-flight: {failures} leader failures, {timeouts} timeouts; "
+                f"computing those outputs locally"
+            )
+            with self._lock:
+                self._stats["leader_failures"] += failures
+                self._stats["timeouts"] += timeouts
+        return values
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self._enabled,
+                "in_flight": len(self._in_flight),
+                **self._stats,
+            }
+
+
+# =============================================================================
+# SINGLETON
+# =============================================================================
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get or create singleton SingleFlight instance."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,193 @@
+# ============================================================================
+# SHARED TOKENIZATION
+# Tokenize once per text and share encodings across compatible models
+# ============================================================================
+#
+# Full analysis runs five pipelines over the same texts, and each pipeline
+# re-tokenizes its input. Models whose tokenizers are identical (same class,
+# vocabulary and normalization) produce identical input_ids, so the work
+# only needs to happen once.
+#
+# Tokenizers are keyed by a fingerprint (hash of class, casing and vocab).
+# A SharedEncodings instance lives for one request:
+# - encode(tokenizer) tokenizes all texts once per fingerprint (unpadded)
+# - batch(tokenizer, indices) pads a subset into tensors for a forward pass
+# - TokenizationProfile records time spent tokenizing vs in forward passes
+#
+# No torch import at module level: padding to tensors goes through the
+# tokenizer's own pad().
+# ============================================================================
+
+import hashlib
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+# Default sequence length cap (BERT-family position embeddings)
+DEFAULT_MAX_LENGTH = 512
+
+# Fingerprints are expensive (hashes the whole vocab) - compute once per tokenizer
+_fingerprints: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def tokenizer_fingerprint(tokenizer: Any) -> str:
+    """
+    Compute a stable identity for a tokenizer.
+
+    Two tokenizers with the same fingerprint produce the same input_ids
+    for the same text, so their encodings can be shared.
+
+    Hashes:
+    - Tokenizer class (BPE vs WordPiece etc.)
+    - Lower-casing behavior
+    - Full vocabulary (token -> id), in id order
+    """
+    try:
+        cached = _fingerprints.get(tokenizer)
+        if cached is not None:
+            return cached
+    except TypeError:
+        cached = None  # Not weak-referenceable; compute every time
+
+    digest = hashlib.sha256()
+    digest.update(type(tokenizer).__name__.encode("utf-8"))
+    digest.update(str(getattr(tokenizer, "do_lower_case", None)).encode("utf-8"))
+
+    vocab = tokenizer.get_vocab()
+    for token, token_id in sorted(vocab.items(), key=lambda item: item[1]):
+        digest.update(f"{token_id}:{token}\n".encode("utf-8"))
+
+    fingerprint = digest.hexdigest()[:16]
+
+    try:
+        _fingerprints[tokenizer] = fingerprint
+    except TypeError:
+        pass
+
+    return fingerprint
+
+
+@dataclass
+class TokenizationProfile:
+    """Per-request breakdown of tokenization vs forward-pass time."""
+    tokenize_ms: float = 0.0
+    forward_ms: Dict[str, float] = field(default_factory=dict)
+    tokenizer_runs: int = 0
+    shared_hits: int = 0
+    # Models may run concurrently (parallel full analysis)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add_tokenize(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.tokenize_ms += elapsed_ms
+
+    def add_forward(self, model: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.forward_ms[model] = self.forward_ms.get(model, 0.0) + elapsed_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "tokenize_ms": round(self.tokenize_ms, 2),
+            "forward_ms": {k: round(v, 2) for k, v in self.forward_ms.items()},
+            "tokenizer_runs": self.tokenizer_runs,
+            "shared_encoding_hits": self.shared_hits,
+        }
+
+
+class SharedEncodings:
+    """
+    Per-request encoding store, keyed by tokenizer fingerprint.
+
+    Texts are tokenized once per distinct tokenizer (unpadded, truncated
+    to max_length). Forward passes request padded batches of any subset
+    of texts via batch().
+    """
+
+    def __init__(
+        self,
+        texts: Sequence[str],
+        profile: Optional[TokenizationProfile] = None,
+        max_length: int = DEFAULT_MAX_LENGTH,
+    ):
+        self._texts = list(texts)
+        self._max_length = max_length
+        self._encodings: Dict[str, Dict[str, List[List[int]]]] = {}
+        self.profile = profile or TokenizationProfile()
+
+    def encode(self, tokenizer: Any) -> Dict[str, List[List[int]]]:
+        """
+        Get unpadded encodings of all texts for this tokenizer.
+
+        Returns dict with 'input_ids' and 'attention_mask' (one list per text).
+        """
+        fingerprint = tokenizer_fingerprint(tokenizer)
+        encoded = self._encodings.get(fingerprint)
+
+        if encoded is not None:
+            self.profile.shared_hits += 1
+            return encoded
+
+        start = time.perf_counter()
+        output = tokenizer(
+            self._texts,
+            truncation=True,
+            max_length=self._max_length,
+        )
+        encoded = {
+            "input_ids": list(output["input_ids"]),
+            "attention_mask": list(output["attention_mask"]),
+        }
+        self.profile.add_tokenize((time.perf_counter() - start) * 1000)
+        self.profile.tokenizer_runs += 1
+
+        self._encodings[fingerprint] = encoded
+        return encoded
+
+    def lengths(self, tokenizer: Any) -> List[int]:
+        """Token count per text for this tokenizer."""
+        return [len(ids) for ids in self.encode(tokenizer)["input_ids"]]
+
+    def batch(
+        self,
+        tokenizer: Any,
+        indices: Sequence[int],
+        max_length: Optional[int] = None,
+    ) -> Any:
+        """
+        Pad the encodings of `indices` into a tensor batch.
+
+        Models sharing a vocabulary may have different sequence limits;
+        with `max_length`, rows are cut to that many tokens, keeping the
+        closing special token.
+
+        Returns the tokenizer's BatchEncoding (PyTorch tensors), padded to
+        the longest row in this batch only.
+        """
+        encoded = self.encode(tokenizer)
+        input_ids = [encoded["input_ids"][i] for i in indices]
+        attention_mask = [encoded["attention_mask"][i] for i in indices]
+
+        if max_length is not None and max_length < self._max_length:
+            input_ids = [
+                ids if len(ids) <= max_length else ids[:max_length - 1] + ids[-1:]
+                for ids in input_ids
+            ]
+            attention_mask = [mask[:len(ids)] for mask, ids in zip(attention_mask, input_ids)]
+
+        start = time.perf_counter()
+        padded = tokenizer.pad(
+            {
+                "input_ids": input_ids,
+                "attention_mask": attention_mask,
+            },
+            padding=True,
+            return_tensors="pt",
+        )
+        self.profile.add_tokenize((time.perf_counter() - start) * 1000)
+        return padded
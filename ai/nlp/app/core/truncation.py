@@ -0,0 +1,181 @@
+# ============================================================================
+# TOKEN-ACCURATE TRUNCATION & LONG-TEXT WINDOWS
+# Per-model sequence limits on token IDs instead of characters
+# ============================================================================
+#
+# Character-based truncation (512 * 4 chars) both overflows the 512-token
+# limit for ticker/emoji-heavy text and pads far beyond what short text
+# needs. Limits are now applied on token IDs, per model:
+# - Truncate mode: pipelines truncate at the model's max_length
+# - Chunk mode: long texts are split into overlapping token windows,
+#   each window is classified and scores are aggregated (weighted by
+#   window token count), so long news isn't silently dropped
+#
+# Window boundaries come from the fast tokenizer's offset mapping, so
+# each window is an exact substring of the original text. In chunk mode
+# the coarse character cap (app.utils.truncate_text) is skipped, so the
+# windows cover the whole text.
+#
+# Configuration (env):
+# - NLP_LONG_TEXT_MODE: truncate or chunk (default: truncate)
+# ============================================================================
+
+import logging
+import os
+from typing import Any, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Long-text handling modes
+TRUNCATE = "truncate"
+CHUNK = "chunk"
+LONG_TEXT_MODES = (TRUNCATE, CHUNK)
+
+
+def get_long_text_mode() -> str:
+    """
+    Get long-text handling mode (NLP_LONG_TEXT_MODE).
+
+    - truncate: keep the first max_length tokens (default)
+    - chunk: sliding windows over the whole text, scores aggregated
+    """
+    mode = os.getenv("NLP_LONG_TEXT_MODE", TRUNCATE).lower()
+    if mode not in LONG_TEXT_MODES:
+        logger.warning(f"Unknown NLP_LONG_TEXT_MODE '{mode}', using '{TRUNCATE}'")
+        return TRUNCATE
+    return mode
+
+
+def split_windows(
+    text: str,
+    tokenizer: Any,
+    max_length: int,
+    stride: int = 0,
+) -> List[Tuple[int, int, int]]:
+    """
+    Split text into overlapping windows that each fit in max_length tokens.
+
+    Args:
+        text: Input text
+        tokenizer: Fast HuggingFace tokenizer (offset mapping required)
+        max_length: Model sequence limit, including special tokens
+        stride: Tokens of overlap between consecutive windows
+
+    Returns:
+        List of (start_char, end_char, token_count) per window. Texts that
+        fit (or tokenizers without offset support) yield a single window
+        covering the whole text.
+    """
+    try:
+        encoded = tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+        )
+        offsets = encoded["offset_mapping"]
+    except (NotImplementedError, KeyError) as e:
+        logger.debug(f"Offset mapping unavailable, using single window: {e}")
+        return [(0, len(text), max_length)]
+
+    body = max(1, max_length - tokenizer.num_special_tokens_to_add(pair=False))
+    if len(offsets) <= body:
+        return [(0, len(text), len(offsets))]
+
+    step = max(1, body - stride)
+    windows = []
+    for start in range(0, len(offsets), step):
+        end = min(start + body, len(offsets))
+        windows.append((offsets[start][0], offsets[end - 1][1], end - start))
+        if end == len(offsets):
+            break
+
+    return windows
+
+
+def aggregate_window_scores(
+    window_scores: Sequence[List[Dict[str, Any]]],
+    weights: Sequence[int],
+    all_scores: bool = False,
+) -> Any:
+    """
+    Combine per-window label distributions into one prediction.
+
+    Each label's score is the token-weighted mean across windows.
+
+    Args:
+        window_scores: Per window, a list of {"label", "score"} for every label
+        weights: Token count per window
+        all_scores: Return every label sorted by score instead of the top one
+
+    Returns:
+        {"label", "score"} for the top label, or a sorted list of them
+    """
+    totals: Dict[str, float] = {}
+    total_weight = sum(weights) or 1
+
+    for scores, weight in zip(window_scores, weights):
+        # Handle nested list structure from pipeline
+        if scores and isinstance(scores[0], list):
+            scores = scores[0]
+        for entry in scores:
+            totals[entry["label"]] = totals.get(entry["label"], 0.0) + entry["score"] * weight
+
+    aggregated = [
+        {"label": label, "score": total / total_weight}
+        for label, total in totals.items()
+    ]
+    aggregated.sort(key=lambda r: r["score"], reverse=True)
+
+    if all_scores:
+        return aggregated
+    return aggregated[0] if aggregated else {"label": "neutral", "score": 0.0}
+
+
+class ChunkedClassifier:
+    """
+    Sliding-window wrapper around a text-classification pipeline.
+
+    Call semantics match the wrapped pipeline (str -> list with one result,
+    list -> one result per text), so it can be used anywhere a pipeline is.
+    Windows from all texts in a call are classified in one pipeline call.
+    """
+
+    def __init__(
+        self,
+        pipe: Any,
+        max_length: int,
+        stride: int | None = None,
+        all_scores: bool = False,
+    ):
+        self._pipe = pipe
+        self.tokenizer = pipe.tokenizer
+        self._max_length = max_length
+        self._stride = stride if stride is not None else max_length // 4
+        self._all_scores = all_scores
+
+    def __call__(self, inputs: str | List[str], **kwargs: Any) -> List[Any]:
+        single = isinstance(inputs, str)
+        texts = [inputs] if single else list(inputs)
+
+        spans = [
+            split_windows(text, self.tokenizer, self._max_length, self._stride)
+            for text in texts
+        ]
+        flat = [text[start:end] for text, text_spans in zip(texts, spans) for start, end, _ in text_spans]
+
+        # Full distributions are needed to aggregate across windows
+        raw = self._pipe(flat, **{**kwargs, "top_k": None})
+
+        results = []
+        position = 0
+        for text_spans in spans:
+            window_scores = raw[position:position + len(text_spans)]
+            position += len(text_spans)
+            results.append(aggregate_window_scores(
+                window_scores,
+                [count for _, _, count in text_spans],
+                self._all_scores,
+            ))
+
+        return results[:1] if single else results
@@ -23,7 +23,7 @@ Modules:
     - layer: Main orchestrator (AI Brain)
 """
 
-from .layer import run_ai_layer, AILayer
+from .layer import run_ai_layer, run_ai_layer_batch, AILayer
 from .schemas import (
     FusedSentiment,
     ConfidenceScore,
@@ -37,6 +37,7 @@ from .schemas import (
 __all__ = [
     # Main orchestrator
     "run_ai_layer",
+    "run_ai_layer_batch",
     "AILayer",
     # Data contracts
     "FusedSentiment",
@@ -8,24 +8,40 @@ This is the main entry point for the NLP analysis API. It provides endpoints for
 - Named entity recognition
 - Combined full analysis
 
-All models are loaded once at startup and stored in app.state for efficient reuse.
+All models are loaded once (concurrently in the background at startup, or lazily on
+first use) and stored in app.state for efficient reuse. GET /ready reports when the
+required models are up.
 
 Startup Command:
     uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 1
 
-Note: Use workers=1 to ensure models are loaded only once in memory.
-For production with multiple workers, consider using gunicorn with preload.
+Note: uvicorn --workers loads a full copy of the models per worker.
+For multiple workers, use the gunicorn pre-fork config, which loads the
+models once in the master and shares them with workers copy-on-write:
+    gunicorn -c gunicorn.conf.py app.main:app
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
-
-from app.models import load_all_models, ModelRegistry
+from starlette.background import BackgroundTask
+
+from app.models import (
+    LAZY_LOADING,
+    MODEL_SPECS,
+    ModelRegistry,
+    create_registry,
+    get_preloaded_registry,
+    get_ready_models,
+    install_lazy_pipelines,
+    load_models,
+    load_remote_models,
+)
 from app.schemas import (
     TextRequest,
     FinanceSentimentResponse,
@@ -35,6 +51,8 @@ from app.schemas import (
     FullAnalysisResponse,
     HealthResponse,
     ModelStatus,
+    ModelLoadStatus,
+    ReadinessResponse,
     BatchTextRequest,
     BatchFinanceSentimentResponse,
     BatchSocialSentimentResponse,
@@ -55,19 +73,47 @@ from app.services import (
     analyze_finance_sentiment,
     analyze_social_sentiment,
     analyze_emotion,
-    analyze_entities,
     analyze_full,
+    analyze_finance_sentiment_batched,
+    analyze_social_sentiment_batched,
+    analyze_emotion_batched,
+    analyze_entities_batched,
     batch_finance_sentiment,
     batch_social_sentiment,
     batch_emotion,
     batch_entities,
     batch_full_analysis,
+    token_lengths,
 )
+from app.responses import FastJSONResponse
 from app.streaming import (
+    AnalysisChannel,
+    get_streaming_stats,
     stream_single_analysis,
     stream_batch_analysis,
 )
 from app.intelligence import run_ai_layer, run_ai_layer_batch
+from app.core.cache import shutdown_cache
+from app.core.executor import BULK_LANE, get_executor, run_inference, shutdown_executor
+from app.core.backends import get_backend_info
+from app.core.parallel import get_group_runner, shutdown_group_runner
+from app.core.procpool import (
+    PROCESS_MODE,
+    get_inference_mode,
+    get_process_pool,
+    shutdown_process_pool,
+)
+from app.core.admission import (
+    BATCH_CLASS,
+    SINGLE_CLASS,
+    STREAM_CLASS,
+    AdmissionRejected,
+    AdmissionTicket,
+    get_admission_controller,
+    parse_deadline_ms,
+    release_after,
+)
+from app.core.singleflight import get_single_flight
 
 # LLM layer (optional - gracefully degrades if not configured)
 try:
@@ -88,11 +134,13 @@ except ImportError:
 
 # Batch analyze API (optional - gracefully degrades if not configured)
 try:
-    from app.api import batch_analyze_router
+    from app.api import batch_analyze_router, jobs_router, get_job_manager
     BATCH_API_AVAILABLE = True
 except ImportError:
     BATCH_API_AVAILABLE = False
     batch_analyze_router = None
+    jobs_router = None
+    get_job_manager = None
 
 # =============================================================================
 # Logging Configuration
@@ -116,9 +164,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Application lifespan manager for model loading and cleanup.
 
     On startup:
-    - Loads all HuggingFace models
+    - Creates the model registry and starts loading models in the
+      background (parallel by default), installs lazy loaders, or
+      starts the inference process pool (NLP_INFERENCE_MODE=process)
     - Stores pipelines in app.state.models
-    - Logs loading status
+    - The server accepts traffic immediately; /ready reports when the
+      required models are up
 
     On shutdown:
     - Cleans up resources (models are garbage collected)
@@ -127,22 +178,38 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("NLP Sentiment Analysis Service Starting...")
     logger.info("=" * 60)
 
-    # Load all models at startup
+    app.state.model_loader = None
     try:
-        app.state.models = load_all_models()
+        preloaded = get_preloaded_registry()
+        registry = preloaded if preloaded is not None else create_registry()
+        app.state.models = registry
+        if preloaded is not None:
+            # Forked from a gunicorn master that already loaded the models
+            logger.info("Using models preloaded in the master process")
+        elif get_inference_mode() == PROCESS_MODE:
+            # Models live in inference processes; this process only routes
+            app.state.model_loader = asyncio.create_task(asyncio.to_thread(load_remote_models, registry))
+        elif registry.loading_mode == LAZY_LOADING:
+            install_lazy_pipelines(registry)
+        else:
+            # Load off the event loop so /health and /ready answer meanwhile
+            app.state.model_loader = asyncio.create_task(asyncio.to_thread(load_models, registry))
         logger.info("Model registry initialized successfully")
     except Exception as e:
         logger.error(f"Critical error loading models: {e}")
         # Create empty registry - service will be degraded but running
         app.state.models = ModelRegistry()
 
+    # Create the inference executor up front so sizing is logged at startup
+    get_executor()
+    get_group_runner()
+
     # Log final startup status
     registry: ModelRegistry = app.state.models
-    loaded_count = len(registry.get_loaded_models())
     logger.info("=" * 60)
-    logger.info(f"Service Ready - {loaded_count}/5 models available")
+    logger.info(f"Service accepting traffic - model loading: {registry.loading_mode}")
     logger.info(f"Device: {registry.device}")
-    logger.info("Swagger docs available at /docs")
+    logger.info("Readiness at /ready, Swagger docs at /docs")
     logger.info("=" * 60)
 
     # Start summary scheduler if available
@@ -154,6 +221,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception as e:
             logger.error(f"Failed to start summary scheduler: {e}")
 
+    # Start batch job workers (resumes jobs interrupted by a restart)
+    if BATCH_API_AVAILABLE and get_job_manager:
+        try:
+            await get_job_manager().start(app.state.models)
+        except Exception as e:
+            logger.error(f"Failed to start job workers: {e}")
+
     yield  # Application runs here
 
     # Shutdown
@@ -168,6 +242,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception as e:
             logger.error(f"Error stopping summary scheduler: {e}")
 
+    # Stop batch job workers; unfinished jobs resume on the next start
+    if BATCH_API_AVAILABLE and get_job_manager:
+        try:
+            await get_job_manager().stop()
+        except Exception as e:
+            logger.error(f"Error stopping job workers: {e}")
+
+    # Stop inference workers
+    shutdown_group_runner()
+    shutdown_executor()
+    shutdown_process_pool()
+
+    # Flush write-behind cache entries so the next start is warm
+    shutdown_cache()
+
     logger.info("Cleanup complete")
 
 
@@ -216,6 +305,10 @@ if BATCH_API_AVAILABLE and batch_analyze_router:
     app.include_router(batch_analyze_router)
     logger.info("Batch analyze router registered at /batch-analyze")
 
+if BATCH_API_AVAILABLE and jobs_router:
+    app.include_router(jobs_router)
+    logger.info("Batch jobs router registered at /jobs")
+
 
 # =============================================================================
 # Helper Functions
@@ -226,6 +319,61 @@ def get_models(request: Request) -> ModelRegistry:
     return request.app.state.models
 
 
+def admission(endpoint_class: str, batch: bool = False):
+    """
+    Dependency that holds an admission slot while the endpoint runs.
+
+    Rejections (AdmissionRejected) become 429 responses. For batch
+    endpoints the cost is the number of texts in the body.
+    """
+    async def hold_slot(request: Request) -> AsyncGenerator[None, None]:
+        cost = 1
+        if batch:
+            try:
+                cost = max(1, len((await request.json()).get("texts") or []))
+            except Exception:
+                pass  # Body validation reports the error
+        async with get_admission_controller().admit(
+            endpoint_class, cost=cost, deadline_ms=parse_deadline_ms(request.headers)
+        ):
+            yield
+
+    return hold_slot
+
+
+async def run_batch_chunked(
+    fn: Callable[..., Any],
+    texts: list[str],
+    response_model: type,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run a /batch/* service function on the bulk lane, one task per
+    NLP_BULK_CHUNK_SIZE texts, and merge the chunk responses.
+
+    Higher-priority requests run between chunks instead of waiting for
+    the whole batch. Texts are sorted by token length before chunking,
+    so each chunk pads only to its own longest text; results are put
+    back in input order.
+    """
+    executor = get_executor()
+    lengths = await executor.run(token_lengths, texts, list(kwargs.values()), lane=BULK_LANE)
+    order = sorted(range(len(texts)), key=lambda i: lengths[i])
+
+    parts = await executor.run_chunked(fn, [texts[i] for i in order], lane=BULK_LANE, **kwargs)
+    results: list[Any] = [None] * len(texts)
+    for i, result in zip(order, (result for part in parts for result in part.results)):
+        results[i] = result
+    return response_model(results=results, count=len(results))
+
+
+async def admit_stream(request: Request, cost: int = 1) -> AdmissionTicket:
+    """Admission ticket for a streaming endpoint (held until the stream ends)."""
+    return await get_admission_controller().acquire(
+        STREAM_CLASS, cost=cost, deadline_ms=parse_deadline_ms(request.headers)
+    )
+
+
 # =============================================================================
 # Health Check Endpoint
 # =============================================================================
@@ -248,11 +396,8 @@ async def health_check(request: Request) -> HealthResponse:
     registry = get_models(request)
 
     models_status = [
-        ModelStatus(name="ProsusAI/finbert", loaded=registry.finbert is not None),
-        ModelStatus(name="yiyanghkust/finbert-tone", loaded=registry.finbert_tone is not None),
-        ModelStatus(name="cardiffnlp/twitter-roberta-base-sentiment-latest", loaded=registry.twitter_sentiment is not None),
-        ModelStatus(name="michellejieli/emotion_text_classifier", loaded=registry.emotion_classifier is not None),
-        ModelStatus(name="dslim/bert-base-NER", loaded=registry.ner_model is not None),
+        ModelStatus(name=model_name, loaded=registry.is_model_loaded(key))
+        for key, (_, model_name) in MODEL_SPECS.items()
     ]
 
     loaded_count = sum(1 for m in models_status if m.loaded)
@@ -275,6 +420,86 @@ async def health_check(request: Request) -> HealthResponse:
     )
 
 
+@app.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    tags=["Health"],
+    summary="Check whether the required models are ready for traffic",
+    responses={503: {"model": ReadinessResponse, "description": "Required models not ready"}},
+)
+async def readiness_check(request: Request, response: Response) -> ReadinessResponse:
+    """
+    Readiness endpoint for orchestrators (distinct from /health liveness).
+
+    Returns 200 once every required model (NLP_READY_MODELS, default all)
+    is loaded - or, in lazy mode, loadable - and 503 until then.
+
+    Returns:
+    - ready flag and loading mode
+    - Per-model load state (pending/loading/loaded/failed) and load duration
+    """
+    registry = get_models(request)
+    required = get_ready_models()
+    ready = registry.is_ready(required)
+
+    if not ready:
+        response.status_code = 503
+
+    states = registry.get_load_states()
+    return ReadinessResponse(
+        ready=ready,
+        loading_mode=registry.loading_mode,
+        required_models=required,
+        models=[ModelLoadStatus(**state.to_dict()) for state in states],
+        models_loaded=sum(1 for state in states if registry.is_model_loaded(state.key)),
+        total_models=len(states),
+    )
+
+
+@app.get(
+    "/metrics/inference",
+    tags=["Health"],
+    summary="Inference executor queue and latency metrics",
+)
+async def inference_metrics(request: Request):
+    """
+    Inference executor and micro-batching metrics.
+
+    **Returns:**
+    - executor: worker/intra-op thread configuration, current queue depth,
+      in-flight task count, average/max queue wait and average run time (ms),
+      and per priority lane (interactive, streaming, bulk) queued tasks and
+      p50/p99 latency and queue wait
+    - microbatch: per-model coalesced batch counts and average batch size
+    - model_groups: full analysis mode, average wall time vs summed model
+      time per run, and the resulting parallel speedup
+    - backends: per model requested/actual backend (torch, onnx,
+      onnx-int8), load time and drift vs PyTorch when checked
+    - process_pool: inference processes, shared-memory slot usage and
+      IPC round-trip time (process mode only)
+    - model_cache: per-model output-cache hits, misses and hit ratio
+    - single_flight: keys in flight, led vs coalesced misses, leader
+      failures and follower timeouts
+    - admission: per endpoint class limits, running and queued requests,
+      estimated queue wait and shed (429) counts
+    - streaming: per SSE stream kind (single, batch) p50/p99 time to the
+      first model_complete event and total stream time
+    """
+    registry = get_models(request)
+    pool = get_process_pool()
+    return {
+        "executor": get_executor().get_stats(),
+        "microbatch": registry.get_batcher_stats(),
+        "model_groups": get_group_runner().get_stats(),
+        "backends": get_backend_info(),
+        "process_pool": pool.get_stats() if pool is not None else None,
+        "model_cache": registry.get_model_cache_stats(),
+        "single_flight": get_single_flight().get_stats(),
+        "admission": get_admission_controller().get_stats(),
+        "streaming": get_streaming_stats(),
+    }
+
+
 # =============================================================================
 # Sentiment Endpoints
 # =============================================================================
@@ -284,6 +509,7 @@ async def health_check(request: Request) -> HealthResponse:
     response_model=FinanceSentimentResponse,
     tags=["Sentiment"],
     summary="Analyze financial sentiment",
+    dependencies=[Depends(admission(SINGLE_CLASS))],
 )
 async def finance_sentiment(
     request: Request,
@@ -310,10 +536,9 @@ async def finance_sentiment(
         )
 
     try:
-        return analyze_finance_sentiment(
+        return await analyze_finance_sentiment_batched(
             text=body.text,
-            finbert=registry.finbert,
-            finbert_tone=registry.finbert_tone,
+            registry=registry,
         )
     except Exception as e:
         logger.error(f"Finance sentiment analysis error: {e}")
@@ -328,6 +553,7 @@ async def finance_sentiment(
     response_model=SocialSentimentResponse,
     tags=["Sentiment"],
     summary="Analyze social media sentiment",
+    dependencies=[Depends(admission(SINGLE_CLASS))],
 )
 async def social_sentiment(
     request: Request,
@@ -357,9 +583,9 @@ async def social_sentiment(
         )
 
     try:
-        return analyze_social_sentiment(
+        return await analyze_social_sentiment_batched(
             text=body.text,
-            twitter_model=registry.twitter_sentiment,
+            registry=registry,
         )
     except Exception as e:
         logger.error(f"Social sentiment analysis error: {e}")
@@ -378,6 +604,7 @@ async def social_sentiment(
     response_model=EmotionResponse,
     tags=["Emotion"],
     summary="Classify emotions in text",
+    dependencies=[Depends(admission(SINGLE_CLASS))],
 )
 async def emotion_classification(
     request: Request,
@@ -405,9 +632,9 @@ async def emotion_classification(
         )
 
     try:
-        return analyze_emotion(
+        return await analyze_emotion_batched(
             text=body.text,
-            emotion_model=registry.emotion_classifier,
+            registry=registry,
         )
     except Exception as e:
         logger.error(f"Emotion classification error: {e}")
@@ -426,6 +653,7 @@ async def emotion_classification(
     response_model=NERResponse,
     tags=["NER"],
     summary="Extract named entities",
+    dependencies=[Depends(admission(SINGLE_CLASS))],
 )
 async def named_entity_recognition(
     request: Request,
@@ -455,9 +683,9 @@ async def named_entity_recognition(
         )
 
     try:
-        return analyze_entities(
+        return await analyze_entities_batched(
             text=body.text,
-            ner_model=registry.ner_model,
+            registry=registry,
         )
     except Exception as e:
         logger.error(f"NER analysis error: {e}")
@@ -476,6 +704,7 @@ async def named_entity_recognition(
     response_model=FullAnalysisResponse,
     tags=["Analysis"],
     summary="Run complete NLP analysis",
+    dependencies=[Depends(admission(SINGLE_CLASS))],
 )
 async def full_analysis(
     request: Request,
@@ -499,7 +728,8 @@ async def full_analysis(
     registry = get_models(request)
 
     try:
-        return analyze_full(
+        return await run_inference(
+            analyze_full,
             text=body.text,
             registry=registry,
         )
@@ -519,11 +749,17 @@ async def full_analysis(
 # Batch Endpoints
 # =============================================================================
 
+# Batch results are built as validated response models and returned as
+# FastJSONResponse, encoded once without FastAPI re-validating them (see
+# app.responses).
+
 @app.post(
     "/batch/sentiment/finance",
     response_model=BatchFinanceSentimentResponse,
+    response_class=FastJSONResponse,
     tags=["Batch"],
     summary="Batch analyze financial sentiment",
+    dependencies=[Depends(admission(BATCH_CLASS, batch=True))],
 )
 async def batch_finance_sentiment_endpoint(
     request: Request,
@@ -551,11 +787,14 @@ async def batch_finance_sentiment_endpoint(
         )
 
     try:
-        return batch_finance_sentiment(
-            texts=body.texts,
+        results = await run_batch_chunked(
+            batch_finance_sentiment,
+            body.texts,
+            BatchFinanceSentimentResponse,
             finbert=registry.finbert,
             finbert_tone=registry.finbert_tone,
         )
+        return FastJSONResponse(results)
     except Exception as e:
         logger.error(f"Batch finance sentiment error: {e}")
         raise HTTPException(
@@ -567,8 +806,10 @@ async def batch_finance_sentiment_endpoint(
 @app.post(
     "/batch/sentiment/social",
     response_model=BatchSocialSentimentResponse,
+    response_class=FastJSONResponse,
     tags=["Batch"],
     summary="Batch analyze social sentiment",
+    dependencies=[Depends(admission(BATCH_CLASS, batch=True))],
 )
 async def batch_social_sentiment_endpoint(
     request: Request,
@@ -595,10 +836,13 @@ async def batch_social_sentiment_endpoint(
         )
 
     try:
-        return batch_social_sentiment(
-            texts=body.texts,
+        results = await run_batch_chunked(
+            batch_social_sentiment,
+            body.texts,
+            BatchSocialSentimentResponse,
             twitter_model=registry.twitter_sentiment,
         )
+        return FastJSONResponse(results)
     except Exception as e:
         logger.error(f"Batch social sentiment error: {e}")
         raise HTTPException(
@@ -610,8 +854,10 @@ async def batch_social_sentiment_endpoint(
 @app.post(
     "/batch/emotion",
     response_model=BatchEmotionResponse,
+    response_class=FastJSONResponse,
     tags=["Batch"],
     summary="Batch classify emotions",
+    dependencies=[Depends(admission(BATCH_CLASS, batch=True))],
 )
 async def batch_emotion_endpoint(
     request: Request,
@@ -638,10 +884,13 @@ async def batch_emotion_endpoint(
         )
 
     try:
-        return batch_emotion(
-            texts=body.texts,
+        results = await run_batch_chunked(
+            batch_emotion,
+            body.texts,
+            BatchEmotionResponse,
             emotion_model=registry.emotion_classifier,
         )
+        return FastJSONResponse(results)
     except Exception as e:
         logger.error(f"Batch emotion classification error: {e}")
         raise HTTPException(
@@ -653,8 +902,10 @@ async def batch_emotion_endpoint(
 @app.post(
     "/batch/ner",
     response_model=BatchNERResponse,
+    response_class=FastJSONResponse,
     tags=["Batch"],
     summary="Batch extract named entities",
+    dependencies=[Depends(admission(BATCH_CLASS, batch=True))],
 )
 async def batch_ner_endpoint(
     request: Request,
@@ -681,10 +932,13 @@ async def batch_ner_endpoint(
         )
 
     try:
-        return batch_entities(
-            texts=body.texts,
+        results = await run_batch_chunked(
+            batch_entities,
+            body.texts,
+            BatchNERResponse,
             ner_model=registry.ner_model,
         )
+        return FastJSONResponse(results)
     except Exception as e:
         logger.error(f"Batch NER error: {e}")
         raise HTTPException(
@@ -696,8 +950,10 @@ async def batch_ner_endpoint(
 @app.post(
     "/batch/analyze",
     response_model=BatchFullAnalysisResponse,
+    response_class=FastJSONResponse,
     tags=["Batch"],
     summary="Batch run full analysis",
+    dependencies=[Depends(admission(BATCH_CLASS, batch=True))],
 )
 async def batch_full_analysis_endpoint(
     request: Request,
@@ -718,10 +974,13 @@ async def batch_full_analysis_endpoint(
     registry = get_models(request)
 
     try:
-        return batch_full_analysis(
-            texts=body.texts,
+        results = await run_batch_chunked(
+            batch_full_analysis,
+            body.texts,
+            BatchFullAnalysisResponse,
             registry=registry,
         )
+        return FastJSONResponse(results)
     except Exception as e:
         logger.error(f"Batch full analysis error: {e}")
         raise HTTPException(
@@ -769,19 +1028,25 @@ async def stream_analysis(
     - ner: Named entity recognition
     """
     registry = get_models(request)
+    ticket = await admit_stream(request)
 
     return StreamingResponse(
-        stream_single_analysis(
-            text=body.text,
-            registry=registry,
-            selected_models=body.models,
+        release_after(
+            stream_single_analysis(
+                text=body.text,
+                registry=registry,
+                selected_models=body.models,
+                is_disconnected=request.is_disconnected,
+            ),
+            ticket,
         ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",  # Disable nginx buffering
-        }
+        },
+        background=BackgroundTask(ticket.release),
     )
 
 
@@ -835,18 +1100,25 @@ async def stream_analysis_get(
     if models:
         selected_models = [m.strip() for m in models.split(",")]
 
+    ticket = await admit_stream(request)
+
     return StreamingResponse(
-        stream_single_analysis(
-            text=text,
-            registry=registry,
-            selected_models=selected_models,
+        release_after(
+            stream_single_analysis(
+                text=text,
+                registry=registry,
+                selected_models=selected_models,
+                is_disconnected=request.is_disconnected,
+            ),
+            ticket,
         ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
-        }
+        },
+        background=BackgroundTask(ticket.release),
     )
 
 
@@ -874,22 +1146,50 @@ async def stream_batch(
     - Maximum 50 texts per streaming request
     """
     registry = get_models(request)
+    ticket = await admit_stream(request, cost=len(body.texts))
 
     return StreamingResponse(
-        stream_batch_analysis(
-            texts=body.texts,
-            registry=registry,
-            selected_models=body.models,
+        release_after(
+            stream_batch_analysis(
+                texts=body.texts,
+                registry=registry,
+                selected_models=body.models,
+                is_disconnected=request.is_disconnected,
+            ),
+            ticket,
         ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
-        }
+        },
+        background=BackgroundTask(ticket.release),
     )
 
 
+@app.websocket("/ws/analyze")
+async def ws_analyze(websocket: WebSocket):
+    """
+    Multiplexed analysis channel: many requests over one connection.
+
+    **Client messages:**
+    - `{"type": "analyze", "id": "a1", "text": "...", "models": ["finance"]}`
+    - `{"type": "batch", "id": "b1", "texts": ["...", "..."]}`
+    - `{"type": "cancel", "id": "a1"}`
+
+    **Server messages:** `{"id": "a1", "event": "model_complete", "data": {...}}`
+    with the same events as /stream/analyze and /stream/batch. Each
+    request ends with `complete` / `batch_complete`, `error` or
+    `cancelled`. Closing the socket cancels everything still running.
+    """
+    await websocket.accept()
+    try:
+        await AnalysisChannel(websocket, websocket.app.state.models).run()
+    except WebSocketDisconnect:
+        pass
+
+
 # =============================================================================
 # Root Endpoint
 # =============================================================================
@@ -919,6 +1219,7 @@ async def root():
         "streaming": {
             "single_analysis": "GET/POST /stream/analyze",
             "batch_analysis": "POST /stream/batch",
+            "websocket": "WS /ws/analyze",
         },
         "intelligence": {
             "analyze": "POST /intelligence/analyze",
@@ -951,14 +1252,23 @@ async def root():
     if BATCH_API_AVAILABLE:
         endpoints["batch"] = {
             "analyze": "POST /batch-analyze",
+            "stream": "POST /batch-analyze/stream",
             "cache_stats": "GET /batch-analyze/cache/stats",
         }
+        endpoints["jobs"] = {
+            "submit": "POST /jobs",
+            "status": "GET /jobs/{id}",
+            "results": "GET /jobs/{id}/results",
+            "cancel": "DELETE /jobs/{id}",
+        }
 
     return {
         "service": "NLP Sentiment Analysis API",
         "version": "1.0.0",
         "docs": "/docs",
         "health": "/health",
+        "ready": "/ready",
+        "metrics": "/metrics/inference",
         "llm_available": LLM_AVAILABLE,
         "summaries_available": SUMMARIES_AVAILABLE,
         "batch_api_available": BATCH_API_AVAILABLE,
@@ -1038,6 +1348,7 @@ async def intelligence_analyze(
     response_model=IntelligenceFromTextResponse,
     tags=["Intelligence"],
     summary="End-to-end intelligence analysis from raw text",
+    dependencies=[Depends(admission(SINGLE_CLASS))],
 )
 async def intelligence_analyze_text(
     request: Request,
@@ -1070,7 +1381,8 @@ async def intelligence_analyze_text(
         finbert_score = 0.0
         if registry.finbert:
             try:
-                finance_result = analyze_finance_sentiment(
+                finance_result = await run_inference(
+                    analyze_finance_sentiment,
                     text=body.text,
                     finbert=registry.finbert,
                     finbert_tone=registry.finbert_tone,
@@ -1083,7 +1395,8 @@ async def intelligence_analyze_text(
         social_score = 0.0
         if registry.twitter_sentiment:
             try:
-                social_result = analyze_social_sentiment(
+                social_result = await run_inference(
+                    analyze_social_sentiment,
                     text=body.text,
                     twitter_model=registry.twitter_sentiment,
                 )
@@ -1100,7 +1413,8 @@ async def intelligence_analyze_text(
         primary_emotion = "neutral"
         if registry.emotion_classifier:
             try:
-                emotion_result = analyze_emotion(
+                emotion_result = await run_inference(
+                    analyze_emotion,
                     text=body.text,
                     emotion_model=registry.emotion_classifier,
                 )
@@ -1159,6 +1473,7 @@ async def intelligence_analyze_text(
 @app.post(
     "/intelligence/batch",
     response_model=BatchIntelligenceResponse,
+    response_class=FastJSONResponse,
     tags=["Intelligence"],
     summary="Batch AI intelligence analysis",
 )
@@ -1197,10 +1512,10 @@ async def intelligence_batch(
         # Run batch processing
         results = run_ai_layer_batch(batch_inputs)
 
-        return BatchIntelligenceResponse(
+        return FastJSONResponse(BatchIntelligenceResponse(
             results=[IntelligenceResponse(**r) for r in results],
             count=len(results),
-        )
+        ))
 
     except Exception as e:
         logger.error(f"Batch intelligence analysis error: {e}")
@@ -1214,6 +1529,20 @@ async def intelligence_batch(
 # Error Handlers
 # =============================================================================
 
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Shed request: 429 with a Retry-After hint."""
+    return JSONResponse(
+        status_code=429,
+        content={
+            "detail": str(exc),
+            "reason": exc.reason,
+            "retry_after": round(exc.retry_after, 3),
+        },
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled errors."""
@@ -14,15 +14,144 @@ Models loaded:
 """
 
 import logging
-from dataclasses import dataclass
-from typing import Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
-import torch
 from transformers import pipeline, Pipeline
 
+from app.core.backends import (
+    TORCH,
+    build_pipeline,
+    drift_check_suspended,
+    get_backend,
+    get_backend_info,
+)
+from app.core.microbatch import MicroBatcher
+from app.core.model_cache import (
+    CachedPipeline,
+    get_model_revision,
+    is_model_cache_enabled,
+    model_cache_id,
+)
+from app.core.procpool import RemotePipeline, start_process_pool
+from app.core.truncation import CHUNK, TRUNCATE, ChunkedClassifier, get_long_text_mode
+
+# Torch is optional at import time (device detection falls back to CPU)
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# Sequence Length Configuration
+# =============================================================================
+
+# Per-model max sequence length in tokens (override: NLP_MAX_LENGTH_<KEY>,
+# e.g. NLP_MAX_LENGTH_TWITTER_SENTIMENT=96). Tweets rarely need more than 128.
+DEFAULT_MAX_LENGTHS = {
+    "finbert": 512,
+    "finbert_tone": 512,
+    "twitter_sentiment": 128,
+    "emotion_classifier": 512,
+    "ner_model": 512,
+}
+
+
+def get_max_length(model_key: str) -> int:
+    """Get configured max sequence length (tokens) for a model."""
+    configured = os.getenv(f"NLP_MAX_LENGTH_{model_key.upper()}")
+    if configured:
+        return max(8, int(configured))
+    return DEFAULT_MAX_LENGTHS.get(model_key, 512)
+
+
+# =============================================================================
+# Model Specs & Load State
+# =============================================================================
+
+# Registry attribute -> (pipeline task, HuggingFace model id), in load order
+MODEL_SPECS = {
+    "finbert": ("sentiment-analysis", "ProsusAI/finbert"),
+    "finbert_tone": ("sentiment-analysis", "yiyanghkust/finbert-tone"),
+    "twitter_sentiment": ("sentiment-analysis", "cardiffnlp/twitter-roberta-base-sentiment-latest"),
+    "emotion_classifier": ("text-classification", "michellejieli/emotion_text_classifier"),
+    "ner_model": ("ner", "dslim/bert-base-NER"),
+}
+
+# Loading modes (NLP_MODEL_LOADING)
+PARALLEL_LOADING = "parallel"
+SERIAL_LOADING = "serial"
+LAZY_LOADING = "lazy"
+LOADING_MODES = (PARALLEL_LOADING, SERIAL_LOADING, LAZY_LOADING)
+
+# Per-model load states
+PENDING = "pending"
+LOADING = "loading"
+LOADED = "loaded"
+FAILED = "failed"
+
+
+def get_loading_mode() -> str:
+    """
+    Get model loading mode (NLP_MODEL_LOADING).
+
+    - parallel: load all models concurrently in the background (default)
+    - serial: load one after another in the background
+    - lazy: load each model on its first request
+    """
+    mode = os.getenv("NLP_MODEL_LOADING", PARALLEL_LOADING).lower()
+    if mode not in LOADING_MODES:
+        logger.warning(f"Unknown NLP_MODEL_LOADING '{mode}', using '{PARALLEL_LOADING}'")
+        return PARALLEL_LOADING
+    return mode
+
+
+def get_ready_models() -> list[str]:
+    """
+    Get models required for readiness (NLP_READY_MODELS, comma-separated
+    registry keys; default: all).
+    """
+    configured = os.getenv("NLP_READY_MODELS")
+    if not configured:
+        return list(MODEL_SPECS)
+    keys = [key.strip() for key in configured.split(",") if key.strip()]
+    unknown = [key for key in keys if key not in MODEL_SPECS]
+    if unknown:
+        logger.warning(f"Ignoring unknown NLP_READY_MODELS entries: {unknown}")
+    return [key for key in keys if key in MODEL_SPECS]
+
+
+@dataclass
+class ModelLoadState:
+    """Load progress of one model."""
+    key: str
+    model_name: str
+    state: str = PENDING
+    load_ms: Optional[float] = None
+    error: Optional[str] = None
+    revision: Optional[str] = None
+    cache_id: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "key": self.key,
+            "name": self.model_name,
+            "state": self.state,
+            "load_ms": round(self.load_ms, 1) if self.load_ms is not None else None,
+            "error": self.error,
+            "revision": self.revision,
+            "cache_id": self.cache_id,
+        }
+
+
 @dataclass
 class ModelRegistry:
     """
@@ -35,31 +164,88 @@ class ModelRegistry:
     emotion_classifier: Optional[Pipeline] = None
     ner_model: Optional[Pipeline] = None
     device: str = "cpu"
+    long_text_mode: str = TRUNCATE
+    max_lengths: dict[str, int] = field(default_factory=dict)
+    loading_mode: str = PARALLEL_LOADING
+    load_states: dict[str, ModelLoadState] = field(default_factory=dict)
+    batchers: dict[str, MicroBatcher] = field(default_factory=dict, repr=False)
 
     def is_loaded(self) -> bool:
         """Check if all models are successfully loaded."""
-        return all([
-            self.finbert is not None,
-            self.finbert_tone is not None,
-            self.twitter_sentiment is not None,
-            self.emotion_classifier is not None,
-            self.ner_model is not None,
-        ])
+        return all(self.is_model_loaded(key) for key in MODEL_SPECS)
+
+    def is_model_loaded(self, model_key: str) -> bool:
+        """Check if one model has finished loading."""
+        state = self.load_states.get(model_key)
+        if state is None:
+            return getattr(self, model_key, None) is not None
+        return state.state == LOADED
 
     def get_loaded_models(self) -> list[str]:
         """Return list of successfully loaded model names."""
-        loaded = []
-        if self.finbert:
-            loaded.append("ProsusAI/finbert")
-        if self.finbert_tone:
-            loaded.append("yiyanghkust/finbert-tone")
-        if self.twitter_sentiment:
-            loaded.append("cardiffnlp/twitter-roberta-base-sentiment-latest")
-        if self.emotion_classifier:
-            loaded.append("michellejieli/emotion_text_classifier")
-        if self.ner_model:
-            loaded.append("dslim/bert-base-NER")
-        return loaded
+        return [
+            model_name for key, (_, model_name) in MODEL_SPECS.items()
+            if self.is_model_loaded(key)
+        ]
+
+    def is_ready(self, model_keys: Optional[list[str]] = None) -> bool:
+        """
+        Check if the given models (default: all) can serve traffic.
+
+        In lazy mode a model that hasn't failed counts as ready: it is
+        loaded by the first request that needs it.
+        """
+        for key in model_keys or MODEL_SPECS:
+            if self.is_model_loaded(key):
+                continue
+            state = self.load_states.get(key)
+            if self.loading_mode == LAZY_LOADING and state is not None and state.state != FAILED:
+                continue
+            return False
+        return True
+
+    def get_load_states(self) -> list[ModelLoadState]:
+        """Return load state per model, in load order."""
+        return [
+            self.load_states.get(key) or ModelLoadState(
+                key=key,
+                model_name=model_name,
+                state=LOADED if getattr(self, key) is not None else FAILED,
+            )
+            for key, (_, model_name) in MODEL_SPECS.items()
+        ]
+
+    def get_batcher(self, model_key: str) -> Optional[MicroBatcher]:
+        """
+        Get (or lazily create) the micro-batcher for a loaded pipeline.
+
+        Args:
+            model_key: Registry attribute name (e.g. 'finbert', 'ner_model')
+
+        Returns:
+            MicroBatcher wrapping the pipeline, or None if it isn't loaded
+        """
+        pipe = getattr(self, model_key, None)
+        if pipe is None:
+            return None
+
+        batcher = self.batchers.get(model_key)
+        if batcher is None:
+            batcher = MicroBatcher(name=model_key, pipeline=pipe)
+            self.batchers[model_key] = batcher
+        return batcher
+
+    def get_batcher_stats(self) -> dict[str, dict]:
+        """Return micro-batching statistics per model."""
+        return {key: batcher.get_stats() for key, batcher in self.batchers.items()}
+
+    def get_model_cache_stats(self) -> dict[str, dict]:
+        """Return output-cache hit/miss statistics per model."""
+        return {
+            key: getattr(self, key).get_stats()
+            for key in MODEL_SPECS
+            if isinstance(getattr(self, key), CachedPipeline)
+        }
 
 
 def detect_device() -> tuple[int, str]:
@@ -71,7 +257,7 @@ def detect_device() -> tuple[int, str]:
             - device_index: 0 for GPU, -1 for CPU (HuggingFace convention)
             - device_name: Human-readable device description
     """
-    if torch.cuda.is_available():
+    if TORCH_AVAILABLE and torch.cuda.is_available():
         device_name = torch.cuda.get_device_name(0)
         logger.info(f"GPU detected: {device_name}")
         return 0, f"cuda:0 ({device_name})"
@@ -84,6 +270,7 @@ def load_pipeline_safe(
     task: str,
     model_name: str,
     device: int,
+    backend: str = TORCH,
     **kwargs
 ) -> Optional[Pipeline]:
     """
@@ -93,14 +280,23 @@ def load_pipeline_safe(
         task: Pipeline task type (e.g., 'sentiment-analysis', 'ner')
         model_name: HuggingFace model identifier
         device: Device index (0 for GPU, -1 for CPU)
+        backend: 'torch', 'onnx' or 'onnx-int8' (falls back to torch
+            if the ONNX backend can't be built)
         **kwargs: Additional pipeline arguments
 
     Returns:
         Pipeline if successful, None if loading fails
     """
     try:
-        logger.info(f"Loading model: {model_name}")
-        pipe = pipeline(task, model=model_name, device=device, **kwargs)
+        logger.info(f"Loading model: {model_name} [{backend}]")
+        pipe = build_pipeline(
+            task,
+            model_name,
+            device,
+            backend,
+            torch_factory=lambda: pipeline(task, model=model_name, device=device, **kwargs),
+            **kwargs,
+        )
         logger.info(f"Successfully loaded: {model_name}")
         return pipe
     except Exception as e:
@@ -108,9 +304,180 @@ def load_pipeline_safe(
         return None
 
 
+def create_registry() -> ModelRegistry:
+    """
+    Create an empty registry with device, sequence-length and loading
+    configuration resolved and every model in the 'pending' state.
+    """
+    _, device_name = detect_device()
+    registry = ModelRegistry(
+        device=device_name,
+        long_text_mode=get_long_text_mode(),
+        max_lengths={key: get_max_length(key) for key in DEFAULT_MAX_LENGTHS},
+        loading_mode=get_loading_mode(),
+    )
+    registry.load_states = {
+        key: ModelLoadState(key=key, model_name=model_name)
+        for key, (_, model_name) in MODEL_SPECS.items()
+    }
+    return registry
+
+
+def _pipeline_kwargs(registry: ModelRegistry, model_key: str) -> dict[str, Any]:
+    """Pipeline construction arguments for one model."""
+    max_length = registry.max_lengths.get(model_key, get_max_length(model_key))
+
+    if model_key == "ner_model":
+        # aggregation_strategy="simple" groups sub-word tokens into entities.
+        # In chunk mode, stride makes the pipeline window over the whole text
+        # and merge entities across windows (offsets stay relative to the input)
+        kwargs: dict[str, Any] = {"aggregation_strategy": "simple"}
+        if registry.long_text_mode == CHUNK:
+            kwargs["stride"] = max_length // 4
+        return kwargs
+
+    kwargs = {"truncation": True, "max_length": max_length}
+    if model_key == "emotion_classifier":
+        kwargs["top_k"] = None  # Return all emotion scores
+    return kwargs
+
+
+def _output_variant(registry: ModelRegistry, model_key: str, backend: str) -> str:
+    """Settings besides the checkpoint that change a model's outputs."""
+    max_length = registry.max_lengths.get(model_key, get_max_length(model_key))
+    return f"{backend}/{registry.long_text_mode}{max_length}"
+
+
+def _wrap_cached(model_key: str, pipe: Any, cache_id: Optional[str]) -> Any:
+    """Serve repeated inputs from the output cache (NLP_MODEL_CACHE)."""
+    if pipe is None or cache_id is None or not is_model_cache_enabled():
+        return pipe
+    # Token classification returns the bare entity list for a single string
+    return CachedPipeline(pipe, cache_id, single_as_list=(model_key != "ner_model"))
+
+
+def load_model(registry: ModelRegistry, model_key: str) -> Optional[Any]:
+    """
+    Load one model into the registry, recording its load state and duration.
+
+    Args:
+        registry: Registry to load into
+        model_key: Registry attribute name (e.g. 'finbert', 'ner_model')
+
+    Returns:
+        The loaded (and, in chunk mode, wrapped) pipeline behind the output
+        cache, or None on failure
+    """
+    task, model_name = MODEL_SPECS[model_key]
+    state = registry.load_states.setdefault(
+        model_key, ModelLoadState(key=model_key, model_name=model_name)
+    )
+    state.state = LOADING
+    start = time.perf_counter()
+
+    device_idx = 0 if registry.device.startswith("cuda") else -1
+    max_length = registry.max_lengths.get(model_key, get_max_length(model_key))
+    pipe = load_pipeline_safe(
+        task=task,
+        model_name=model_name,
+        device=device_idx,
+        backend=get_backend(model_key),
+        **_pipeline_kwargs(registry, model_key),
+    )
+
+    if pipe is not None:
+        backend = get_backend_info().get(model_name, {}).get("backend", TORCH)
+        state.revision = get_model_revision(pipe)
+        state.cache_id = model_cache_id(
+            model_name, state.revision, _output_variant(registry, model_key, backend)
+        )
+
+        if model_key == "ner_model":
+            # Token classification truncates/windows at tokenizer.model_max_length
+            pipe.tokenizer.model_max_length = max_length
+        elif registry.long_text_mode == CHUNK:
+            # Chunk mode: wrap classifiers so long texts are windowed and aggregated
+            pipe = ChunkedClassifier(
+                pipe,
+                max_length=max_length,
+                all_scores=(model_key == "emotion_classifier"),
+            )
+
+        pipe = _wrap_cached(model_key, pipe, state.cache_id)
+
+    setattr(registry, model_key, pipe)
+    state.load_ms = (time.perf_counter() - start) * 1000
+    if pipe is None:
+        state.state = FAILED
+        state.error = f"Failed to load {model_name}"
+    else:
+        state.state = LOADED
+        state.error = None
+    return pipe
+
+
+def load_models(
+    registry: ModelRegistry,
+    model_keys: Optional[list[str]] = None,
+    max_workers: Optional[int] = None,
+) -> ModelRegistry:
+    """
+    Load models into an existing registry.
+
+    In parallel mode the pipelines are built concurrently (download,
+    deserialization and ONNX export overlap), so startup takes roughly as
+    long as the slowest model instead of the sum of all five.
+
+    Args:
+        registry: Registry created by create_registry()
+        model_keys: Models to load (default: all)
+        max_workers: Concurrent loads (default: NLP_MODEL_LOAD_WORKERS,
+            or 1 in serial mode)
+
+    Returns:
+        The same registry, for chaining
+    """
+    keys = list(model_keys or MODEL_SPECS)
+    if max_workers is None:
+        if registry.loading_mode == SERIAL_LOADING:
+            max_workers = 1
+        else:
+            max_workers = int(os.getenv("NLP_MODEL_LOAD_WORKERS", len(keys)))
+    max_workers = max(1, min(max_workers, len(keys)))
+
+    logger.info("=" * 60)
+    logger.info("Starting model loading process...")
+    logger.info(f"Target device: {registry.device}")
+    logger.info(f"Loading {len(keys)} models, {max_workers} at a time")
+    logger.info(f"Long text mode: {registry.long_text_mode}, max lengths: {registry.max_lengths}")
+    logger.info("=" * 60)
+
+    start = time.perf_counter()
+    if max_workers == 1:
+        for key in keys:
+            load_model(registry, key)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-load") as pool:
+            list(pool.map(lambda key: load_model(registry, key), keys))
+    elapsed = time.perf_counter() - start
+
+    # Log loading summary
+    loaded = registry.get_loaded_models()
+    logger.info("=" * 60)
+    logger.info(f"Model loading complete: {len(loaded)}/{len(MODEL_SPECS)} models loaded in {elapsed:.1f}s")
+    for state in registry.get_load_states():
+        if state.state == LOADED:
+            logger.info(f"  ✓ {state.model_name} ({(state.load_ms or 0) / 1000:.1f}s)")
+        elif state.key in keys:
+            logger.warning(f"  ✗ {state.model_name} failed to load")
+    logger.info("=" * 60)
+
+    return registry
+
+
 def load_all_models() -> ModelRegistry:
     """
-    Load all NLP models at startup.
+    Load all NLP models and return the populated registry (blocking).
 
     This function initializes all required HuggingFace pipelines:
     - Two financial sentiment models (FinBERT variants)
@@ -119,73 +486,132 @@ def load_all_models() -> ModelRegistry:
     - One NER model
 
     Models are loaded with appropriate configurations:
-    - Emotion classifier uses return_all_scores=True for full distribution
+    - Emotion classifier uses top_k=None for full distribution
     - NER uses aggregation_strategy="simple" for entity grouping
+    - Inputs are truncated on token IDs at each model's max_length; in
+      chunk mode, long texts are windowed and aggregated instead
 
     Returns:
         ModelRegistry containing all loaded pipelines
     """
-    device_idx, device_name = detect_device()
-    registry = ModelRegistry(device=device_name)
+    return load_models(create_registry())
 
-    logger.info("=" * 60)
-    logger.info("Starting model loading process...")
-    logger.info(f"Target device: {device_name}")
-    logger.info("=" * 60)
 
-    # Financial sentiment - ProsusAI/finbert
-    # Trained on financial news, outputs: positive/negative/neutral
-    registry.finbert = load_pipeline_safe(
-        task="sentiment-analysis",
-        model_name="ProsusAI/finbert",
-        device=device_idx,
-    )
+# =============================================================================
+# Pre-fork Preloading
+# =============================================================================
 
-    # Financial tone sentiment - yiyanghkust/finbert-tone
-    # Fine-tuned on financial communications, similar output labels
-    registry.finbert_tone = load_pipeline_safe(
-        task="sentiment-analysis",
-        model_name="yiyanghkust/finbert-tone",
-        device=device_idx,
-    )
+# Registry loaded in the gunicorn master before workers fork (see
+# gunicorn.conf.py). Workers inherit it and share its weights copy-on-write.
+_preloaded_registry: Optional[ModelRegistry] = None
 
-    # Social media sentiment - cardiffnlp/twitter-roberta-base-sentiment-latest
-    # Trained on tweets, outputs: positive/negative/neutral
-    registry.twitter_sentiment = load_pipeline_safe(
-        task="sentiment-analysis",
-        model_name="cardiffnlp/twitter-roberta-base-sentiment-latest",
-        device=device_idx,
-    )
 
-    # Emotion classification - michellejieli/emotion_text_classifier
-    # Multi-class emotion detection with full probability distribution
-    # top_k=None returns all scores for complete emotion distribution
-    registry.emotion_classifier = load_pipeline_safe(
-        task="text-classification",
-        model_name="michellejieli/emotion_text_classifier",
-        device=device_idx,
-        top_k=None,  # Return all emotion scores
-    )
+def preload_models() -> ModelRegistry:
+    """
+    Load all models in the current (master) process for pre-fork sharing.
 
-    # Named Entity Recognition - dslim/bert-base-NER
-    # Identifies: PER, ORG, LOC, MISC entities
-    # aggregation_strategy="simple" groups sub-word tokens into entities
-    registry.ner_model = load_pipeline_safe(
-        task="ner",
-        model_name="dslim/bert-base-NER",
-        device=device_idx,
-        aggregation_strategy="simple",
-    )
+    Always loads every model, regardless of NLP_MODEL_LOADING: a lazily
+    loaded model would be loaded separately in every worker.
+
+    The ONNX drift check is skipped here: it runs inference, and none may
+    run in the master before fork.
+    """
+    global _preloaded_registry
+    if _preloaded_registry is None:
+        with drift_check_suspended():
+            _preloaded_registry = load_all_models()
+    return _preloaded_registry
+
+
+def get_preloaded_registry() -> Optional[ModelRegistry]:
+    """Registry inherited from the pre-fork master, if any."""
+    return _preloaded_registry
+
+
+# =============================================================================
+# Process-pool Inference
+# =============================================================================
+
+def load_remote_models(registry: ModelRegistry) -> ModelRegistry:
+    """
+    Start the inference process pool and point registry slots at it.
+
+    Each process loads its own registry; this process keeps only
+    RemotePipeline proxies, so HTTP handling never shares a GIL with a
+    forward pass. Load states are taken from the inference processes.
+    Model outputs are cached here, so hits never cross the process boundary.
+    """
+    for state in registry.load_states.values():
+        state.state = LOADING
+
+    pool = start_process_pool()
+    for key, reported in pool.models.items():
+        if key not in MODEL_SPECS:
+            continue
+        registry.load_states[key] = ModelLoadState(
+            key=key,
+            model_name=reported["name"],
+            state=reported["state"],
+            load_ms=reported["load_ms"],
+            error=reported["error"],
+            revision=reported.get("revision"),
+            cache_id=reported.get("cache_id"),
+        )
+        if reported["state"] == LOADED:
+            setattr(registry, key, _wrap_cached(key, RemotePipeline(pool, key), reported.get("cache_id")))
+
+    logger.info(f"Process-pool inference: {len(registry.get_loaded_models())} models available")
+    return registry
+
+
+# =============================================================================
+# Lazy Loading
+# =============================================================================
+
+class LazyPipeline:
+    """
+    Placeholder that loads its model on first use.
+
+    Installed in registry slots in lazy mode. Calling it (or reading any
+    pipeline attribute such as .tokenizer) loads the model once, under a
+    lock, then delegates. Inference always runs on executor threads, so
+    the load never blocks the event loop. After loading, the registry
+    slot holds the real pipeline; on failure the slot is cleared so
+    endpoints report the model as unavailable.
+    """
+
+    def __init__(self, registry: ModelRegistry, model_key: str):
+        self._registry = registry
+        self._model_key = model_key
+        self._pipe: Optional[Any] = None
+        self._error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _resolve(self) -> Any:
+        if self._pipe is None:
+            with self._lock:
+                if self._pipe is None and self._error is None:
+                    self._pipe = load_model(self._registry, self._model_key)
+                    if self._pipe is None:
+                        self._error = self._registry.load_states[self._model_key].error
+        if self._pipe is None:
+            raise RuntimeError(self._error or f"{self._model_key} is not available")
+        return self._pipe
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Don't load for protocol probes (copy, pickle, repr helpers)
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self._resolve(), name)
 
-    # Log loading summary
-    loaded = registry.get_loaded_models()
-    logger.info("=" * 60)
-    logger.info(f"Model loading complete: {len(loaded)}/5 models loaded")
-    for model in loaded:
-        logger.info(f"  ✓ {model}")
-    if not registry.is_loaded():
-        failed = 5 - len(loaded)
-        logger.warning(f"  ✗ {failed} model(s) failed to load")
-    logger.info("=" * 60)
 
+def install_lazy_pipelines(registry: ModelRegistry) -> ModelRegistry:
+    """Fill every empty registry slot with a LazyPipeline."""
+    for key in MODEL_SPECS:
+        if getattr(registry, key) is None:
+            setattr(registry, key, LazyPipeline(registry, key))
+    logger.info(f"Lazy model loading: {len(MODEL_SPECS)} models load on first use")
     return registry
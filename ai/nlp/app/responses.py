@@ -0,0 +1,37 @@
+"""
+Response Classes
+
+JSON responses serialized with app.core.serialization.
+
+How FastAPI encodes a model returned from a response_model route depends
+on its version: releases without the pydantic-core fast path dump it to
+dicts, validate those against the model again and run the stdlib
+encoder, several times the cost of the encode alone for a 1,000-text
+batch (see benchmarks/bench_serialization.py). Any custom response class
+also turns the fast path off. Endpoints that build their response model
+themselves return FastJSONResponse instead: FastAPI passes a returned
+Response through untouched, so the model is encoded once by pydantic-core
+on every FastAPI version. response_model stays on the route for the
+OpenAPI schema.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.serialization import dumps, dumps_model
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered without re-validation.
+
+    Pydantic models are encoded directly (dumps_model); other content
+    goes through dumps (orjson when installed).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return dumps_model(content)
+        return dumps(content)
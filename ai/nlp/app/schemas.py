@@ -260,6 +260,27 @@ class HealthResponse(BaseModel):
     )
 
 
+class ModelLoadStatus(BaseModel):
+    """Load state of a single model."""
+    key: str = Field(..., description="Registry key (e.g. 'finbert')")
+    name: str = Field(..., description="Model identifier")
+    state: str = Field(..., description="pending, loading, loaded or failed")
+    load_ms: Optional[float] = Field(None, description="Load duration in milliseconds")
+    error: Optional[str] = Field(None, description="Load error, if failed")
+    revision: Optional[str] = Field(None, description="Checkpoint revision the weights were loaded from")
+    cache_id: Optional[str] = Field(None, description="Output cache identity (model, revision, backend, length settings)")
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness check response with per-model load progress."""
+    ready: bool = Field(..., description="Whether the required models can serve traffic")
+    loading_mode: str = Field(..., description="Model loading mode (parallel/serial/lazy)")
+    required_models: list[str] = Field(..., description="Registry keys required for readiness")
+    models: list[ModelLoadStatus] = Field(..., description="Load state of each model")
+    models_loaded: int = Field(..., ge=0, description="Number of loaded models")
+    total_models: int = Field(..., description="Total number of expected models")
+
+
 # =============================================================================
 # Batch Request/Response Schemas
 # =============================================================================
@@ -11,14 +11,31 @@ Services:
 - Emotion classification
 - Named entity recognition
 - Full combined analysis
+- Micro-batched single-text variants (async, coalesced across requests)
+
+Registry pipelines sit behind the per-model output cache (see
+app.core.model_cache), so every service reuses raw outputs a model
+already produced for the same text.
 """
 
+import asyncio
 import logging
-from typing import Optional
+import time
+from typing import Any, Optional
 
 from transformers import Pipeline
 
-from app.models import ModelRegistry
+from app.core.batching import (
+    DEFAULT_BATCH_SIZE,
+    PaddingStats,
+    bucket_by_length,
+    run_in_buckets,
+)
+from app.core.model_cache import CachedPipeline, hash_model_inputs, unwrap_cached
+from app.core.singleflight import Flight
+from app.core.parallel import get_group_runner
+from app.core.tokenization import DEFAULT_MAX_LENGTH, SharedEncodings
+from app.models import MODEL_SPECS, ModelRegistry
 from app.schemas import (
     FinanceSentimentResponse,
     SocialSentimentResponse,
@@ -28,7 +45,6 @@ from app.schemas import (
     NEREntity,
     FullAnalysisResponse,
     ModelSentimentResult,
-    SentimentScore,
     BatchFinanceSentimentResponse,
     BatchSocialSentimentResponse,
     BatchEmotionResponse,
@@ -43,9 +59,124 @@ from app.utils import (
     truncate_text,
 )
 
+# Torch is optional at import time (only classify_encoded needs it)
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# Response Builders (shared by single, batch and micro-batched paths)
+# =============================================================================
+
+def prepare_text(text: str) -> str:
+    """
+    Clean text for model input.
+
+    Only a coarse length guard is applied here; token-accurate limits
+    are enforced per model by the pipelines (see app.core.truncation).
+    """
+    return truncate_text(clean_text(text))
+
+
+def build_finance_response(
+    text: str,
+    finbert_raw: Optional[dict],
+    tone_raw: Optional[dict],
+) -> FinanceSentimentResponse:
+    """
+    Build a finance sentiment response from raw FinBERT outputs.
+
+    Either raw result may be None (model failed); the ensemble is
+    computed over whichever results are available.
+    """
+    model_results = []
+
+    if finbert_raw is not None:
+        try:
+            model_results.append(ModelSentimentResult(
+                model="ProsusAI/finbert",
+                sentiment=normalize_sentiment_result(finbert_raw)
+            ))
+        except Exception as e:
+            logger.error(f"FinBERT result processing failed: {e}")
+
+    if tone_raw is not None:
+        try:
+            model_results.append(ModelSentimentResult(
+                model="yiyanghkust/finbert-tone",
+                sentiment=normalize_sentiment_result(tone_raw)
+            ))
+        except Exception as e:
+            logger.error(f"FinBERT-tone result processing failed: {e}")
+
+    sentiment_scores = [m.sentiment for m in model_results]
+    ensemble = calculate_ensemble_score(sentiment_scores)
+
+    return FinanceSentimentResponse(
+        text=text,
+        models=model_results,
+        ensemble=ensemble
+    )
+
+
+def build_social_response(text: str, raw: dict) -> SocialSentimentResponse:
+    """Build a social sentiment response from a raw Twitter RoBERTa output."""
+    normalized = normalize_sentiment_result(raw)
+    return SocialSentimentResponse(
+        text=text,
+        label=normalized.label,
+        confidence=round(normalized.score, 4)
+    )
+
+
+def build_emotion_response(text: str, raw: list) -> EmotionResponse:
+    """Build an emotion response from a raw (top_k=None) classifier output."""
+    # Handle nested list structure from pipeline
+    if raw and isinstance(raw[0], list):
+        raw = raw[0]
+
+    emotions = [
+        EmotionScore(emotion=r["label"], score=round(r["score"], 4))
+        for r in raw
+    ]
+
+    # Sort by score descending; primary emotion is the top one
+    emotions.sort(key=lambda x: x.score, reverse=True)
+    primary = emotions[0] if emotions else EmotionScore(emotion="neutral", score=0.0)
+
+    return EmotionResponse(
+        text=text,
+        emotions=emotions,
+        primary_emotion=primary.emotion,
+        primary_score=primary.score
+    )
+
+
+def build_ner_response(text: str, raw: list) -> NERResponse:
+    """Build an NER response from raw aggregated entity output."""
+    entities = [
+        NEREntity(
+            entity=r["word"],
+            entity_type=normalize_entity_type(r["entity_group"]),
+            confidence=round(r["score"], 4),
+            start=r["start"],
+            end=r["end"]
+        )
+        for r in raw
+    ]
+
+    return NERResponse(
+        text=text,
+        entities=entities,
+        entity_count=len(entities)
+    )
+
+
 # =============================================================================
 # Finance Sentiment Service
 # =============================================================================
@@ -73,43 +204,23 @@ def analyze_finance_sentiment(
         FinanceSentimentResponse with individual and ensemble results
     """
     # Preprocess text
-    cleaned_text = clean_text(text)
-    truncated_text = truncate_text(cleaned_text)
-
-    # Run both models
-    model_results = []
+    truncated_text = prepare_text(text)
 
     # ProsusAI/finbert
+    finbert_raw = None
     try:
         finbert_raw = finbert(truncated_text)[0]
-        finbert_score = normalize_sentiment_result(finbert_raw)
-        model_results.append(ModelSentimentResult(
-            model="ProsusAI/finbert",
-            sentiment=finbert_score
-        ))
     except Exception as e:
         logger.error(f"FinBERT inference failed: {e}")
 
     # yiyanghkust/finbert-tone
+    tone_raw = None
     try:
         tone_raw = finbert_tone(truncated_text)[0]
-        tone_score = normalize_sentiment_result(tone_raw)
-        model_results.append(ModelSentimentResult(
-            model="yiyanghkust/finbert-tone",
-            sentiment=tone_score
-        ))
     except Exception as e:
         logger.error(f"FinBERT-tone inference failed: {e}")
 
-    # Calculate ensemble score
-    sentiment_scores = [m.sentiment for m in model_results]
-    ensemble = calculate_ensemble_score(sentiment_scores)
-
-    return FinanceSentimentResponse(
-        text=text,
-        models=model_results,
-        ensemble=ensemble
-    )
+    return build_finance_response(text, finbert_raw, tone_raw)
 
 
 # =============================================================================
@@ -134,19 +245,12 @@ def analyze_social_sentiment(
         SocialSentimentResponse with sentiment label and confidence
     """
     # Preprocess text
-    cleaned_text = clean_text(text)
-    truncated_text = truncate_text(cleaned_text)
+    truncated_text = prepare_text(text)
 
     # Run inference
     try:
         result = twitter_model(truncated_text)[0]
-        normalized = normalize_sentiment_result(result)
-
-        return SocialSentimentResponse(
-            text=text,
-            label=normalized.label,
-            confidence=round(normalized.score, 4)
-        )
+        return build_social_response(text, result)
     except Exception as e:
         logger.error(f"Social sentiment inference failed: {e}")
         raise RuntimeError(f"Social sentiment analysis failed: {str(e)}")
@@ -176,38 +280,12 @@ def analyze_emotion(
         EmotionResponse with full emotion distribution
     """
     # Preprocess text
-    cleaned_text = clean_text(text)
-    truncated_text = truncate_text(cleaned_text)
+    truncated_text = prepare_text(text)
 
     # Run inference - returns list of all emotions with scores
     try:
         results = emotion_model(truncated_text)
-
-        # Handle nested list structure from pipeline
-        if results and isinstance(results[0], list):
-            results = results[0]
-
-        # Convert to EmotionScore objects
-        emotions = [
-            EmotionScore(
-                emotion=r["label"],
-                score=round(r["score"], 4)
-            )
-            for r in results
-        ]
-
-        # Sort by score descending
-        emotions.sort(key=lambda x: x.score, reverse=True)
-
-        # Get primary emotion
-        primary = emotions[0] if emotions else EmotionScore(emotion="neutral", score=0.0)
-
-        return EmotionResponse(
-            text=text,
-            emotions=emotions,
-            primary_emotion=primary.emotion,
-            primary_score=primary.score
-        )
+        return build_emotion_response(text, results)
     except Exception as e:
         logger.error(f"Emotion classification failed: {e}")
         raise RuntimeError(f"Emotion analysis failed: {str(e)}")
@@ -240,29 +318,11 @@ def analyze_entities(
         NERResponse with list of detected entities
     """
     # Preprocess text - keep original for offset accuracy
-    cleaned_text = clean_text(text)
-    truncated_text = truncate_text(cleaned_text)
+    truncated_text = prepare_text(text)
 
     try:
         results = ner_model(truncated_text)
-
-        # Convert to NEREntity objects
-        entities = []
-        for r in results:
-            entity = NEREntity(
-                entity=r["word"],
-                entity_type=normalize_entity_type(r["entity_group"]),
-                confidence=round(r["score"], 4),
-                start=r["start"],
-                end=r["end"]
-            )
-            entities.append(entity)
-
-        return NERResponse(
-            text=text,
-            entities=entities,
-            entity_count=len(entities)
-        )
+        return build_ner_response(text, results)
     except Exception as e:
         logger.error(f"NER analysis failed: {e}")
         raise RuntimeError(f"Entity extraction failed: {str(e)}")
@@ -286,7 +346,9 @@ def analyze_full(
     4. Named entity recognition (if model loaded)
 
     Each analysis is performed independently; failures in one
-    don't affect others.
+    don't affect others. In parallel mode (NLP_FULL_ANALYSIS_MODE)
+    the model groups run concurrently, each with its own intra-op
+    thread budget.
 
     Args:
         text: Text to analyze
@@ -296,47 +358,42 @@ def analyze_full(
         FullAnalysisResponse with all available analysis results
     """
     response = FullAnalysisResponse(text=text)
+    tasks = {}
 
     # Financial sentiment (requires both models)
     if registry.finbert and registry.finbert_tone:
-        try:
-            response.finance_sentiment = analyze_finance_sentiment(
-                text=text,
-                finbert=registry.finbert,
-                finbert_tone=registry.finbert_tone,
-            )
-        except Exception as e:
-            logger.error(f"Finance sentiment in full analysis failed: {e}")
+        tasks["finance_sentiment"] = lambda: analyze_finance_sentiment(
+            text=text,
+            finbert=registry.finbert,
+            finbert_tone=registry.finbert_tone,
+        )
 
     # Social sentiment
     if registry.twitter_sentiment:
-        try:
-            response.social_sentiment = analyze_social_sentiment(
-                text=text,
-                twitter_model=registry.twitter_sentiment,
-            )
-        except Exception as e:
-            logger.error(f"Social sentiment in full analysis failed: {e}")
+        tasks["social_sentiment"] = lambda: analyze_social_sentiment(
+            text=text,
+            twitter_model=registry.twitter_sentiment,
+        )
 
     # Emotion classification
     if registry.emotion_classifier:
-        try:
-            response.emotion = analyze_emotion(
-                text=text,
-                emotion_model=registry.emotion_classifier,
-            )
-        except Exception as e:
-            logger.error(f"Emotion analysis in full analysis failed: {e}")
+        tasks["emotion"] = lambda: analyze_emotion(
+            text=text,
+            emotion_model=registry.emotion_classifier,
+        )
 
     # Named entity recognition
     if registry.ner_model:
-        try:
-            response.ner = analyze_entities(
-                text=text,
-                ner_model=registry.ner_model,
-            )
-        except Exception as e:
-            logger.error(f"NER in full analysis failed: {e}")
+        tasks["ner"] = lambda: analyze_entities(
+            text=text,
+            ner_model=registry.ner_model,
+        )
+
+    for field_name, (result, error) in get_group_runner().run(tasks).items():
+        if error is not None:
+            logger.error(f"{field_name} in full analysis failed: {error}")
+            continue
+        setattr(response, field_name, result)
 
     return response
 
@@ -345,6 +402,39 @@ def analyze_full(
 # Batch Processing Services
 # =============================================================================
 
+def first_tokenizer(pipes: list[Any]) -> Optional[Any]:
+    """Tokenizer of the first pipeline that has one, or None."""
+    return next(
+        (pipe.tokenizer for pipe in pipes if getattr(pipe, "tokenizer", None) is not None),
+        None,
+    )
+
+
+def token_lengths(texts: list[str], models: list[Any]) -> list[int]:
+    """
+    Token count per text, for bucketing a batch by length.
+
+    Args:
+        texts: Texts to measure
+        models: Pipelines (or a ModelRegistry); the first tokenizer found
+            is used, else whitespace words plus special tokens
+
+    Returns:
+        One length per text, in input order
+    """
+    pipes = []
+    for model in models:
+        if isinstance(model, ModelRegistry):
+            pipes.extend(getattr(model, key) for key in MODEL_SPECS)
+        else:
+            pipes.append(model)
+
+    tokenizer = first_tokenizer(pipes)
+    if tokenizer is None:
+        return [len(t.split()) + 2 for t in texts]
+    return SharedEncodings(texts).lengths(tokenizer)
+
+
 def batch_finance_sentiment(
     texts: list[str],
     finbert: Pipeline,
@@ -365,7 +455,7 @@ def batch_finance_sentiment(
         BatchFinanceSentimentResponse with results for all texts
     """
     # Preprocess all texts
-    cleaned_texts = [truncate_text(clean_text(t)) for t in texts]
+    cleaned_texts = [prepare_text(t) for t in texts]
 
     # Batch inference for both models
     try:
@@ -381,41 +471,10 @@ def batch_finance_sentiment(
         tone_results = [None] * len(texts)
 
     # Build responses for each text
-    results = []
-    for i, text in enumerate(texts):
-        model_results = []
-
-        # FinBERT result
-        if finbert_results[i] is not None:
-            try:
-                finbert_score = normalize_sentiment_result(finbert_results[i])
-                model_results.append(ModelSentimentResult(
-                    model="ProsusAI/finbert",
-                    sentiment=finbert_score
-                ))
-            except Exception as e:
-                logger.error(f"FinBERT result processing failed for text {i}: {e}")
-
-        # FinBERT-tone result
-        if tone_results[i] is not None:
-            try:
-                tone_score = normalize_sentiment_result(tone_results[i])
-                model_results.append(ModelSentimentResult(
-                    model="yiyanghkust/finbert-tone",
-                    sentiment=tone_score
-                ))
-            except Exception as e:
-                logger.error(f"FinBERT-tone result processing failed for text {i}: {e}")
-
-        # Calculate ensemble
-        sentiment_scores = [m.sentiment for m in model_results]
-        ensemble = calculate_ensemble_score(sentiment_scores)
-
-        results.append(FinanceSentimentResponse(
-            text=text,
-            models=model_results,
-            ensemble=ensemble
-        ))
+    results = [
+        build_finance_response(text, finbert_results[i], tone_results[i])
+        for i, text in enumerate(texts)
+    ]
 
     return BatchFinanceSentimentResponse(
         results=results,
@@ -438,7 +497,7 @@ def batch_social_sentiment(
         BatchSocialSentimentResponse with results for all texts
     """
     # Preprocess all texts
-    cleaned_texts = [truncate_text(clean_text(t)) for t in texts]
+    cleaned_texts = [prepare_text(t) for t in texts]
 
     # Batch inference
     try:
@@ -448,14 +507,10 @@ def batch_social_sentiment(
         raise RuntimeError(f"Batch social sentiment analysis failed: {str(e)}")
 
     # Build responses
-    results = []
-    for i, text in enumerate(texts):
-        normalized = normalize_sentiment_result(raw_results[i])
-        results.append(SocialSentimentResponse(
-            text=text,
-            label=normalized.label,
-            confidence=round(normalized.score, 4)
-        ))
+    results = [
+        build_social_response(text, raw_results[i])
+        for i, text in enumerate(texts)
+    ]
 
     return BatchSocialSentimentResponse(
         results=results,
@@ -478,7 +533,7 @@ def batch_emotion(
         BatchEmotionResponse with results for all texts
     """
     # Preprocess all texts
-    cleaned_texts = [truncate_text(clean_text(t)) for t in texts]
+    cleaned_texts = [prepare_text(t) for t in texts]
 
     # Batch inference
     try:
@@ -488,37 +543,10 @@ def batch_emotion(
         raise RuntimeError(f"Batch emotion analysis failed: {str(e)}")
 
     # Build responses
-    results = []
-    for i, text in enumerate(texts):
-        item_results = raw_results[i]
-
-        # Handle nested list structure
-        if item_results and isinstance(item_results[0], dict):
-            pass  # Already flat list of dicts
-        elif item_results and isinstance(item_results[0], list):
-            item_results = item_results[0]
-
-        # Convert to EmotionScore objects
-        emotions = [
-            EmotionScore(
-                emotion=r["label"],
-                score=round(r["score"], 4)
-            )
-            for r in item_results
-        ]
-
-        # Sort by score descending
-        emotions.sort(key=lambda x: x.score, reverse=True)
-
-        # Get primary emotion
-        primary = emotions[0] if emotions else EmotionScore(emotion="neutral", score=0.0)
-
-        results.append(EmotionResponse(
-            text=text,
-            emotions=emotions,
-            primary_emotion=primary.emotion,
-            primary_score=primary.score
-        ))
+    results = [
+        build_emotion_response(text, raw_results[i])
+        for i, text in enumerate(texts)
+    ]
 
     return BatchEmotionResponse(
         results=results,
@@ -541,7 +569,7 @@ def batch_entities(
         BatchNERResponse with results for all texts
     """
     # Preprocess all texts
-    cleaned_texts = [truncate_text(clean_text(t)) for t in texts]
+    cleaned_texts = [prepare_text(t) for t in texts]
 
     # Batch inference
     try:
@@ -551,27 +579,10 @@ def batch_entities(
         raise RuntimeError(f"Batch entity extraction failed: {str(e)}")
 
     # Build responses
-    results = []
-    for i, text in enumerate(texts):
-        item_results = raw_results[i]
-
-        # Convert to NEREntity objects
-        entities = []
-        for r in item_results:
-            entity = NEREntity(
-                entity=r["word"],
-                entity_type=normalize_entity_type(r["entity_group"]),
-                confidence=round(r["score"], 4),
-                start=r["start"],
-                end=r["end"]
-            )
-            entities.append(entity)
-
-        results.append(NERResponse(
-            text=text,
-            entities=entities,
-            entity_count=len(entities)
-        ))
+    results = [
+        build_ner_response(text, raw_results[i])
+        for i, text in enumerate(texts)
+    ]
 
     return BatchNERResponse(
         results=results,
@@ -579,26 +590,252 @@ def batch_entities(
     )
 
 
-def batch_full_analysis(
+# Sequence-classification models that can consume shared encodings directly.
+# Value: whether the pipeline returns scores for every label (top_k=None).
+SEQUENCE_CLASSIFIERS = {
+    "finbert": False,
+    "finbert_tone": False,
+    "twitter_sentiment": False,
+    "emotion_classifier": True,
+}
+
+
+def classify_encoded(
+    pipe: Pipeline,
+    encoded_batch,
+    all_scores: bool = False,
+) -> list:
+    """
+    Run a text-classification model on pre-tokenized inputs.
+
+    Mirrors the pipeline's postprocessing (softmax, or sigmoid for
+    multi-label / single-logit heads) and output format:
+    - all_scores=False: {"label", "score"} for the top label
+    - all_scores=True: list of {"label", "score"} sorted by score
+
+    Args:
+        pipe: Text-classification pipeline (model and config are used)
+        encoded_batch: Padded tensors from SharedEncodings.batch()
+        all_scores: Return every label's score instead of the top one
+
+    Returns:
+        One result per row, in pipeline output format
+    """
+    model = pipe.model
+    config = model.config
+
+    with torch.inference_mode():
+        inputs = {k: v.to(model.device) for k, v in encoded_batch.items()}
+        logits = model(**inputs).logits
+
+    if config.problem_type == "multi_label_classification" or config.num_labels == 1:
+        probs = logits.sigmoid()
+    else:
+        probs = logits.softmax(dim=-1)
+
+    results = []
+    for row in probs.tolist():
+        scored = [
+            {"label": config.id2label[i], "score": score}
+            for i, score in enumerate(row)
+        ]
+        if all_scores:
+            results.append(sorted(scored, key=lambda r: r["score"], reverse=True))
+        else:
+            results.append(max(scored, key=lambda r: r["score"]))
+    return results
+
+
+def run_model_in_buckets(
+    model_key: str,
+    pipe: Pipeline,
     texts: list[str],
-    registry: ModelRegistry,
-) -> BatchFullAnalysisResponse:
+    buckets: list[list[int]],
+    encodings: SharedEncodings,
+    max_length: Optional[int] = None,
+) -> list:
     """
-    Run comprehensive analysis on multiple texts using all available models.
+    Run one model over all buckets, reusing shared encodings when possible.
 
-    Efficiently batches all model calls for better throughput.
+    Sequence classifiers take padded batches from the request's shared
+    encodings (tokenized once per vocabulary). Other models (NER needs
+    offset mappings for entity aggregation) go through their pipeline.
+
+    Shared encodings are trimmed to `max_length` tokens for this model
+    (the limit the pipeline itself would truncate at).
+
+    The output cache is bypassed; callers look up and store cached outputs
+    themselves and pass buckets holding only the misses.
+
+    Returns:
+        Raw pipeline-format result per text, in input order (None for
+        texts in no bucket)
+    """
+    pipe = unwrap_cached(pipe)
+    tokenizer = getattr(pipe, "tokenizer", None)
+    profile = encodings.profile
+
+    # Wrapped pipelines (e.g. chunked long-text classifiers) expose no model
+    # and must go through their own call path
+    if (
+        model_key not in SEQUENCE_CLASSIFIERS
+        or tokenizer is None
+        or getattr(pipe, "model", None) is None
+    ):
+        start = time.perf_counter()
+        results = run_in_buckets(pipe, texts, buckets)
+        profile.add_forward(model_key, (time.perf_counter() - start) * 1000)
+        return results
+
+    all_scores = SEQUENCE_CLASSIFIERS[model_key]
+    results: list = [None] * len(texts)
+
+    for bucket in buckets:
+        batch = encodings.batch(tokenizer, bucket, max_length=max_length)
+
+        start = time.perf_counter()
+        batch_results = classify_encoded(pipe, batch, all_scores)
+        profile.add_forward(model_key, (time.perf_counter() - start) * 1000)
+
+        for i, result in zip(bucket, batch_results):
+            results[i] = result
+
+    return results
+
+
+def batch_full_analysis_with_stats(
+    texts: list[str],
+    registry: ModelRegistry,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[BatchFullAnalysisResponse, dict]:
+    """
+    Run full analysis with shared tokenization and length-bucketed batching.
+
+    Texts are tokenized once per distinct tokenizer vocabulary and the
+    encodings are shared by every model using that vocabulary. Texts are
+    then sorted into buckets of similar token count and each bucket runs
+    as one padded batch per model, so a long article no longer forces
+    every short tweet in the request to pay its sequence length. Results
+    are restored to input order.
+
+    Identical texts (after cleaning) are analyzed once and each unique
+    text is hashed once; the hashes are shared by every model's cache
+    lookup and store. Each model's cached outputs are looked up first
+    (one cache call per model); only texts a model hasn't seen are
+    tokenized and run through it, and their outputs are cached for every
+    other service. Misses another request is already running through a
+    model are waited for instead of inferred again (single-flight).
 
     Args:
         texts: List of texts to analyze
         registry: ModelRegistry containing all loaded pipelines
+        batch_size: Maximum texts per padded batch
 
     Returns:
-        BatchFullAnalysisResponse with all analysis results for each text
+        Tuple of (BatchFullAnalysisResponse, run stats dict with padding,
+        tokenize-vs-forward timing and cache hits for the request)
     """
     n_texts = len(texts)
 
-    # Preprocess all texts once
-    cleaned_texts = [truncate_text(clean_text(t)) for t in texts]
+    # Preprocess all texts once; duplicates share one slot
+    unique_index: dict[str, int] = {}
+    slots = [unique_index.setdefault(prepare_text(t), len(unique_index)) for t in texts]
+    cleaned_texts = list(unique_index)
+    n_unique = len(cleaned_texts)
+    hashes = hash_model_inputs(cleaned_texts)
+
+    model_keys = [
+        key for key in ("finbert", "finbert_tone", "twitter_sentiment", "emotion_classifier", "ner_model")
+        if getattr(registry, key)
+    ]
+
+    # Per-model output cache: only misses reach a model
+    cached: dict[str, list] = {}
+    misses: dict[str, list[int]] = {}
+    for key in model_keys:
+        pipe = getattr(registry, key)
+        if isinstance(pipe, CachedPipeline):
+            cached[key], misses[key] = pipe.lookup(cleaned_texts, hashes)
+        else:
+            cached[key], misses[key] = [None] * n_unique, list(range(n_unique))
+
+    # Texts at least one model still has to run
+    pending = sorted(set().union(*misses.values())) if misses else []
+    pending_texts = [cleaned_texts[i] for i in pending]
+    encodings = SharedEncodings(
+        pending_texts,
+        max_length=max(registry.max_lengths.values(), default=DEFAULT_MAX_LENGTH),
+    )
+
+    # Bucket by token length using the first available tokenizer
+    reference = None
+    if pending:
+        reference = first_tokenizer([getattr(registry, key) for key in MODEL_SPECS])
+    if reference is not None:
+        lengths = encodings.lengths(reference)
+    else:
+        lengths = [len(t.split()) + 2 for t in pending_texts]
+
+    buckets = bucket_by_length(lengths, batch_size)
+    padding = PaddingStats.from_buckets(lengths, buckets)
+
+    # Same buckets for every model, restricted to that model's misses
+    position = {i: j for j, i in enumerate(pending)}
+    model_buckets: dict[str, list[list[int]]] = {}
+    for key in model_keys:
+        missing = {position[i] for i in misses[key]}
+        model_buckets[key] = [
+            kept for kept in ([j for j in bucket if j in missing] for bucket in buckets) if kept
+        ]
+
+    # Misses another request is already computing (single-flight):
+    # model key -> (flight, [(text index, cache key)] to wait for)
+    followed: dict[str, tuple[Flight, list[tuple[int, str]]]] = {}
+    inferred: dict[str, list[int]] = {}
+
+    def run(model_key: str) -> list:
+        pipe = getattr(registry, model_key)
+        leading = misses[model_key]
+        buckets = model_buckets[model_key]
+        flight = None
+        if isinstance(pipe, CachedPipeline) and leading:
+            keys = dict(zip(leading, pipe.keys_for(
+                [cleaned_texts[i] for i in leading], [hashes[i] for i in leading],
+            )))
+            flight = pipe.begin_flight(list(keys.values()))
+            if flight.following:
+                followed[model_key] = (flight, [
+                    (i, keys[i]) for i in leading if keys[i] in flight.following
+                ])
+                leading = [i for i in leading if keys[i] in flight.leading]
+                kept = {position[i] for i in leading}
+                buckets = [
+                    bucket for bucket in ([j for j in bucket if j in kept] for bucket in buckets) if bucket
+                ]
+        inferred[model_key] = leading
+
+        try:
+            outputs = run_model_in_buckets(
+                model_key, pipe, pending_texts, buckets, encodings,
+                max_length=registry.max_lengths.get(model_key),
+            )
+
+            merged = list(cached[model_key])
+            for i in leading:
+                merged[i] = outputs[position[i]]
+            if isinstance(pipe, CachedPipeline):
+                pipe.store(
+                    [cleaned_texts[i] for i in leading],
+                    [merged[i] for i in leading],
+                    [hashes[i] for i in leading],
+                )
+            if flight is not None:
+                flight.resolve({keys[i]: merged[i] for i in leading})
+        finally:
+            # Followers of anything left unresolved compute it themselves
+            if flight is not None:
+                flight.close()
+        return merged
 
     # Initialize result containers
     finance_results = [None] * n_texts
@@ -606,103 +843,86 @@ def batch_full_analysis(
     emotion_results = [None] * n_texts
     ner_results = [None] * n_texts
 
+    # Encode up front so concurrent tasks only read shared encodings
+    for key in model_keys:
+        tokenizer = getattr(getattr(registry, key), "tokenizer", None)
+        if key in SEQUENCE_CLASSIFIERS and tokenizer is not None and model_buckets[key]:
+            encodings.encode(tokenizer)
+
+    # Independent forward passes (one task per model)
+    runner = get_group_runner()
+    run_start = time.perf_counter()
+    outcomes = runner.run({key: (lambda key=key: run(key)) for key in model_keys})
+    models_wall_ms = (time.perf_counter() - run_start) * 1000
+
+    # Collect outputs other requests computed; waiting only after every
+    # flight this request leads is closed keeps requests from deadlocking
+    coalesced_outputs = 0
+    for key, (flight, waiting) in followed.items():
+        merged, error = outcomes[key]
+        if error is not None:
+            continue
+        values = flight.wait()
+        coalesced_outputs += len(values)
+        for i, cache_key in waiting:
+            merged[i] = values.get(cache_key)
+        left = [i for i, cache_key in waiting if cache_key not in values]
+        if left:
+            try:
+                for i, output in zip(left, getattr(registry, key)([cleaned_texts[i] for i in left])):
+                    merged[i] = output
+            except Exception as e:
+                outcomes[key] = (None, e)
+
+    def raw(key: str) -> list:
+        """Model outputs per input text (duplicates share one output)."""
+        result, error = outcomes[key]
+        if error is not None:
+            raise error
+        return [result[slot] for slot in slots]
+
     # Batch financial sentiment (requires both models)
     if registry.finbert and registry.finbert_tone:
         try:
-            finbert_raw = registry.finbert(cleaned_texts)
-            tone_raw = registry.finbert_tone(cleaned_texts)
-
-            for i, text in enumerate(texts):
-                model_results = []
-
-                try:
-                    finbert_score = normalize_sentiment_result(finbert_raw[i])
-                    model_results.append(ModelSentimentResult(
-                        model="ProsusAI/finbert",
-                        sentiment=finbert_score
-                    ))
-                except Exception:
-                    pass
-
-                try:
-                    tone_score = normalize_sentiment_result(tone_raw[i])
-                    model_results.append(ModelSentimentResult(
-                        model="yiyanghkust/finbert-tone",
-                        sentiment=tone_score
-                    ))
-                except Exception:
-                    pass
-
-                sentiment_scores = [m.sentiment for m in model_results]
-                ensemble = calculate_ensemble_score(sentiment_scores)
-
-                finance_results[i] = FinanceSentimentResponse(
-                    text=text,
-                    models=model_results,
-                    ensemble=ensemble
-                )
+            finbert_raw = raw("finbert")
+            tone_raw = raw("finbert_tone")
+            finance_results = [
+                build_finance_response(text, finbert_raw[i], tone_raw[i])
+                for i, text in enumerate(texts)
+            ]
         except Exception as e:
             logger.error(f"Batch finance sentiment failed: {e}")
 
     # Batch social sentiment
     if registry.twitter_sentiment:
         try:
-            twitter_raw = registry.twitter_sentiment(cleaned_texts)
-            for i, text in enumerate(texts):
-                normalized = normalize_sentiment_result(twitter_raw[i])
-                social_results[i] = SocialSentimentResponse(
-                    text=text,
-                    label=normalized.label,
-                    confidence=round(normalized.score, 4)
-                )
+            twitter_raw = raw("twitter_sentiment")
+            social_results = [
+                build_social_response(text, twitter_raw[i])
+                for i, text in enumerate(texts)
+            ]
         except Exception as e:
             logger.error(f"Batch social sentiment failed: {e}")
 
     # Batch emotion classification
     if registry.emotion_classifier:
         try:
-            emotion_raw = registry.emotion_classifier(cleaned_texts)
-            for i, text in enumerate(texts):
-                item_results = emotion_raw[i]
-                if item_results and isinstance(item_results[0], list):
-                    item_results = item_results[0]
-
-                emotions = [
-                    EmotionScore(emotion=r["label"], score=round(r["score"], 4))
-                    for r in item_results
-                ]
-                emotions.sort(key=lambda x: x.score, reverse=True)
-                primary = emotions[0] if emotions else EmotionScore(emotion="neutral", score=0.0)
-
-                emotion_results[i] = EmotionResponse(
-                    text=text,
-                    emotions=emotions,
-                    primary_emotion=primary.emotion,
-                    primary_score=primary.score
-                )
+            emotion_raw = raw("emotion_classifier")
+            emotion_results = [
+                build_emotion_response(text, emotion_raw[i])
+                for i, text in enumerate(texts)
+            ]
         except Exception as e:
             logger.error(f"Batch emotion classification failed: {e}")
 
     # Batch NER
     if registry.ner_model:
         try:
-            ner_raw = registry.ner_model(cleaned_texts)
-            for i, text in enumerate(texts):
-                entities = [
-                    NEREntity(
-                        entity=r["word"],
-                        entity_type=normalize_entity_type(r["entity_group"]),
-                        confidence=round(r["score"], 4),
-                        start=r["start"],
-                        end=r["end"]
-                    )
-                    for r in ner_raw[i]
-                ]
-                ner_results[i] = NERResponse(
-                    text=text,
-                    entities=entities,
-                    entity_count=len(entities)
-                )
+            ner_raw = raw("ner_model")
+            ner_results = [
+                build_ner_response(text, ner_raw[i])
+                for i, text in enumerate(texts)
+            ]
         except Exception as e:
             logger.error(f"Batch NER failed: {e}")
 
@@ -717,7 +937,127 @@ def batch_full_analysis(
             ner=ner_results[i]
         ))
 
+    profile = encodings.profile
+    pending_slots = set(pending)
+    cached_texts = sum(1 for slot in slots if slot not in pending_slots)
+    logger.info(
+        f"Batch full analysis: {n_texts} texts ({n_unique} unique, {cached_texts} fully cached) "
+        f"in {len(buckets)} length buckets, "
+        f"{padding.tokens_processed} tokens processed, {padding.tokens_padded} padded, "
+        f"tokenize={profile.tokenize_ms:.1f}ms, forward={sum(profile.forward_ms.values()):.1f}ms"
+    )
+
     return BatchFullAnalysisResponse(
         results=results,
         count=len(results)
+    ), {
+        **padding.to_dict(),
+        **profile.to_dict(),
+        "full_analysis_mode": runner.mode,
+        "models_wall_ms": round(models_wall_ms, 2),
+        "cached_texts": cached_texts,
+        "cached_outputs": sum(n_unique - len(missing) for missing in misses.values()),
+        "unique_texts": n_unique,
+        "duplicate_texts": n_texts - n_unique,
+        "inferred_texts": len(set().union(*inferred.values())) if inferred else 0,
+        "coalesced_outputs": coalesced_outputs,
+    }
+
+
+def batch_full_analysis(
+    texts: list[str],
+    registry: ModelRegistry,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> BatchFullAnalysisResponse:
+    """
+    Run comprehensive analysis on multiple texts using all available models.
+
+    Efficiently batches all model calls for better throughput, sharing
+    tokenization across models and bucketing texts by token length to
+    minimize padding.
+
+    Args:
+        texts: List of texts to analyze
+        registry: ModelRegistry containing all loaded pipelines
+        batch_size: Maximum texts per padded batch
+
+    Returns:
+        BatchFullAnalysisResponse with all analysis results for each text
+    """
+    response, _ = batch_full_analysis_with_stats(texts, registry, batch_size)
+    return response
+
+
+# =============================================================================
+# Micro-batched Single-Text Services
+# =============================================================================
+#
+# Async variants of the single-text services. Each pipeline call goes through
+# the registry's MicroBatcher, which coalesces concurrent requests into one
+# padded forward pass. Response schemas are identical to the sync services.
+
+async def analyze_finance_sentiment_batched(
+    text: str,
+    registry: ModelRegistry,
+) -> FinanceSentimentResponse:
+    """
+    Micro-batched financial sentiment analysis (FinBERT ensemble).
+
+    Both FinBERT models are queued concurrently; a failure in one model
+    is logged and the ensemble uses the remaining result.
+    """
+    truncated_text = prepare_text(text)
+
+    finbert_raw, tone_raw = await asyncio.gather(
+        registry.get_batcher("finbert").submit(truncated_text),
+        registry.get_batcher("finbert_tone").submit(truncated_text),
+        return_exceptions=True,
     )
+
+    if isinstance(finbert_raw, Exception):
+        logger.error(f"FinBERT inference failed: {finbert_raw}")
+        finbert_raw = None
+    if isinstance(tone_raw, Exception):
+        logger.error(f"FinBERT-tone inference failed: {tone_raw}")
+        tone_raw = None
+
+    return build_finance_response(text, finbert_raw, tone_raw)
+
+
+async def analyze_social_sentiment_batched(
+    text: str,
+    registry: ModelRegistry,
+) -> SocialSentimentResponse:
+    """Micro-batched social sentiment analysis (Twitter RoBERTa)."""
+    try:
+        result = await registry.get_batcher("twitter_sentiment").submit(prepare_text(text))
+        return build_social_response(text, result)
+    except Exception as e:
+        logger.error(f"Social sentiment inference failed: {e}")
+        raise RuntimeError(f"Social sentiment analysis failed: {str(e)}")
+
+
+async def analyze_emotion_batched(
+    text: str,
+    registry: ModelRegistry,
+) -> EmotionResponse:
+    """Micro-batched emotion classification."""
+    try:
+        results = await registry.get_batcher("emotion_classifier").submit(prepare_text(text))
+        return build_emotion_response(text, results)
+    except Exception as e:
+        logger.error(f"Emotion classification failed: {e}")
+        raise RuntimeError(f"Emotion analysis failed: {str(e)}")
+
+
+async def analyze_entities_batched(
+    text: str,
+    registry: ModelRegistry,
+) -> NERResponse:
+    """Micro-batched named entity recognition."""
+    try:
+        results = await registry.get_batcher("ner_model").submit(prepare_text(text))
+        return build_ner_response(text, results)
+    except Exception as e:
+        logger.error(f"NER analysis failed: {e}")
+        raise RuntimeError(f"Entity extraction failed: {str(e)}")
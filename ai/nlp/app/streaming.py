@@ -7,15 +7,63 @@ analysis updates. Each model's progress and results are streamed as they complet
 Usage:
 - Connect to /stream/analyze with EventSource in JavaScript
 - Receive events: start, progress, model_complete, complete, error
+
+Single-text streams launch every model at once on the inference executor
+and emit model_complete in completion order, so the first result arrives
+after the fastest model rather than after every model queued before it.
+Time to first result (start -> first model_complete) and total stream
+time are tracked per stream kind (get_streaming_stats).
+
+Batch streams (/stream/batch) are pipelined: texts are taken in sub-batches
+and each model runs once per sub-batch (all models of a sub-batch in
+parallel on the inference executor), while the next sub-batch is already
+queued. Each text's events are still sent together, texts in input order
+(events also carry text_index).
+
+SSE endpoints poll the client connection while a stream waits on
+inference (close_on_disconnect): once the client is gone the stream is
+closed, its queued model calls are cancelled before they reach a worker
+and no further sub-batches are launched. Abandoned model calls are
+counted per stream kind as cancelled_work_units (the executor's lane
+"cancelled" count is the subset that never ran).
+
+WebSocket clients (/ws/analyze) get the same events through
+AnalysisChannel: one connection carries many requests, tagged with
+client-chosen ids, with bounded buffering and per-request cancellation.
+
+Configuration (env):
+- NLP_SSE_SUB_BATCH: texts per model call in batch streams (default: 8)
+- NLP_SSE_DISCONNECT_POLL_MS: client disconnect check interval while a
+  stream waits on inference (default: 250)
+- NLP_WS_MAX_REQUESTS: concurrent requests per WebSocket (default: 8)
+- NLP_WS_SEND_QUEUE: outgoing messages buffered per WebSocket (default: 256)
 """
 
 import json
 import logging
 import asyncio
-from typing import AsyncGenerator, Optional
+import os
+import time
+from collections import deque
+from typing import (
+    Any, AsyncGenerator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple,
+)
+
+from pydantic import ValidationError
 
+from app.core.admission import (
+    DEADLINE_HEADER,
+    STREAM_CLASS,
+    AdmissionRejected,
+    get_admission_controller,
+    parse_deadline_ms,
+)
+from app.core.executor import STREAMING_LANE, percentile, run_inference
+from app.core.serialization import dumps_str
 from app.models import ModelRegistry
 from app.schemas import (
+    StreamAnalysisRequest,
+    StreamBatchRequest,
     FinanceSentimentResponse,
     SocialSentimentResponse,
     EmotionResponse,
@@ -29,12 +77,91 @@ from app.utils import (
     normalize_sentiment_result,
     calculate_ensemble_score,
     normalize_entity_type,
-    clean_text,
-    truncate_text,
+)
+from app.services import (
+    prepare_text,
+    batch_finance_sentiment,
+    batch_social_sentiment,
+    batch_emotion,
+    batch_entities,
 )
 
 logger = logging.getLogger(__name__)
 
+# Texts per model call in stream_batch_analysis
+DEFAULT_SUB_BATCH_SIZE = 8
+
+# Stream model name -> FullAnalysisResponse field (also the event result_type)
+RESULT_TYPES = {
+    "finance": "finance_sentiment",
+    "social": "social_sentiment",
+    "emotion": "emotion",
+    "ner": "ner",
+}
+
+# Client disconnect check interval while a stream waits on inference
+DEFAULT_DISCONNECT_POLL_MS = 250
+
+# Recent streams kept for latency percentiles
+LATENCY_WINDOW = 1024
+
+# WebSocket channel defaults
+DEFAULT_WS_MAX_REQUESTS = 8
+DEFAULT_WS_SEND_QUEUE = 256
+
+
+class _StreamLatency:
+    """Time to first result and total time for one kind of stream."""
+
+    def __init__(self) -> None:
+        self.streams = 0
+        self.completed = 0
+        # Model calls abandoned by streams closed early: queued, running
+        # (result discarded) or never launched
+        self.cancelled_work_units = 0
+        self.first_result_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.total_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> Dict[str, Any]:
+        first = sorted(self.first_result_ms)
+        total = sorted(self.total_ms)
+        return {
+            "streams": self.streams,
+            "completed": self.completed,
+            "cancelled_work_units": self.cancelled_work_units,
+            "p50_first_result_ms": round(percentile(first, 50), 2),
+            "p99_first_result_ms": round(percentile(first, 99), 2),
+            "p50_total_ms": round(percentile(total, 50), 2),
+            "p99_total_ms": round(percentile(total, 99), 2),
+        }
+
+
+# Updated from the event loop only
+_latency = {"single": _StreamLatency(), "batch": _StreamLatency()}
+_sse_stats = {"disconnects": 0}
+_ws_stats = {
+    "connections": 0,
+    "open_connections": 0,
+    "requests": 0,
+    "completed": 0,
+    "cancelled": 0,
+    "rejected": 0,
+}
+
+
+def get_streaming_stats() -> Dict[str, Any]:
+    """Per stream kind: time to first model_complete, total stream time
+    and cancelled work; SSE disconnects; WebSocket channel counters."""
+    return {
+        **{kind: latency.to_dict() for kind, latency in _latency.items()},
+        "sse": dict(_sse_stats),
+        "websocket": dict(_ws_stats),
+    }
+
+
+# (event name, payload)
+Event = Tuple[str, Dict[str, Any]]
+
 
 def format_sse(event: str, data: dict) -> str:
     """
@@ -47,22 +174,24 @@ def format_sse(event: str, data: dict) -> str:
     Returns:
         SSE formatted string
     """
-    json_data = json.dumps(data, default=str)
+    json_data = dumps_str(data)
     return f"event: {event}\ndata: {json_data}\n\n"
 
 
-async def stream_single_analysis(
+async def single_analysis_events(
     text: str,
     registry: ModelRegistry,
     selected_models: Optional[list[str]] = None,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[Event, None]:
     """
-    Stream analysis results for a single text as SSE events.
+    Analysis events for a single text, as (event, data) pairs.
+
+    All models start at once; results are emitted as each one finishes.
 
     Yields events in order:
     1. start - Analysis beginning
     2. progress - Each model starting
-    3. model_complete - Each model finishing with results
+    3. model_complete - Each model finishing with results (completion order)
     4. complete - All analysis done with full results
 
     Args:
@@ -71,8 +200,12 @@ async def stream_single_analysis(
         selected_models: Optional list of models to run (finance, social, emotion, ner)
 
     Yields:
-        SSE formatted strings
+        (event name, payload) tuples
     """
+    started_at = time.perf_counter()
+    latency = _latency["single"]
+    latency.streams += 1
+
     # Determine which models to run
     all_models = ["finance", "social", "emotion", "ner"]
     if selected_models:
@@ -81,137 +214,106 @@ async def stream_single_analysis(
         models_to_run = all_models
 
     total_steps = len(models_to_run)
-    current_step = 0
 
     # Preprocess text
-    cleaned_text = truncate_text(clean_text(text))
-
-    # Initialize results
-    finance_result = None
-    social_result = None
-    emotion_result = None
-    ner_result = None
+    cleaned_text = prepare_text(text)
 
     # Send start event
-    yield format_sse("start", {
+    yield ("start", {
         "text": text[:100] + "..." if len(text) > 100 else text,
         "models": models_to_run,
         "total_steps": total_steps,
     })
 
-    # Small delay to ensure client receives start event
-    await asyncio.sleep(0.05)
-
-    # Process each model
-    for model_name in models_to_run:
-        current_step += 1
-
-        # Send progress event
-        yield format_sse("progress", {
-            "model": model_name,
-            "step": current_step,
-            "total_steps": total_steps,
-            "status": f"Processing {model_name}...",
-        })
-        await asyncio.sleep(0.01)
-
+    async def run_model(model_name: str) -> tuple:
+        """(model name, result or None, error or None)"""
         try:
-            if model_name == "finance" and registry.finbert and registry.finbert_tone:
-                # Financial sentiment
-                finance_result = await asyncio.to_thread(
-                    _run_finance_sentiment, text, cleaned_text, registry
-                )
-                yield format_sse("model_complete", {
-                    "model": "finance",
-                    "result_type": "finance_sentiment",
-                    "result": finance_result.model_dump(),
-                    "step": current_step,
-                    "total_steps": total_steps,
-                })
-
-            elif model_name == "social" and registry.twitter_sentiment:
-                # Social sentiment
-                social_result = await asyncio.to_thread(
-                    _run_social_sentiment, text, cleaned_text, registry
-                )
-                yield format_sse("model_complete", {
-                    "model": "social",
-                    "result_type": "social_sentiment",
-                    "result": social_result.model_dump(),
-                    "step": current_step,
-                    "total_steps": total_steps,
-                })
+            result = await run_inference(
+                _SINGLE_RUNNERS[model_name], text, cleaned_text, registry,
+                lane=STREAMING_LANE,
+            )
+            return model_name, result, None
+        except Exception as e:
+            return model_name, None, e
 
-            elif model_name == "emotion" and registry.emotion_classifier:
-                # Emotion classification
-                emotion_result = await asyncio.to_thread(
-                    _run_emotion, text, cleaned_text, registry
-                )
-                yield format_sse("model_complete", {
-                    "model": "emotion",
-                    "result_type": "emotion",
-                    "result": emotion_result.model_dump(),
-                    "step": current_step,
-                    "total_steps": total_steps,
-                })
+    # Launch every available model before reporting progress
+    tasks = [
+        asyncio.ensure_future(run_model(model_name))
+        for model_name in models_to_run
+        if _model_available(model_name, registry)
+    ]
 
-            elif model_name == "ner" and registry.ner_model:
-                # Named entity recognition
-                ner_result = await asyncio.to_thread(
-                    _run_ner, text, cleaned_text, registry
-                )
-                yield format_sse("model_complete", {
-                    "model": "ner",
-                    "result_type": "ner",
-                    "result": ner_result.model_dump(),
-                    "step": current_step,
-                    "total_steps": total_steps,
+    results: Dict[str, Any] = {}
+    try:
+        for step, model_name in enumerate(models_to_run, start=1):
+            yield ("progress", {
+                "model": model_name,
+                "step": step,
+                "total_steps": total_steps,
+                "status": f"Processing {model_name}...",
+            })
+            if not _model_available(model_name, registry):
+                yield ("error", {
+                    "model": model_name,
+                    "error": f"Model '{model_name}' not available",
                 })
 
-            else:
-                # Model not available
-                yield format_sse("error", {
+        for next_done in asyncio.as_completed(tasks):
+            model_name, result, error = await next_done
+            if error is not None:
+                logger.error(f"Streaming error for {model_name}: {error}")
+                yield ("error", {
                     "model": model_name,
-                    "error": f"Model '{model_name}' not available",
+                    "error": str(error),
                 })
+                continue
 
-        except Exception as e:
-            logger.error(f"Streaming error for {model_name}: {e}")
-            yield format_sse("error", {
+            if not results:
+                latency.first_result_ms.append((time.perf_counter() - started_at) * 1000)
+            results[RESULT_TYPES[model_name]] = result
+            yield ("model_complete", {
                 "model": model_name,
-                "error": str(e),
+                "result_type": RESULT_TYPES[model_name],
+                "result": result.model_dump(),
+                "step": models_to_run.index(model_name) + 1,
+                "total_steps": total_steps,
             })
-
-        # Small delay between models
-        await asyncio.sleep(0.01)
+    finally:
+        # Client went away: drop models that haven't started
+        latency.cancelled_work_units += sum(task.cancel() for task in tasks)
 
     # Send complete event with full results
-    full_result = FullAnalysisResponse(
-        text=text,
-        finance_sentiment=finance_result,
-        social_sentiment=social_result,
-        emotion=emotion_result,
-        ner=ner_result,
-    )
+    full_result = FullAnalysisResponse(text=text, **results)
 
-    yield format_sse("complete", {
+    yield ("complete", {
         "full_result": full_result.model_dump(),
     })
+    latency.completed += 1
+    latency.total_ms.append((time.perf_counter() - started_at) * 1000)
 
 
-async def stream_batch_analysis(
+async def batch_analysis_events(
     texts: list[str],
     registry: ModelRegistry,
     selected_models: Optional[list[str]] = None,
-) -> AsyncGenerator[str, None]:
+    sub_batch_size: Optional[int] = None,
+) -> AsyncGenerator[Event, None]:
     """
-    Stream analysis results for multiple texts as SSE events.
+    Analysis events for multiple texts, as (event, data) pairs.
+
+    Texts are analyzed in sub-batches: one call per model per sub-batch,
+    the models of a sub-batch running concurrently, with the next
+    sub-batch queued behind it. Each text's events are sent together,
+    texts in input order: text_start, start, progress, model_complete,
+    complete, text_complete. The first text of a sub-batch gets its
+    model_complete events as each model finishes; the others follow once
+    the whole sub-batch is done.
 
-    Yields events for each text:
+    Yields events:
     1. batch_start - Batch beginning
     2. text_start - Each text starting
-    3. progress - Model progress for current text
-    4. model_complete - Model results
+    3. progress - Model progress for a text
+    4. model_complete - Model results for a text
     5. text_complete - Text finished
     6. batch_complete - All texts done
 
@@ -219,11 +321,17 @@ async def stream_batch_analysis(
         texts: List of texts to analyze
         registry: ModelRegistry with loaded models
         selected_models: Optional list of models to run
+        sub_batch_size: Texts per model call (default: NLP_SSE_SUB_BATCH)
 
     Yields:
-        SSE formatted strings
+        (event name, payload) tuples
     """
+    started_at = time.perf_counter()
+    latency = _latency["batch"]
+    latency.streams += 1
+
     total_texts = len(texts)
+    sub_batch_size = sub_batch_size or int(os.getenv("NLP_SSE_SUB_BATCH", DEFAULT_SUB_BATCH_SIZE))
 
     # Determine models to run
     all_models = ["finance", "social", "emotion", "ner"]
@@ -231,59 +339,417 @@ async def stream_batch_analysis(
         models_to_run = [m for m in selected_models if m in all_models]
     else:
         models_to_run = all_models
+    available = [m for m in models_to_run if _model_available(m, registry)]
+    total_steps = len(models_to_run)
+
+    launched = 0  # texts whose sub-batch has been queued
+
+    def launch(first: int) -> Dict[asyncio.Task, str]:
+        """Queue every model's call for the sub-batch starting at `first`."""
+        nonlocal launched
+        if first >= total_texts:
+            return {}
+        batch = texts[first:first + sub_batch_size]
+        launched = first + len(batch)
+        return {
+            asyncio.ensure_future(run_inference(
+                _run_model_batch, model_name, batch, registry,
+                lane=STREAMING_LANE,
+            )): model_name
+            for model_name in available
+        }
 
     # Send batch start
-    yield format_sse("batch_start", {
+    yield ("batch_start", {
         "total_texts": total_texts,
         "models": models_to_run,
     })
-    await asyncio.sleep(0.05)
 
     all_results = []
+    first_result_seen = False
+    pending = launch(0)
+    running: Dict[asyncio.Task, str] = {}
+
+    try:
+        for first in range(0, total_texts, sub_batch_size):
+            batch = texts[first:first + sub_batch_size]
+            running, pending = pending, launch(first + sub_batch_size)
+
+            # Each text's events are contiguous, texts in input order: the
+            # sub-batch's first text streams as its models finish, the rest
+            # are buffered and flushed behind it (their results come from
+            # the same model calls, so none of them arrives later)
+            blocks: List[List[Event]] = [[] for _ in batch]
+            for offset, text in enumerate(batch):
+                text_idx = first + offset
+                blocks[offset].append(("text_start", {
+                    "text_index": text_idx,
+                    "total_texts": total_texts,
+                    "text_preview": text[:50] + "..." if len(text) > 50 else text,
+                }))
+                blocks[offset].append(("start", {
+                    "text": text[:100] + "..." if len(text) > 100 else text,
+                    "models": models_to_run,
+                    "total_steps": total_steps,
+                    "text_index": text_idx,
+                }))
+                for step, model_name in enumerate(models_to_run, start=1):
+                    blocks[offset].append(("progress", {
+                        "model": model_name,
+                        "step": step,
+                        "total_steps": total_steps,
+                        "status": f"Processing {model_name}...",
+                        "text_index": text_idx,
+                    }))
+                    if model_name not in available:
+                        blocks[offset].append(("error", {
+                            "model": model_name,
+                            "error": f"Model '{model_name}' not available",
+                            "text_index": text_idx,
+                        }))
+
+            # Record each model's results as soon as its sub-batch call finishes
+            results: Dict[str, list] = {}
+            waiting = set(running)
+            while True:
+                for event in blocks[0]:
+                    yield event
+                blocks[0].clear()
+                if not waiting:
+                    break
+
+                done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: models_to_run.index(running[t])):
+                    model_name = running[task]
+                    step = models_to_run.index(model_name) + 1
+                    try:
+                        results[model_name] = task.result()
+                    except Exception as e:
+                        logger.error(f"Streaming error for {model_name}: {e}")
+                        for offset in range(len(batch)):
+                            blocks[offset].append(("error", {
+                                "model": model_name,
+                                "error": str(e),
+                                "text_index": first + offset,
+                            }))
+                        continue
+
+                    if not first_result_seen:
+                        first_result_seen = True
+                        latency.first_result_ms.append((time.perf_counter() - started_at) * 1000)
+                    for offset, result in enumerate(results[model_name]):
+                        blocks[offset].append(("model_complete", {
+                            "model": model_name,
+                            "result_type": RESULT_TYPES[model_name],
+                            "result": result.model_dump(),
+                            "step": step,
+                            "total_steps": total_steps,
+                            "text_index": first + offset,
+                        }))
+
+            for offset, text in enumerate(batch):
+                full_result = FullAnalysisResponse(
+                    text=text,
+                    **{RESULT_TYPES[m]: model_results[offset] for m, model_results in results.items()},
+                )
+                all_results.append(full_result)
+                blocks[offset].append(("complete", {
+                    "full_result": full_result.model_dump(),
+                    "text_index": first + offset,
+                }))
+                blocks[offset].append(("text_complete", {
+                    "text_index": first + offset,
+                    "total_texts": total_texts,
+                }))
+                for event in blocks[offset]:
+                    yield event
+
+    finally:
+        # Client went away: drop queued sub-batch calls and never launch the rest
+        dropped = sum(task.cancel() for task in (*running, *pending))
+        unlaunched = -(-(total_texts - launched) // sub_batch_size)
+        latency.cancelled_work_units += dropped + unlaunched * len(available)
 
-    for text_idx, text in enumerate(texts):
-        # Send text start
-        yield format_sse("text_start", {
-            "text_index": text_idx,
-            "total_texts": total_texts,
-            "text_preview": text[:50] + "..." if len(text) > 50 else text,
-        })
-        await asyncio.sleep(0.01)
-
-        # Stream individual text analysis
-        text_result = None
-        async for event in stream_single_analysis(text, registry, selected_models):
-            # Forward events with text index
+    # Send batch complete
+    yield ("batch_complete", {
+        "total_texts": total_texts,
+        "results": [r.model_dump() for r in all_results],
+    })
+    latency.completed += 1
+    latency.total_ms.append((time.perf_counter() - started_at) * 1000)
+
+
+async def close_on_disconnect(
+    events: AsyncGenerator[Event, None],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    poll_interval: Optional[float] = None,
+) -> AsyncGenerator[Event, None]:
+    """
+    Relay events until the client disconnects.
+
+    A closed connection is otherwise only noticed when the next write
+    fails, which for a stream waiting on inference can be the end of the
+    stream. While the next event is pending, is_disconnected() is checked
+    every poll_interval seconds; on disconnect the source is cancelled
+    mid-wait, which drops its queued model calls.
+
+    Args:
+        events: Event source (closed when the relay ends)
+        is_disconnected: Async check, e.g. Request.is_disconnected
+        poll_interval: Seconds between checks (default: NLP_SSE_DISCONNECT_POLL_MS)
+    """
+    interval = poll_interval if poll_interval is not None else float(
+        os.getenv("NLP_SSE_DISCONNECT_POLL_MS", DEFAULT_DISCONNECT_POLL_MS)
+    ) / 1000
+
+    try:
+        while True:
+            next_event = asyncio.ensure_future(anext(events))
+            try:
+                while not next_event.done():
+                    await asyncio.wait({next_event}, timeout=interval)
+                    if not next_event.done() and await is_disconnected():
+                        _sse_stats["disconnects"] += 1
+                        logger.info("Stream client disconnected, cancelling remaining inference")
+                        return
+            finally:
+                if not next_event.done():
+                    next_event.cancel()
+                    await asyncio.gather(next_event, return_exceptions=True)
+
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                return
             yield event
+    finally:
+        await events.aclose()
 
-            # Capture complete event
-            if '"event": "complete"' in event or 'event: complete' in event:
-                # Parse result from complete event
-                pass
 
-        # Build result for this text
-        cleaned_text = truncate_text(clean_text(text))
-        result = await asyncio.to_thread(
-            _build_full_result, text, cleaned_text, registry, models_to_run
+async def _sse(
+    events: AsyncGenerator[Event, None],
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncGenerator[str, None]:
+    """Format events as SSE, closing the source when the client goes away."""
+    if is_disconnected is not None:
+        events = close_on_disconnect(events, is_disconnected)
+    try:
+        async for event, data in events:
+            yield format_sse(event, data)
+    finally:
+        await events.aclose()
+
+
+def stream_single_analysis(
+    text: str,
+    registry: ModelRegistry,
+    selected_models: Optional[list[str]] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Stream analysis results for a single text as SSE events.
+
+    Events: start, progress (per model), model_complete (per model, in
+    completion order), error, complete. See single_analysis_events.
+    With is_disconnected (e.g. Request.is_disconnected), models still
+    queued are cancelled as soon as the client goes away.
+    """
+    events = single_analysis_events(text, registry, selected_models)
+    return _sse(events, is_disconnected)
+
+
+def stream_batch_analysis(
+    texts: list[str],
+    registry: ModelRegistry,
+    selected_models: Optional[list[str]] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Stream analysis results for multiple texts as SSE events.
+
+    Events: batch_start, then per text text_start, start, progress,
+    model_complete, complete, text_complete, then batch_complete. See
+    batch_analysis_events. With is_disconnected (e.g.
+    Request.is_disconnected), queued and remaining sub-batches are
+    dropped as soon as the client goes away.
+    """
+    events = batch_analysis_events(texts, registry, selected_models)
+    return _sse(events, is_disconnected)
+
+
+# =============================================================================
+# WebSocket Channel
+# =============================================================================
+
+class AnalysisChannel:
+    """
+    Many analysis requests multiplexed over one WebSocket connection.
+
+    Client messages (JSON text frames):
+    - {"type": "analyze", "id": "a1", "text": "...", "models": [...]}
+    - {"type": "batch", "id": "b1", "texts": ["...", ...], "models": [...]}
+    - {"type": "cancel", "id": "a1"}
+    analyze/batch accept an optional "deadline_ms" (as X-Deadline-Ms).
+
+    Server messages: {"id": "a1", "event": "...", "data": {...}} carrying
+    the /stream/analyze and /stream/batch events. A request ends with
+    complete / batch_complete, error, or cancelled.
+
+    Back-pressure: outgoing messages pass through a bounded queue, so a
+    slow reader pauses its request streams (and the inference they would
+    queue). At most max_requests run at once; each holds a stream
+    admission slot. Cancelled requests and closed connections drop their
+    queued inference.
+
+    Args:
+        websocket: Accepted connection (receive_text / send_text)
+        registry: ModelRegistry with loaded models
+        max_requests: Concurrent requests (default: NLP_WS_MAX_REQUESTS)
+        send_queue: Buffered outgoing messages (default: NLP_WS_SEND_QUEUE)
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        registry: ModelRegistry,
+        max_requests: Optional[int] = None,
+        send_queue: Optional[int] = None,
+    ):
+        self._websocket = websocket
+        self._registry = registry
+        self._max_requests = max_requests or int(
+            os.getenv("NLP_WS_MAX_REQUESTS", DEFAULT_WS_MAX_REQUESTS)
         )
-        all_results.append(result)
+        self._outbox: asyncio.Queue = asyncio.Queue(
+            maxsize=send_queue or int(os.getenv("NLP_WS_SEND_QUEUE", DEFAULT_WS_SEND_QUEUE))
+        )
+        self._requests: Dict[Any, asyncio.Task] = {}
+
+    async def run(self) -> None:
+        """Serve the connection. Returns (or raises the disconnect) once
+        the client goes away, with every request stopped."""
+        _ws_stats["connections"] += 1
+        _ws_stats["open_connections"] += 1
+        sender = asyncio.ensure_future(self._send_loop())
+        try:
+            while True:
+                await self._handle(await self._websocket.receive_text())
+        finally:
+            tasks = list(self._requests.values())
+            for task in (*tasks, sender):
+                task.cancel()
+            await asyncio.gather(*tasks, sender, return_exceptions=True)
+            _ws_stats["open_connections"] -= 1
+
+    async def _send_loop(self) -> None:
+        while True:
+            message = await self._outbox.get()
+            await self._websocket.send_text(dumps_str(message))
+
+    async def _send(self, request_id: Any, event: str, data: Dict[str, Any]) -> None:
+        """Queue a message, waiting while the client is behind."""
+        await self._outbox.put({"id": request_id, "event": event, "data": data})
+
+    async def _handle(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            await self._send(None, "error", {"error": "Message must be a JSON object"})
+            return
+
+        kind = message.get("type")
+        request_id = message.get("id")
+
+        if kind == "cancel":
+            task = self._requests.get(request_id)
+            if task is not None:
+                task.cancel()
+            return
+        if kind not in ("analyze", "batch"):
+            await self._send(request_id, "error", {"error": f"Unknown message type '{kind}'"})
+            return
+        if not isinstance(request_id, (str, int)) or isinstance(request_id, bool):
+            await self._send(None, "error", {"error": "Requests need a string or integer 'id'"})
+            return
+        if request_id in self._requests:
+            await self._send(request_id, "error", {"error": f"Request '{request_id}' is already running"})
+            return
+        if len(self._requests) >= self._max_requests:
+            _ws_stats["rejected"] += 1
+            await self._send(request_id, "error", {
+                "error": f"Too many requests in flight (max {self._max_requests})",
+            })
+            return
 
-        # Send text complete
-        yield format_sse("text_complete", {
-            "text_index": text_idx,
-            "total_texts": total_texts,
-        })
-        await asyncio.sleep(0.01)
+        try:
+            if kind == "analyze":
+                body = StreamAnalysisRequest(text=message.get("text"), models=message.get("models"))
+                texts = [body.text]
+            else:
+                body = StreamBatchRequest(texts=message.get("texts"), models=message.get("models"))
+                texts = body.texts
+        except ValidationError as e:
+            await self._send(request_id, "error", {"error": "Invalid request", "detail": str(e)})
+            return
+
+        deadline_ms = message.get("deadline_ms")
+        if deadline_ms is not None:
+            deadline_ms = parse_deadline_ms({DEADLINE_HEADER: str(deadline_ms)})
+
+        _ws_stats["requests"] += 1
+        self._requests[request_id] = asyncio.ensure_future(
+            self._serve(request_id, kind, texts, body.models, deadline_ms)
+        )
 
-    # Send batch complete
-    yield format_sse("batch_complete", {
-        "total_texts": total_texts,
-        "results": [r.model_dump() for r in all_results],
-    })
+    async def _serve(
+        self,
+        request_id: Any,
+        kind: str,
+        texts: List[str],
+        models: Optional[List[str]],
+        deadline_ms: Optional[float],
+    ) -> None:
+        """Run one request, relaying its events."""
+        ticket = None
+        if kind == "analyze":
+            events = single_analysis_events(texts[0], self._registry, models)
+        else:
+            events = batch_analysis_events(texts, self._registry, models)
+
+        try:
+            ticket = await get_admission_controller().acquire(
+                STREAM_CLASS, cost=len(texts), deadline_ms=deadline_ms
+            )
+            async for event, data in events:
+                await self._send(request_id, event, data)
+            _ws_stats["completed"] += 1
+        except AdmissionRejected as e:
+            await self._send(request_id, "error", {
+                "error": str(e),
+                "reason": e.reason,
+                "retry_after": round(e.retry_after, 3),
+            })
+        except asyncio.CancelledError:
+            _ws_stats["cancelled"] += 1
+            # Best effort: the client may be gone or not reading
+            try:
+                self._outbox.put_nowait({"id": request_id, "event": "cancelled", "data": {}})
+            except asyncio.QueueFull:
+                pass
+        except Exception as e:
+            logger.error(f"WebSocket request '{request_id}' failed: {e}")
+            await self._send(request_id, "error", {"error": str(e)})
+        finally:
+            await events.aclose()
+            if ticket is not None:
+                ticket.release()
+            self._requests.pop(request_id, None)
 
 
 # =============================================================================
-# Helper Functions (run in thread pool)
+# Helper Functions (run on the inference executor)
 # =============================================================================
 
 def _run_finance_sentiment(
@@ -396,46 +862,38 @@ def _run_ner(
     )
 
 
-def _build_full_result(
-    text: str,
-    cleaned_text: str,
-    registry: ModelRegistry,
-    models_to_run: list[str],
-) -> FullAnalysisResponse:
-    """Build full analysis result."""
-    finance_result = None
-    social_result = None
-    emotion_result = None
-    ner_result = None
-
-    if "finance" in models_to_run and registry.finbert and registry.finbert_tone:
-        try:
-            finance_result = _run_finance_sentiment(text, cleaned_text, registry)
-        except Exception as e:
-            logger.error(f"Finance error: {e}")
-
-    if "social" in models_to_run and registry.twitter_sentiment:
-        try:
-            social_result = _run_social_sentiment(text, cleaned_text, registry)
-        except Exception as e:
-            logger.error(f"Social error: {e}")
+def _model_available(model_name: str, registry: ModelRegistry) -> bool:
+    """Whether the pipelines behind a stream model name are loaded."""
+    if model_name == "finance":
+        return bool(registry.finbert and registry.finbert_tone)
+    if model_name == "social":
+        return bool(registry.twitter_sentiment)
+    if model_name == "emotion":
+        return bool(registry.emotion_classifier)
+    if model_name == "ner":
+        return bool(registry.ner_model)
+    return False
 
-    if "emotion" in models_to_run and registry.emotion_classifier:
-        try:
-            emotion_result = _run_emotion(text, cleaned_text, registry)
-        except Exception as e:
-            logger.error(f"Emotion error: {e}")
-
-    if "ner" in models_to_run and registry.ner_model:
-        try:
-            ner_result = _run_ner(text, cleaned_text, registry)
-        except Exception as e:
-            logger.error(f"NER error: {e}")
 
-    return FullAnalysisResponse(
-        text=text,
-        finance_sentiment=finance_result,
-        social_sentiment=social_result,
-        emotion=emotion_result,
-        ner=ner_result,
-    )
+def _run_model_batch(
+    model_name: str,
+    texts: List[str],
+    registry: ModelRegistry,
+) -> list:
+    """Run one model over a sub-batch in a single batched call."""
+    if model_name == "finance":
+        return batch_finance_sentiment(texts, registry.finbert, registry.finbert_tone).results
+    if model_name == "social":
+        return batch_social_sentiment(texts, registry.twitter_sentiment).results
+    if model_name == "emotion":
+        return batch_emotion(texts, registry.emotion_classifier).results
+    return batch_entities(texts, registry.ner_model).results
+
+
+# Stream model name -> single-text runner
+_SINGLE_RUNNERS = {
+    "finance": _run_finance_sentiment,
+    "social": _run_social_sentiment,
+    "emotion": _run_emotion,
+    "ner": _run_ner,
+}
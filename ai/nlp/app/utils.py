@@ -8,8 +8,10 @@ This module provides helper functions for:
 """
 
 import logging
+import os
 from typing import Optional
 
+from app.core.truncation import CHUNK, get_long_text_mode
 from app.schemas import SentimentScore, EnsembleScore
 
 logger = logging.getLogger(__name__)
@@ -220,16 +222,24 @@ def normalize_entity_type(entity_type: str) -> str:
 # Text Preprocessing
 # =============================================================================
 
-def truncate_text(text: str, max_length: int = 512) -> str:
+# Coarse pre-tokenization guard (tokens). Exact per-model limits are applied
+# on token IDs by the pipelines; this only bounds tokenizer work on huge input.
+MAX_INPUT_TOKENS = int(os.getenv("NLP_MAX_INPUT_TOKENS", 4096))
+
+
+def truncate_text(text: str, max_length: int = MAX_INPUT_TOKENS) -> str:
     """
-    Truncate text to maximum token-approximate length.
+    Cap text length before tokenization.
 
-    Most BERT models have 512 token limit. This provides a rough
-    character-based truncation as a safety measure.
+    This is a coarse safety bound, not the model limit: pipelines
+    truncate on token IDs at each model's max_length. The character cap
+    only keeps pathological inputs from spending unbounded time in the
+    tokenizer. In chunk mode (NLP_LONG_TEXT_MODE=chunk) text is not
+    capped: the windows cover all of it.
 
     Args:
         text: Input text
-        max_length: Maximum character length (default: 512 * 4 = ~512 tokens)
+        max_length: Approximate token budget (default: NLP_MAX_INPUT_TOKENS)
 
     Returns:
         Truncated text
@@ -237,7 +247,7 @@ def truncate_text(text: str, max_length: int = 512) -> str:
     # Rough estimate: 1 token ≈ 4 characters for English
     char_limit = max_length * 4
 
-    if len(text) <= char_limit:
+    if len(text) <= char_limit or get_long_text_mode() == CHUNK:
         return text
 
     logger.warning(f"Text truncated from {len(text)} to {char_limit} chars")
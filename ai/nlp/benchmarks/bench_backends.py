@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Backend benchmark: PyTorch vs ONNX Runtime vs dynamic-INT8 ONNX.
+
+Loads one model on each backend, reports accuracy drift against the
+PyTorch pipeline, then latency per batch (p50/p95) and throughput.
+Requires torch, transformers and optimum[onnxruntime]; exports are
+cached under NLP_ONNX_DIR.
+
+Usage:
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --model dslim/bert-base-NER --task ner
+    python benchmarks/bench_backends.py --backends torch onnx-int8 --batch-size 16
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.backends import (  # noqa: E402
+    BACKENDS,
+    DRIFT_SAMPLE_TEXTS,
+    ONNX_INT8,
+    TORCH,
+    build_onnx_pipeline,
+    check_drift,
+)
+
+
+def build(task: str, model: str, backend: str, max_length: int):
+    """Build a pipeline for one backend."""
+    kwargs = {"aggregation_strategy": "simple"} if task == "ner" else {
+        "truncation": True, "max_length": max_length,
+    }
+    if backend == TORCH:
+        from transformers import pipeline
+        return pipeline(task, model=model, device=-1, **kwargs)
+    return build_onnx_pipeline(task, model, -1, quantize=(backend == ONNX_INT8), **kwargs)
+
+
+def time_backend(pipe, texts: list[str], batch_size: int, rounds: int) -> list[float]:
+    """Per-batch latencies (ms) over `rounds` passes of `texts`."""
+    latencies = []
+    for _ in range(rounds):
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i + batch_size]
+            start = time.perf_counter()
+            pipe(batch, batch_size=len(batch))
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="ProsusAI/finbert")
+    parser.add_argument("--task", default="sentiment-analysis")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--texts", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--max-length", type=int, default=512)
+    args = parser.parse_args()
+
+    texts = [DRIFT_SAMPLE_TEXTS[i % len(DRIFT_SAMPLE_TEXTS)] for i in range(args.texts)]
+
+    pipes = {}
+    for backend in args.backends:
+        start = time.perf_counter()
+        pipes[backend] = build(args.task, args.model, backend, args.max_length)
+        pipes[backend](texts[:2])  # Warm up
+        print(f"[{backend}] loaded in {time.perf_counter() - start:.1f}s")
+
+    print("=" * 72)
+    print(f"{args.model} ({args.task}), {args.texts} texts, batch_size={args.batch_size}")
+    print("=" * 72)
+    print(f"{'backend':<10} {'p50 ms':>8} {'p95 ms':>8} {'texts/s':>9} {'agree':>7} {'max Δ':>7}")
+
+    reference = pipes.get(TORCH)
+    for backend, pipe in pipes.items():
+        latencies = time_backend(pipe, texts, args.batch_size, args.rounds)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        throughput = len(texts) * args.rounds / (sum(latencies) / 1000)
+
+        agree, delta = "-", "-"
+        if reference is not None and backend != TORCH:
+            drift = check_drift(reference, pipe)
+            agree, delta = f"{drift.label_agreement:.0%}", f"{drift.max_score_delta:.3f}"
+
+        print(
+            f"{backend:<10} {statistics.median(latencies):>8.1f} {p95:>8.1f} "
+            f"{throughput:>9.1f} {agree:>7} {delta:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
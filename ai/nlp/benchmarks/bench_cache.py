@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Cache microbenchmark: InferenceCache set/get throughput by size.
+
+For each capacity, fills the cache, then measures steady-state set()
+with eviction on every call (the cache is full), get() hits and get()
+misses. Keys are precomputed so hashing isn't part of the measurement;
+--with-hashing times the text API (normalize + SHA-256) instead.
+
+Usage:
+    python benchmarks/bench_cache.py
+    python benchmarks/bench_cache.py --sizes 10000 100000 --ops 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import InferenceCache, hash_text  # noqa: E402
+
+VALUE = {
+    "sentiment": {"label": "positive", "score": 0.91},
+    "emotion": {"label": "joy", "score": 0.64},
+    "entities": [{"entity": "Apple", "type": "ORG"}],
+    "confidence": 0.88,
+}
+
+
+def rate(n: int, elapsed: float) -> str:
+    return f"{n / elapsed / 1000:>9.0f}k/s"
+
+
+def bench(size: int, ops: int, with_hashing: bool) -> None:
+    cache = InferenceCache(max_entries=size, max_bytes=1 << 40)
+    if with_hashing:
+        set_fn, get_fn = cache.set, cache.get
+        keys = [f"headline number {i} moves the market" for i in range(size + ops)]
+    else:
+        set_fn, get_fn = cache.set_by_key, cache.get_by_key
+        keys = [hash_text(f"headline number {i}") for i in range(size + ops)]
+
+    start = time.perf_counter()
+    for key in keys[:size]:
+        set_fn(key, VALUE)
+    fill = time.perf_counter() - start
+
+    # Cache is full: every set evicts
+    start = time.perf_counter()
+    for key in keys[size:size + ops]:
+        set_fn(key, VALUE)
+    evicting = time.perf_counter() - start
+
+    resident = keys[ops:ops + size]
+    start = time.perf_counter()
+    for i in range(ops):
+        get_fn(resident[i % size])
+    hits = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys[:min(ops, size)]:
+        get_fn(key)
+    misses = time.perf_counter() - start
+
+    print(
+        f"{size:>9,} {rate(size, fill)} {rate(ops, evicting)} "
+        f"{rate(ops, hits)} {rate(min(ops, size), misses)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=100_000)
+    parser.add_argument("--with-hashing", action="store_true")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"InferenceCache, {args.ops:,} ops per phase, hashing={'on' if args.with_hashing else 'off'}")
+    print("=" * 60)
+    print(f"{'entries':>9} {'fill':>11} {'set+evict':>11} {'get hit':>11} {'get miss':>11}")
+    for size in args.sizes:
+        bench(size, args.ops, args.with_hashing)
+
+
+if __name__ == "__main__":
+    main()
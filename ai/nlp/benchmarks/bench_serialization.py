@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark: encoding a large BatchFullAnalysisResponse.
+
+Times the ways a batch response (default: 1,000 full analysis results)
+or its SSE events can be turned into bytes:
+
+- route: a GET through FastAPI's TestClient returning the response,
+  once from a response_model route (installed FastAPI's own path) and
+  once as FastJSONResponse (the batch endpoints). Both pay the same
+  client overhead.
+- encode: the dict round trip of FastAPI releases without the
+  pydantic-core fast path (dump, validate again, dump, stdlib json),
+  model_dump() then stdlib json or dumps (orjson when installed), and
+  FastJSONResponse alone (model_dump_json)
+- SSE events: one complete event per result, stdlib json vs dumps_str
+
+Usage:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --items 1000 5000 --repeat 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastapi  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.serialization import ORJSON_AVAILABLE, dumps, dumps_str, get_json_backend  # noqa: E402
+from app.responses import FastJSONResponse  # noqa: E402
+from app.schemas import (  # noqa: E402
+    BatchFullAnalysisResponse,
+    EmotionResponse,
+    EmotionScore,
+    EnsembleScore,
+    FinanceSentimentResponse,
+    FullAnalysisResponse,
+    ModelSentimentResult,
+    NEREntity,
+    NERResponse,
+    SentimentScore,
+    SocialSentimentResponse,
+)
+
+EMOTIONS = ["joy", "anger", "fear", "sadness", "surprise", "disgust", "neutral"]
+
+
+def make_result(i: int) -> FullAnalysisResponse:
+    text = f"Apple shares rose {i % 10}% after earnings beat estimates; analysts lift targets"
+    return FullAnalysisResponse(
+        text=text,
+        finance_sentiment=FinanceSentimentResponse(
+            text=text,
+            models=[
+                ModelSentimentResult(model=name, sentiment=SentimentScore(label="positive", score=0.91))
+                for name in ("finbert", "finbert_tone")
+            ],
+            ensemble=EnsembleScore(label="positive", confidence=0.9, raw_score=0.82),
+        ),
+        social_sentiment=SocialSentimentResponse(text=text, label="positive", confidence=0.78),
+        emotion=EmotionResponse(
+            text=text,
+            emotions=[EmotionScore(emotion=e, score=1 / len(EMOTIONS)) for e in EMOTIONS],
+            primary_emotion="joy",
+            primary_score=0.14,
+        ),
+        ner=NERResponse(
+            text=text,
+            entities=[NEREntity(entity="Apple", entity_type="ORG", confidence=0.99, start=0, end=5)],
+            entity_count=1,
+        ),
+    )
+
+
+def stdlib_encode(content: Any) -> bytes:
+    # JSONResponse.render
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    """Best of `repeat` runs, milliseconds."""
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def make_client(response: BatchFullAnalysisResponse) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/default", response_model=BatchFullAnalysisResponse)
+    async def default_route():
+        return response
+
+    @app.get("/fast", response_model=BatchFullAnalysisResponse)
+    async def fast_route():
+        return FastJSONResponse(response)
+
+    return TestClient(app)
+
+
+def report(title: str, cases: Dict[str, Callable[[], Any]], repeat: int) -> None:
+    """Time each case; speedup is relative to the first."""
+    print(f"  {title}")
+    baseline = None
+    for name, fn in cases.items():
+        elapsed = timed(fn, repeat)
+        baseline = baseline or elapsed
+        print(f"    {name:<24} {elapsed:>9.2f} ms  {baseline / elapsed:>6.1f}x")
+
+
+def bench(items: int, repeat: int) -> None:
+    response = BatchFullAnalysisResponse(
+        results=[make_result(i) for i in range(items)],
+        count=items,
+    )
+    events = [
+        ("complete", {"full_result": result.model_dump(), "text_index": i})
+        for i, result in enumerate(response.results)
+    ]
+    client = make_client(response)
+
+    size_kb = len(FastJSONResponse(response).body) / 1024
+    print(f"\n{items:,} results, {size_kb:,.0f} KiB JSON")
+    report("route", {
+        "response_model": lambda: client.get("/default").content,
+        "FastJSONResponse": lambda: client.get("/fast").content,
+    }, repeat)
+    report("encode", {
+        "dict round trip": lambda: stdlib_encode(
+            BatchFullAnalysisResponse.model_validate(response.model_dump()).model_dump(mode="json")
+        ),
+        "model_dump + json": lambda: stdlib_encode(response.model_dump()),
+        "model_dump + dumps": lambda: dumps(response.model_dump()),
+        "FastJSONResponse": lambda: FastJSONResponse(response).body,
+    }, repeat)
+    report("SSE events", {
+        "json": lambda: [
+            f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n" for event, data in events
+        ],
+        "dumps_str": lambda: [
+            f"event: {event}\ndata: {dumps_str(data)}\n\n" for event, data in events
+        ],
+    }, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[1_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(
+        f"Serialization, best of {args.repeat}, dumps backend: {get_json_backend()}, "
+        f"FastAPI {fastapi.__version__}"
+    )
+    if not ORJSON_AVAILABLE:
+        print("orjson not installed: dumps falls back to json (pip install orjson)")
+    print("=" * 60)
+    for items in args.items:
+        bench(items, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
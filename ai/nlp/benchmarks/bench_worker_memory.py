@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Worker memory benchmark: model RAM per gunicorn worker count.
+
+Starts the service under gunicorn (gunicorn.conf.py) for each worker
+count, waits for /ready, optionally sends warm-up requests so every
+worker runs inference, then reads RSS / PSS / USS for the master and
+each worker from /proc/<pid>/smaps_rollup (Linux only).
+
+PSS splits shared pages between the processes sharing them, so total PSS
+is the real footprint. With preload, adding workers should add roughly
+each worker's USS (its unshared pages), not a full copy of the models.
+
+Usage:
+    python benchmarks/bench_worker_memory.py --workers 1 2 4
+    python benchmarks/bench_worker_memory.py --workers 1 2 4 --no-preload
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def memory_kb(pid: int) -> dict[str, int]:
+    """RSS, PSS and USS (private clean + dirty) of one process, in kB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def children(pid: int) -> list[int]:
+    """Direct child processes of pid."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent pid (comm may contain spaces; split after ')')
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            pids.append(int(entry))
+    return pids
+
+
+def wait_ready(port: int, timeout: float) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=5) as resp:
+                if resp.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(2)
+    raise TimeoutError(f"Service on port {port} not ready after {timeout:.0f}s")
+
+
+def warm_up(port: int, requests: int) -> None:
+    body = json.dumps({"text": "Apple beat earnings expectations, shares up 5%."}).encode()
+    for _ in range(requests):
+        req = urllib.request.Request(
+            f"http://127.0.0.1:{port}/analyze",
+            data=body,
+            headers={"Content-Type": "application/json"},
+        )
+        urllib.request.urlopen(req, timeout=60).read()
+
+
+def measure(n_workers: int, preload: bool, warmup: int, timeout: float) -> dict:
+    port = free_port()
+    env = {
+        **os.environ,
+        "NLP_WORKERS": str(n_workers),
+        "NLP_PORT": str(port),
+        "NLP_HOST": "127.0.0.1",
+        "NLP_PRELOAD_MODELS": "true" if preload else "false",
+    }
+    proc = subprocess.Popen(
+        ["gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port, timeout)
+        # Workers without preload load in the background; give stragglers time
+        while len(children(proc.pid)) < n_workers:
+            time.sleep(1)
+        warm_up(port, warmup * n_workers)
+        time.sleep(2)
+
+        master = memory_kb(proc.pid)
+        workers = [memory_kb(pid) for pid in children(proc.pid)]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=60)
+
+    return {
+        "workers": n_workers,
+        "master_pss_mb": master["pss"] / 1024,
+        "total_rss_mb": (master["rss"] + sum(w["rss"] for w in workers)) / 1024,
+        "total_pss_mb": (master["pss"] + sum(w["pss"] for w in workers)) / 1024,
+        "avg_worker_uss_mb": sum(w["uss"] for w in workers) / max(1, len(workers)) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--no-preload", action="store_true", help="Load models in each worker")
+    parser.add_argument("--warmup", type=int, default=5, help="Warm-up requests per worker")
+    parser.add_argument("--timeout", type=float, default=900, help="Seconds to wait for /ready")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("This benchmark needs Linux /proc/<pid>/smaps_rollup")
+
+    preload = not args.no_preload
+    print("=" * 72)
+    print(f"gunicorn workers, preload={'on' if preload else 'off'}")
+    print("=" * 72)
+    print(f"{'workers':>7} {'master PSS':>11} {'total RSS':>10} {'total PSS':>10} {'USS/worker':>11}")
+
+    for n_workers in args.workers:
+        r = measure(n_workers, preload, args.warmup, args.timeout)
+        print(
+            f"{r['workers']:>7} {r['master_pss_mb']:>9.0f}MB {r['total_rss_mb']:>8.0f}MB "
+            f"{r['total_pss_mb']:>8.0f}MB {r['avg_worker_uss_mb']:>9.0f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
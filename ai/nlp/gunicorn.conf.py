@@ -0,0 +1,83 @@
+# ============================================================================
+# GUNICORN PRE-FORK CONFIGURATION
+# Multi-worker deployment with model weights shared copy-on-write
+# ============================================================================
+#
+# Usage:
+#   gunicorn -c gunicorn.conf.py app.main:app
+#
+# Models are loaded ONCE in the master process (when_ready), then workers
+# are forked. Weight tensors are never written after loading, so their
+# pages stay shared between the master and every worker (copy-on-write):
+# N workers cost ~1x model RAM plus a small per-worker overhead instead
+# of N x ~2 GB.
+#
+# What keeps the pages shared:
+# - gc.freeze() before fork moves every object loaded so far into a
+#   permanent generation, so the collector never writes GC headers on
+#   pages holding model objects
+# - Tensor storage is plain memory; refcount updates touch only the small
+#   Python wrapper objects, not the weights
+# - No inference runs in the master (thread pools and torch's OpenMP pool
+#   are created after fork, in each worker); NLP_ONNX_DRIFT_CHECK is
+#   skipped during preload for the same reason
+#
+# Weights are loaded from safetensors, which memory-maps the checkpoint
+# file while loading; the page cache for the file is shared across
+# processes too.
+#
+# Configuration (env):
+# - NLP_HOST / NLP_PORT: bind address (default: 0.0.0.0:8000)
+# - NLP_WORKERS: worker processes (default: 1)
+# - NLP_PRELOAD_MODELS: load models in the master (default: true)
+# - NLP_WORKER_TIMEOUT: worker timeout in seconds (default: 120)
+# - NLP_INTRA_OP_THREADS: torch threads per forward pass; defaults to
+#   cores // workers so workers don't oversubscribe the CPU
+# ============================================================================
+
+import gc
+import os
+
+bind = f"{os.getenv('NLP_HOST', '0.0.0.0')}:{os.getenv('NLP_PORT', '8000')}"
+workers = int(os.getenv("NLP_WORKERS", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("NLP_WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Import the app in the master so workers inherit imported modules
+preload_app = True
+
+# In process mode models live in the inference processes, not in workers
+PRELOAD_MODELS = (
+    os.getenv("NLP_PRELOAD_MODELS", "true").lower() in ("1", "true", "yes", "on")
+    and os.getenv("NLP_INFERENCE_MODE", "thread").lower() != "process"
+)
+
+
+def when_ready(server):
+    """Load models in the master, then freeze the heap before forking."""
+    if not PRELOAD_MODELS:
+        server.log.info("Model preload disabled; each worker loads its own models")
+        return
+
+    from app.models import preload_models
+
+    registry = preload_models()
+    server.log.info(
+        f"Preloaded {len(registry.get_loaded_models())} models in master (pid {os.getpid()})"
+    )
+
+    # Keep the collector from touching (and un-sharing) preloaded objects
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Give each worker its share of the cores for intra-op threads."""
+    if not os.getenv("NLP_INTRA_OP_THREADS"):
+        threads = max(1, (os.cpu_count() or 1) // max(1, workers))
+        os.environ["NLP_INTRA_OP_THREADS"] = str(threads)
+    server.log.info(
+        f"Worker {worker.pid} forked ({os.environ['NLP_INTRA_OP_THREADS']} intra-op threads)"
+    )
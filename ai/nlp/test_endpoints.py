@@ -5,11 +5,59 @@ Tests the module structure, schemas, and logic.
 """
 
 import os
+import time
 import asyncio
 from datetime import datetime, timedelta
 
 # Set env before imports
 os.environ['DEEPSEEK_API_KEY'] = 'sk-3e3f9a96c6be4e36acfb4a6e60b6918b'
+# Memory-only shared inference cache: tests never write a cache database
+os.environ['NLP_CACHE_BACKEND'] = 'none'
+
+
+class _InProcessRedis:
+    """Minimal Redis stand-in (MGET, pipelined SET PX, SCAN, DEL)."""
+
+    def __init__(self, down=False):
+        self.data = {}
+        self.down = down
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("connection refused")
+
+    def mget(self, keys):
+        self._check()
+        now = time.time()
+        return [
+            self.data[k][0] if k in self.data and self.data[k][1] > now else None
+            for k in keys
+        ]
+
+    def pipeline(self, transaction=True):
+        server, commands = self, []
+
+        class Pipeline:
+            def set(self, key, value, px=None):
+                commands.append((key, value, px))
+
+            def execute(self):
+                server._check()
+                for key, value, px in commands:
+                    server.data[key] = (value, time.time() + px / 1000)
+
+        return Pipeline()
+
+    def scan_iter(self, match="*", count=None):
+        self._check()
+        return [k for k in list(self.data) if k.startswith(match.rstrip("*"))]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def close(self):
+        pass
 
 
 def test_cache_module():
@@ -50,9 +98,215 @@ def test_cache_module():
     assert stats["misses"] >= 1
     print(f"[PASS] Cache stats: {stats}")
 
+    # Test LRU eviction (recently read entries survive)
+    lru = InferenceCache(max_entries=3)
+    for i in range(3):
+        lru.set(f"text {i}", {"i": i})
+    lru.get("text 0")
+    lru.set("text 3", {"i": 3})
+    assert lru.get("text 1") is None
+    assert lru.get("text 0") == {"i": 0}
+    assert lru.get_stats()["evictions"] == 1
+    print("[PASS] LRU eviction works")
+
+    # Test byte bound
+    small = InferenceCache(max_bytes=400)
+    for i in range(20):
+        small.set(f"text {i}", {"payload": "x" * 50})
+    stats = small.get_stats()
+    assert stats["bytes"] <= 400 and stats["size"] < 20
+    print(f"[PASS] Byte bound enforced: {stats['size']} entries, {stats['bytes']} bytes")
+
+    # Test expiry
+    cache.set("short lived", test_data, ttl=-1)
+    assert cache.get("short lived") is None
+    print("[PASS] Expired entries are removed")
+
+    # Test disk tier survives a restart (write-behind, then read-through)
+    import tempfile
+    from app.core.cache_disk import SQLiteCacheBackend
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        warm = InferenceCache(backend=SQLiteCacheBackend(path))
+        warm.set("persisted text", test_data)
+        assert warm.get_stats()["backend"]["write_behind"]["pending"] == 1
+        warm.close()
+
+        restarted = InferenceCache(backend=SQLiteCacheBackend(path))
+        assert restarted.get("persisted text") == test_data
+        assert restarted.get("persisted text") == test_data
+        stats = restarted.get_stats()
+        assert stats["backend_hits"] == 1 and stats["hits"] == 1
+        assert restarted.get("never stored") is None
+        restarted.close()
+    print("[PASS] Disk tier serves entries after restart")
+
+    # Test Redis backend: two workers share results through one server
+    from app.core.cache_redis import RedisCacheBackend
+
+    server = _InProcessRedis()
+    worker_a = InferenceCache(backend=RedisCacheBackend(client=server))
+    worker_b = InferenceCache(backend=RedisCacheBackend(client=server))
+    worker_a.set("shared text", test_data)
+    worker_a.flush()
+    assert worker_b.get("shared text") == test_data
+    assert worker_b.get_stats()["backend"]["round_trips"] == 1
+    worker_b.clear()
+    assert not server.data
+    print("[PASS] Redis backend shares entries between workers")
+
+    # Test bulk path: hash once, one backend round trip for every miss
+    from app.core.cache import hash_texts
+
+    keys = hash_texts(["Bulk  A", "bulk b", "BULK A"])
+    assert keys[0] == keys[2] == hash_text("bulk a")
+    assert worker_a.set_many_by_key([(keys[0], {"i": 0}), (keys[1], {"i": 1})]) == 2
+    worker_a.flush()
+    trips = worker_b.get_stats()["backend"]["round_trips"]
+    assert worker_b.get_many_by_key(keys + ["absent"]) == [{"i": 0}, {"i": 1}, {"i": 0}, None]
+    assert worker_b.get_stats()["backend"]["round_trips"] == trips + 1
+    assert worker_b.get_many(["bulk b"]) == {"bulk b": {"i": 1}}
+    print("[PASS] Bulk get/set by precomputed keys (one backend round trip)")
+
+    # Test unreachable backend degrades to memory-only
+    degraded = InferenceCache(backend=RedisCacheBackend(client=_InProcessRedis(down=True)))
+    degraded.set("local text", test_data)
+    for _ in range(5):
+        assert degraded.get("missing text") is None
+    assert degraded.get("local text") == test_data
+    backend_stats = degraded.get_stats()["backend"]
+    assert backend_stats["circuit"] == "open" and backend_stats["short_circuited"] >= 1
+    degraded.close()
+    print("[PASS] Unreachable backend degrades to memory-only")
+
     print("\n[OK] Cache module tests passed!")
 
 
+def test_model_cache_module():
+    """Test per-model raw output caching."""
+    print("\n" + "=" * 60)
+    print("TEST: Model Output Cache")
+    print("=" * 60)
+
+    from app.core.cache import InferenceCache
+    from app.core.model_cache import CachedPipeline, model_cache_id, unwrap_cached
+
+    calls = []
+
+    def classifier(inputs, **kwargs):
+        batch = [inputs] if isinstance(inputs, str) else list(inputs)
+        calls.append(batch)
+        return [{"label": "positive", "score": len(t) / 100} for t in batch]
+
+    cache = InferenceCache()
+    cache_id = model_cache_id("org/model", "abc123", "torch/truncate512")
+    assert cache_id == "org/model@abc123/torch/truncate512"
+    pipe = CachedPipeline(classifier, cache_id, cache=cache)
+
+    first = pipe(["one", "two"], batch_size=2)
+    assert calls == [["one", "two"]]
+    print("[PASS] Misses run through the model in one call")
+
+    # Single-string calls keep pipeline semantics ([result]) and hit the cache
+    assert pipe("one") == [first[0]]
+    mixed = pipe(["two", "three", "one"])
+    assert calls == [["one", "two"], ["three"]]
+    assert mixed[0] == first[1] and mixed[2] == first[0]
+    print("[PASS] Cached outputs reused, only new texts inferred")
+
+    # Outputs are per model identity: another revision misses
+    other = CachedPipeline(classifier, model_cache_id("org/model", "def456"), cache=cache)
+    other(["one"])
+    assert calls[-1] == ["one"]
+    print("[PASS] Keys include model revision")
+
+    # Explicit lookup/store for paths that bypass the pipeline call
+    results, missing = pipe.lookup(["one", "four"])
+    assert results[0] == first[0] and missing == [1]
+    pipe.store(["four"], [{"label": "neutral", "score": 0.5}])
+    assert pipe.lookup(["four"])[1] == []
+    assert unwrap_cached(pipe) is classifier
+    print("[PASS] lookup/store and unwrap work")
+
+    stats = pipe.get_stats()
+    assert stats["hits"] == 5 and stats["misses"] == 4
+    assert stats["hit_ratio"] == round(5 / 9, 3)
+    print(f"[PASS] Per-model stats: {stats}")
+
+    # Identical inputs in one call are inferred once
+    deduped = pipe(["five", "six", "five"])
+    assert calls[-1] == ["five", "six"] and deduped[0] == deduped[2]
+    print("[PASS] Duplicate inputs inferred once")
+
+    print("\n[OK] Model cache module tests passed!")
+
+
+def test_single_flight_module():
+    """Test coalescing of concurrent cache misses."""
+    print("\n" + "=" * 60)
+    print("TEST: Single-Flight")
+    print("=" * 60)
+
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from app.core.cache import InferenceCache
+    from app.core.model_cache import CachedPipeline
+    from app.core.singleflight import SingleFlight
+
+    # Leader resolves; follower receives its value
+    flights = SingleFlight(enabled=True)
+    leader = flights.begin(["a", "b"])
+    follower = flights.begin(["b", "c"])
+    assert leader.leading == {"a", "b"}
+    assert follower.leading == {"c"} and set(follower.following) == {"b"}
+    leader.resolve({"b": {"label": "positive"}})
+    leader.close()
+    follower.close()
+    assert follower.wait() == {"b": {"label": "positive"}}
+    assert flights.get_stats()["in_flight"] == 0
+    print("[PASS] Followers receive the leader's output")
+
+    # A failed leader releases its keys; followers compute themselves
+    leader = flights.begin(["d"])
+    follower = flights.begin(["d"])
+    leader.close(RuntimeError("model crashed"))
+    assert follower.wait() == {}
+    stats = flights.get_stats()
+    assert stats["leader_failures"] == 1 and stats["coalesced"] == 2
+    assert flights.begin(["d"]).leading == {"d"}
+    print("[PASS] Failed leader falls back to local compute")
+
+    # Concurrent pipeline calls for one text run the model once
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_classifier(inputs, **kwargs):
+        calls.append(list(inputs))
+        started.set()
+        release.wait(5)
+        return [{"label": "positive", "score": 0.9} for _ in inputs]
+
+    shared = SingleFlight(enabled=True)
+    pipe = CachedPipeline(slow_classifier, "org/model@abc", cache=InferenceCache(), flights=shared)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(pipe, ["viral headline"])
+        started.wait(5)
+        others = [pool.submit(pipe, ["viral headline"]) for _ in range(3)]
+        while shared.get_stats()["coalesced"] < 3:
+            time.sleep(0.005)
+        release.set()
+        results = [first.result()] + [f.result() for f in others]
+
+    assert calls == [["viral headline"]]
+    assert all(r == results[0] for r in results)
+    assert pipe.get_stats()["coalesced"] == 3
+    print(f"[PASS] Concurrent misses coalesced: {shared.get_stats()}")
+
+    print("\n[OK] Single-flight tests passed!")
+
+
 def test_batching_module():
     """Test the batching utilities."""
     print("\n" + "=" * 60)
@@ -80,9 +334,233 @@ def test_batching_module():
     assert config.batch_size == MIN_BATCH_SIZE
     print(f"[PASS] User batch size clamped: 1 -> {config.batch_size}")
 
+    # Test length bucketing restores input order
+    from app.core.batching import bucket_by_length, run_in_buckets, PaddingStats
+
+    lengths = [50, 3, 48, 4, 5]
+    buckets = bucket_by_length(lengths, 2)
+    assert sorted(i for b in buckets for i in b) == list(range(5))
+    results = run_in_buckets(lambda xs, batch_size: [x * 10 for x in xs], lengths, buckets)
+    assert results == [500, 30, 480, 40, 50]
+    print("[PASS] Length-bucketed batches restore input order")
+
+    bucketed = PaddingStats.from_buckets(lengths, buckets)
+    arrival = PaddingStats.from_buckets(lengths, list(chunk_texts(list(range(5)), 2)))
+    assert bucketed.tokens_processed == arrival.tokens_processed
+    assert bucketed.tokens_padded < arrival.tokens_padded
+    print(f"[PASS] Padding reduced: {arrival.tokens_padded} -> {bucketed.tokens_padded} tokens")
+
     print("\n[OK] Batching module tests passed!")
 
 
+def test_tokenization_module():
+    """Test tokenizer fingerprints and shared encodings."""
+    print("\n" + "=" * 60)
+    print("TEST: Tokenization Module")
+    print("=" * 60)
+
+    from app.core.tokenization import SharedEncodings, tokenizer_fingerprint
+
+    class VocabTokenizer:
+        """Word-level tokenizer: [CLS] words [SEP], unknown words -> [UNK]."""
+
+        def __init__(self, words, do_lower_case=True):
+            self.vocab = {token: i for i, token in enumerate(["[PAD]", "[UNK]", "[CLS]", "[SEP]", *words])}
+            self.do_lower_case = do_lower_case
+            self.calls = 0
+
+        def get_vocab(self):
+            return dict(self.vocab)
+
+        def __call__(self, texts, truncation=True, max_length=512):
+            self.calls += 1
+            input_ids = []
+            for text in texts:
+                words = text.lower().split() if self.do_lower_case else text.split()
+                ids = [self.vocab.get(word, 1) for word in words][:max_length - 2]
+                input_ids.append([2, *ids, 3])
+            return {"input_ids": input_ids, "attention_mask": [[1] * len(ids) for ids in input_ids]}
+
+        def pad(self, encoded, padding=True, return_tensors=None):
+            width = max(len(ids) for ids in encoded["input_ids"])
+            return {
+                key: [row + [0] * (width - len(row)) for row in rows]
+                for key, rows in encoded.items()
+            }
+
+    class OtherTokenizer(VocabTokenizer):
+        pass
+
+    words = ["apple", "stock", "rose", "fell", "today"]
+    base = VocabTokenizer(words)
+    assert tokenizer_fingerprint(base) == tokenizer_fingerprint(VocabTokenizer(words))
+    different = [
+        VocabTokenizer(["apple", "stock", "rose", "fell", "tomorrow"]),  # vocabulary
+        VocabTokenizer(list(reversed(words))),  # token ids
+        VocabTokenizer(words, do_lower_case=False),  # casing
+        OtherTokenizer(words),  # tokenizer class
+    ]
+    fingerprints = {tokenizer_fingerprint(tokenizer) for tokenizer in [base, *different]}
+    assert len(fingerprints) == 1 + len(different)
+    print("[PASS] Fingerprint changes with vocabulary, ids, casing and class")
+
+    texts = ["Apple stock rose today", "Stock fell", "apple"]
+    encodings = SharedEncodings(texts, max_length=16)
+    twin = VocabTokenizer(words)
+    shared = encodings.encode(base)
+    assert encodings.encode(twin) is shared
+    assert twin.calls == 0 and encodings.profile.shared_hits == 1
+    for tokenizer in different:
+        assert encodings.encode(tokenizer) is not shared
+    assert encodings.profile.tokenizer_runs == 1 + len(different)
+    assert encodings.encode(different[1])["input_ids"][2] != shared["input_ids"][2]
+    print("[PASS] Identical tokenizers share one encoding; different ones never do")
+
+    batch = encodings.batch(base, [1, 0])
+    assert batch["input_ids"] == [[2, 5, 7, 3, 0, 0], [2, 4, 5, 6, 8, 3]]
+    assert batch["attention_mask"] == [[1, 1, 1, 1, 0, 0], [1, 1, 1, 1, 1, 1]]
+    trimmed = encodings.batch(base, [0, 2], max_length=4)
+    assert trimmed["input_ids"] == [[2, 4, 5, 3], [2, 4, 3, 0]]
+    assert trimmed["attention_mask"] == [[1, 1, 1, 1], [1, 1, 1, 0]]
+    assert encodings.batch(base, [0], max_length=64)["input_ids"] == [[2, 4, 5, 6, 8, 3]]
+    print("[PASS] batch() pads to the longest row and trims to max_length keeping [SEP]")
+
+    print("\n[OK] Tokenization module tests passed!")
+
+
+def test_classify_encoded():
+    """Compare classify_encoded with the text-classification pipeline."""
+    print("\n" + "=" * 60)
+    print("TEST: classify_encoded")
+    print("=" * 60)
+
+    try:
+        import torch
+        from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast, pipeline
+    except ImportError:
+        print("[SKIP] Requires torch and transformers")
+        return
+
+    import os
+    import tempfile
+    from app.core.tokenization import SharedEncodings
+    from app.services import classify_encoded
+
+    words = ["apple", "stock", "rose", "fell", "today", "market", "shares", "beat"]
+    texts = ["Apple stock rose today", "Market fell", "shares beat the market today apple"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vocab_file = os.path.join(tmp, "vocab.txt")
+        with open(vocab_file, "w") as f:
+            f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words]))
+        tokenizer = BertTokenizerFast(vocab_file)
+
+    heads = {
+        "softmax": dict(num_labels=3),
+        "multi-label sigmoid": dict(num_labels=3, problem_type="multi_label_classification"),
+        "single-logit sigmoid": dict(num_labels=1),
+    }
+    for name, head in heads.items():
+        torch.manual_seed(0)
+        labels = {i: f"label_{i}" for i in range(head["num_labels"])}
+        config = BertConfig(
+            vocab_size=len(words) + 5, hidden_size=16, num_hidden_layers=1,
+            num_attention_heads=2, intermediate_size=32, max_position_embeddings=32,
+            id2label=labels, label2id={v: k for k, v in labels.items()}, **head,
+        )
+        pipe = pipeline(
+            "text-classification",
+            model=BertForSequenceClassification(config).eval(),
+            tokenizer=tokenizer,
+        )
+        batch = SharedEncodings(texts, max_length=32).batch(tokenizer, range(len(texts)))
+
+        expected_all = pipe(texts, top_k=None)
+        expected_top = pipe(texts, top_k=1)
+        for all_scores, expected in ((True, expected_all), (False, expected_top)):
+            actual = classify_encoded(pipe, batch, all_scores=all_scores)
+            assert len(actual) == len(texts)
+            for got, want in zip(actual, expected):
+                got = got if all_scores else [got]
+                assert [r["label"] for r in got] == [r["label"] for r in want]
+                assert all(abs(a["score"] - b["score"]) < 1e-5 for a, b in zip(got, want))
+        print(f"[PASS] {name}: labels and scores match the pipeline (top-1 and all scores)")
+
+    print("\n[OK] classify_encoded tests passed!")
+
+
+def test_truncation_module():
+    """Test token-window splitting and score aggregation."""
+    print("\n" + "=" * 60)
+    print("TEST: Truncation Module")
+    print("=" * 60)
+
+    from app.core.truncation import split_windows, aggregate_window_scores
+
+    class WordTokenizer:
+        """Whitespace tokenizer with offsets and [CLS]/[SEP] specials."""
+
+        def __call__(self, text, add_special_tokens=False, return_offsets_mapping=False):
+            offsets, pos = [], 0
+            for word in text.split():
+                start = text.index(word, pos)
+                pos = start + len(word)
+                offsets.append((start, pos))
+            return {"input_ids": list(range(len(offsets))), "offset_mapping": offsets}
+
+        def num_special_tokens_to_add(self, pair=False):
+            return 2
+
+    text = " ".join(f"w{i}" for i in range(20))
+    assert split_windows("short text", WordTokenizer(), 8) == [(0, 10, 2)]
+    windows = split_windows(text, WordTokenizer(), 8, stride=2)
+    assert all(count <= 6 for _, _, count in windows)
+    assert text[windows[0][0]:windows[0][1]] == "w0 w1 w2 w3 w4 w5"
+    assert windows[-1][1] == len(text)
+    print(f"[PASS] Long text split into {len(windows)} overlapping windows")
+
+    scores = aggregate_window_scores(
+        [
+            [{"label": "positive", "score": 0.9}, {"label": "negative", "score": 0.1}],
+            [{"label": "positive", "score": 0.2}, {"label": "negative", "score": 0.8}],
+        ],
+        weights=[300, 100],
+    )
+    assert scores["label"] == "positive"
+    assert abs(scores["score"] - 0.725) < 1e-9
+    print("[PASS] Window scores aggregated by token weight")
+
+    # Chunk mode: text past the coarse character cap is still windowed and scored
+    from app.core.truncation import ChunkedClassifier
+    from app.utils import MAX_INPUT_TOKENS, clean_text, truncate_text
+
+    class WindowPipe:
+        tokenizer = WordTokenizer()
+
+        def __init__(self):
+            self.windows = []
+
+        def __call__(self, texts, **kwargs):
+            self.windows.extend(texts)
+            return [[{"label": "positive", "score": 0.9}, {"label": "negative", "score": 0.1}] for _ in texts]
+
+    long_text = " ".join(f"w{i}" for i in range(MAX_INPUT_TOKENS))
+    assert len(long_text) > MAX_INPUT_TOKENS * 4
+    assert len(truncate_text(clean_text(long_text))) == MAX_INPUT_TOKENS * 4
+    os.environ["NLP_LONG_TEXT_MODE"] = "chunk"
+    try:
+        prepared = truncate_text(clean_text(long_text))
+    finally:
+        del os.environ["NLP_LONG_TEXT_MODE"]
+    assert prepared == long_text
+    pipe = WindowPipe()
+    assert ChunkedClassifier(pipe, max_length=512)(prepared)[0]["label"] == "positive"
+    assert pipe.windows[-1].endswith(f"w{MAX_INPUT_TOKENS - 1}")
+    print(f"[PASS] Chunk mode scores all {len(pipe.windows)} windows of a {len(long_text)}-char text")
+
+    print("\n[OK] Truncation module tests passed!")
+
+
 def test_adaptive_module():
     """Test adaptive batch sizing."""
     print("\n" + "=" * 60)
@@ -106,6 +584,1306 @@ def test_adaptive_module():
     print("\n[OK] Adaptive module tests passed!")
 
 
+async def test_executor_module():
+    """Test the inference executor."""
+    print("\n" + "=" * 60)
+    print("TEST: Executor Module")
+    print("=" * 60)
+
+    from app.core.executor import InferenceExecutor
+
+    executor = InferenceExecutor(max_workers=2, intra_op_threads=1)
+
+    # Test blocking call runs off the loop and returns its result
+    result = await executor.run(lambda a, b=0: a + b, 2, b=3)
+    assert result == 5
+    print("[PASS] Executor run works")
+
+    # Test exceptions propagate unchanged
+    def fail():
+        raise ValueError("boom")
+
+    try:
+        await executor.run(fail)
+        print("[FAIL] Should have raised ValueError")
+    except ValueError:
+        print("[PASS] Executor propagates exceptions")
+
+    # Test stats
+    stats = executor.get_stats()
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["queue_depth"] == 0
+    print(f"[PASS] Executor stats: {stats}")
+
+    executor.shutdown()
+
+    # Priority lanes: with the only worker busy, queued work runs
+    # interactive > streaming > bulk, FIFO within a lane
+    import threading
+    from app.core.executor import BULK_LANE, INTERACTIVE_LANE, STREAMING_LANE
+
+    executor = InferenceExecutor(max_workers=1, intra_op_threads=1, max_skips=3)
+    release = threading.Event()
+    order = []
+
+    blocker = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+    tasks = [
+        asyncio.ensure_future(executor.run(order.append, name, lane=lane))
+        for name, lane in [
+            ("bulk-1", BULK_LANE), ("bulk-2", BULK_LANE), ("stream-1", STREAMING_LANE),
+            ("ui-1", INTERACTIVE_LANE), ("ui-2", INTERACTIVE_LANE), ("ui-3", INTERACTIVE_LANE),
+        ]
+    ]
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.gather(blocker, *tasks)
+    assert order == ["ui-1", "ui-2", "ui-3", "bulk-1", "stream-1", "bulk-2"], order
+    print(f"[PASS] Interactive work preempts queued bulk work; starved lanes still run: {order}")
+
+    # Bulk work is split into chunks returned in order
+    parts = await executor.run_chunked(lambda chunk, scale: [x * scale for x in chunk], list(range(5)), 10, chunk_size=2)
+    assert parts == [[0, 10], [20, 30], [40]]
+
+    lanes = executor.get_stats()["lanes"]
+    assert lanes[BULK_LANE]["completed"] == 5 and lanes[INTERACTIVE_LANE]["completed"] == 4
+    assert lanes[BULK_LANE]["p99_ms"] >= lanes[BULK_LANE]["p50_ms"] and lanes[INTERACTIVE_LANE]["p99_ms"] > 0
+    try:
+        await executor.run(len, "x", lane="urgent")
+        assert False, "Expected ValueError for unknown lane"
+    except ValueError:
+        pass
+    executor.shutdown()
+    print(f"[PASS] Chunked bulk runs and per-lane latency: {lanes[BULK_LANE]}")
+
+    # max_skips=0 is honoured (no lane is ever passed over); a `lane` keyword
+    # reaches the wrapped function through functools.partial
+    import functools
+
+    executor = InferenceExecutor(max_workers=1, intra_op_threads=1, max_skips=0)
+    assert executor.get_stats()["lane_max_skips"] == 0
+    tagged = await executor.run(functools.partial(lambda text, lane: f"{lane}:{text}", lane="left"), "x")
+    assert tagged == "left:x"
+    executor.shutdown()
+    print("[PASS] Explicit max_skips=0 kept; lane kwarg passed via partial")
+
+    # /batch/* endpoints: chunks are cut from texts sorted by token length,
+    # results come back in input order
+    from app.core.executor import shutdown_executor
+    from types import SimpleNamespace
+    from app.main import run_batch_chunked
+
+    class CountTokenizer:
+        def get_vocab(self):
+            return {}
+
+        def __call__(self, texts, truncation=True, max_length=512):
+            ids = [[0] * (len(text.split()) + 2) for text in texts]
+            return {"input_ids": ids, "attention_mask": ids}
+
+    class Pipe:
+        tokenizer = CountTokenizer()
+
+    chunks = []
+
+    def batch_fn(texts, emotion_model):
+        chunks.append(list(texts))
+        return SimpleNamespace(results=list(texts))
+
+    os.environ["NLP_BULK_CHUNK_SIZE"] = "2"
+    shutdown_executor()
+    try:
+        texts = ["a b c d e", "a", "a b c d", "a b", "a b c"]
+        response = await run_batch_chunked(batch_fn, texts, dict, emotion_model=Pipe())
+    finally:
+        del os.environ["NLP_BULK_CHUNK_SIZE"]
+        shutdown_executor()
+    assert sorted(chunks) == [["a", "a b"], ["a b c", "a b c d"], ["a b c d e"]]
+    assert response == {"results": texts, "count": 5}
+    print("[PASS] Bulk chunks bucketed by token length, results in input order")
+
+    print("\n[OK] Executor module tests passed!")
+
+
+def test_parallel_module():
+    """Test parallel model group execution."""
+    print("\n" + "=" * 60)
+    print("TEST: Parallel Module")
+    print("=" * 60)
+
+    import time
+    from app.core.parallel import ModelGroupRunner, thread_budgets, PARALLEL, SEQUENTIAL
+
+    def slow(value):
+        time.sleep(0.05)
+        return value
+
+    def fail():
+        raise ValueError("boom")
+
+    tasks = {
+        "a": lambda: slow(1),
+        "b": lambda: slow(2),
+        "c": lambda: slow(3),
+        "d": fail,
+    }
+
+    runner = ModelGroupRunner(mode=PARALLEL, max_workers=4, total_threads=8)
+    start = time.perf_counter()
+    outcomes = runner.run(tasks)
+    elapsed = time.perf_counter() - start
+    assert [outcomes[k][0] for k in "abc"] == [1, 2, 3]
+    assert isinstance(outcomes["d"][1], ValueError)
+    assert elapsed < 0.14, f"parallel run took {elapsed:.3f}s"
+    print(f"[PASS] Parallel groups run concurrently ({elapsed * 1000:.0f}ms), failures isolated")
+    runner.shutdown()
+
+    runner = ModelGroupRunner(mode=SEQUENTIAL)
+    outcomes = runner.run(tasks)
+    assert outcomes["c"][0] == 3 and outcomes["d"][0] is None
+    assert runner.get_stats()["failed_tasks"] == 1
+    print("[PASS] Sequential mode runs the same tasks in order")
+
+    budgets = thread_budgets(["a", "b", "c"], total_threads=16)
+    assert budgets == {"a": 5, "b": 5, "c": 5}
+    print(f"[PASS] Thread budgets split: {budgets}")
+
+    print("\n[OK] Parallel module tests passed!")
+
+
+def test_backends_module():
+    """Test backend selection and drift comparison."""
+    print("\n" + "=" * 60)
+    print("TEST: Backends Module")
+    print("=" * 60)
+
+    import os
+    from app.core.backends import get_backend, compare_outputs, TORCH, ONNX_INT8
+
+    os.environ["NLP_BACKEND_NER_MODEL"] = "onnx-int8"
+    try:
+        assert get_backend("ner_model") == ONNX_INT8
+        assert get_backend("finbert") == TORCH
+    finally:
+        del os.environ["NLP_BACKEND_NER_MODEL"]
+    print("[PASS] Per-model backend selection")
+
+    from app.core.backends import _onnx_dir
+
+    os.environ["NLP_DATA_DIR"] = "/srv/nlp-data"
+    try:
+        assert _onnx_dir("org/model", "int8") == "/srv/nlp-data/onnx/org__model/int8"
+    finally:
+        del os.environ["NLP_DATA_DIR"]
+    print("[PASS] ONNX exports cached under NLP_DATA_DIR")
+
+    reference = [
+        {"label": "positive", "score": 0.90},
+        [{"label": "joy", "score": 0.7}, {"label": "fear", "score": 0.3}],
+        [{"entity_group": "ORG", "start": 0, "end": 5, "score": 0.99}],
+    ]
+    candidate = [
+        {"label": "positive", "score": 0.88},
+        [{"label": "joy", "score": 0.4}, {"label": "fear", "score": 0.6}],
+        [{"entity_group": "ORG", "start": 0, "end": 5, "score": 0.97}],
+    ]
+    report = compare_outputs(reference, candidate)
+    assert report.samples == 3
+    assert abs(report.label_agreement - 2 / 3) < 1e-9
+    assert abs(report.max_score_delta - 0.02) < 1e-9
+    print(f"[PASS] Drift report: {report.to_dict()}")
+
+    import app.core.backends as backends
+
+    def fake_pipe(texts, **kwargs):
+        return [{"label": "positive", "score": 0.9} for _ in texts]
+
+    references = []
+
+    def torch_factory():
+        references.append(fake_pipe)
+        return fake_pipe
+
+    original = backends.build_onnx_pipeline
+    backends.build_onnx_pipeline = lambda *args, **kwargs: fake_pipe
+    os.environ["NLP_ONNX_DRIFT_CHECK"] = "true"
+    try:
+        with backends.drift_check_suspended():
+            backends.build_pipeline("text-classification", "org/model", -1, ONNX_INT8, torch_factory)
+        assert references == []
+        assert backends.get_backend_info()["org/model"]["drift"] is None
+
+        backends.build_pipeline("text-classification", "org/model", -1, ONNX_INT8, torch_factory)
+        assert len(references) == 1
+        assert backends.get_backend_info()["org/model"]["backend"] == ONNX_INT8
+    finally:
+        backends.build_onnx_pipeline = original
+        del os.environ["NLP_ONNX_DRIFT_CHECK"]
+        backends._backend_info.pop("org/model", None)
+    print("[PASS] Drift check skipped during preload, runs otherwise")
+
+    print("\n[OK] Backends module tests passed!")
+
+
+def test_procpool_module():
+    """Test process-pool inference over shared memory."""
+    print("\n" + "=" * 60)
+    print("TEST: Process Pool Module")
+    print("=" * 60)
+
+    from app.core.procpool import InferenceProcessPool, RemotePipeline
+
+    # Stand-in registry: builtins as "models" (picklable, no torch needed)
+    pool = InferenceProcessPool(
+        processes=1,
+        registry_factory="types:SimpleNamespace",
+        factory_kwargs={"sorted": sorted, "len": len},
+        slots=2,
+        slot_bytes=64 * 1024,
+        min_shm_bytes=64,
+    )
+    try:
+        models = pool.start(timeout=60)
+        assert set(models) == {"sorted", "len"}
+        print(f"[PASS] Process pool started, models: {sorted(models)}")
+
+        remote = RemotePipeline(pool, "sorted")
+        assert remote(["b", "a"]) == ["a", "b"]
+        texts = [f"text {i:05d}" for i in range(2000, 0, -1)]
+        assert remote(texts) == sorted(texts)
+        print("[PASS] Inline and shared-memory payloads round-trip")
+
+        try:
+            pool.call("len", "x", batch_size=1)
+            print("[FAIL] Should have raised RuntimeError")
+        except RuntimeError as e:
+            assert "TypeError" in str(e)
+            print("[PASS] Worker exceptions propagate")
+
+        stats = pool.get_stats()
+        assert stats["requests"] == 3
+        assert stats["shm_payloads"] >= 1 and stats["inline_payloads"] >= 1
+        assert stats["free_slots"] == 2
+        print(f"[PASS] Process pool stats: {stats}")
+    finally:
+        pool.shutdown()
+
+    # A process that dies while loading fails start() right away
+    import threading
+    started = time.perf_counter()
+    broken = InferenceProcessPool(processes=1, registry_factory="builtins:int", factory_kwargs={"x": 1}, slots=1)
+    try:
+        broken.start(timeout=600)
+        assert False, "start() should fail"
+    except RuntimeError as e:
+        assert "exited while loading" in str(e)
+    assert time.perf_counter() - started < 60
+    print("[PASS] Process dying while loading fails start() immediately")
+
+    # A process exiting mid-call fails only its own call and frees its
+    # slot; a call running in the other process completes. A call past
+    # the timeout fails but keeps its slot until its result arrives.
+    from app.core import procpool
+
+    check_seconds, procpool.WORKER_CHECK_SECONDS = procpool.WORKER_CHECK_SECONDS, 0.1
+    pool = InferenceProcessPool(
+        processes=2,
+        registry_factory="types:SimpleNamespace",
+        factory_kwargs={"sleep": time.sleep, "exit": os._exit},
+        slots=4,
+        slot_bytes=64 * 1024,
+        min_shm_bytes=0,
+        call_timeout=1.0,
+    )
+    try:
+        pool.start(timeout=60)
+        outcome = {}
+        sleeper = threading.Thread(target=lambda: outcome.setdefault("sleep", pool.call("sleep", 0.6)))
+        sleeper.start()
+        time.sleep(0.1)
+        try:
+            pool.call("exit", 3)
+            assert False, "Call in the exited process should fail"
+        except RuntimeError as e:
+            assert "exited" in str(e)
+        sleeper.join()
+        assert outcome == {"sleep": None}
+        stats = pool.get_stats()
+        assert stats["alive"] == 1 and stats["lost_to_exit"] == 1 and stats["free_slots"] == 4
+        print("[PASS] Exited process fails only its own call, slot freed")
+
+        try:
+            pool.call("sleep", 1.5)
+            assert False, "Call should time out"
+        except TimeoutError:
+            pass
+        assert pool.get_stats()["free_slots"] == 3
+        time.sleep(1.0)
+        stats = pool.get_stats()
+        assert stats["timeouts"] == 1 and stats["free_slots"] == 4 and stats["in_flight"] == 0
+        print("[PASS] Timed-out call fails, its slot freed once the result arrives")
+    finally:
+        pool.shutdown()
+        procpool.WORKER_CHECK_SECONDS = check_seconds
+
+    print("\n[OK] Process pool module tests passed!")
+
+
+async def test_microbatch_module():
+    """Test cross-request micro-batching."""
+    print("\n" + "=" * 60)
+    print("TEST: Micro-batch Module")
+    print("=" * 60)
+
+    from app.core.executor import InferenceExecutor
+    from app.core.microbatch import MicroBatcher
+
+    calls = []
+
+    def upper_pipeline(texts, batch_size=None):
+        calls.append(list(texts))
+        return [{"label": t.upper(), "score": 1.0} for t in texts]
+
+    executor = InferenceExecutor(max_workers=1, intra_op_threads=1)
+    batcher = MicroBatcher(
+        "upper", upper_pipeline, max_batch_size=8, max_wait_ms=20, executor=executor
+    )
+
+    # Test concurrent submits coalesce into one call, in order
+    results = await asyncio.gather(*(batcher.submit(t) for t in ["a", "b", "c"]))
+    assert [r["label"] for r in results] == ["A", "B", "C"]
+    assert calls == [["a", "b", "c"]]
+    print("[PASS] Concurrent requests coalesced into one batch")
+
+    # Test max batch size triggers an immediate flush
+    results = await asyncio.gather(*(batcher.submit(str(i)) for i in range(10)))
+    assert len(results) == 10
+    assert [len(c) for c in calls[1:]] == [8, 2]
+    print("[PASS] Batches split at max_batch_size")
+
+    stats = batcher.get_stats()
+    assert stats["batches"] == 3
+    print(f"[PASS] Micro-batch stats: {stats}")
+
+    executor.shutdown()
+
+    print("\n[OK] Micro-batch module tests passed!")
+
+
+async def test_batch_stream_module():
+    """Test NDJSON streaming batch ingestion."""
+    print("\n" + "=" * 60)
+    print("TEST: Batch Stream (NDJSON)")
+    print("=" * 60)
+
+    import json
+    from app.api import batch_analyze
+    from app.api.batch_analyze import iter_ndjson_lines, parse_stream_line, stream_batch_analysis
+
+    async def body(*parts):
+        for part in parts:
+            yield part
+
+    # Lines split across network chunks; blank and oversized lines handled
+    lines = [line async for line in iter_ndjson_lines(
+        body(b'"one"\n{"id": 7, "te', b'xt": "two"}\n\n', b"x" * 50, b'\n"three"'),
+        max_line_bytes=20,
+    )]
+    assert lines == [b'"one"', b'{"id": 7, "text": "two"}', b"", b'"three"']
+    assert parse_stream_line(lines[1]) == (7, "two")
+    for bad in (b"", b"{oops", b"42", b'{"text": "  "}'):
+        try:
+            parse_stream_line(bad)
+            assert False, bad
+        except ValueError:
+            pass
+    print("[PASS] NDJSON lines parsed incrementally")
+
+    chunks = []
+
+    def fake_batch_inference(texts, registry, batch_size):
+        chunks.append(list(texts))
+        return [{"sentiment": 0.0, "emotion": t, "entities": [], "confidence": 1.0} for t in texts], {}
+
+    original = batch_analyze.run_batch_inference
+    batch_analyze.run_batch_inference = fake_batch_inference
+    try:
+        payload = b"".join(
+            json.dumps({"id": f"r{i}", "text": f"t{i}"}).encode() + b"\n" for i in range(10)
+        ) + b"not json\n"
+        out = b"".join([part async for part in stream_batch_analysis(
+            iter_ndjson_lines(body(payload)), registry=None, batch_size=8,
+            include_stats=True, chunk_size=4, max_inflight=2,
+        )])
+    finally:
+        batch_analyze.run_batch_inference = original
+
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert [row["index"] for row in rows[:-1]] == list(range(11))
+    assert rows[3]["id"] == "r3" and rows[3]["emotion"] == "t3"
+    assert rows[10] == {"index": 10, "error": "invalid JSON"}
+    assert rows[-1]["stats"]["total_texts"] == 11 and rows[-1]["stats"]["errors"] == 1
+    print("[PASS] Results streamed in input order, in chunks")
+
+    # /batch-analyze bulk chunks: every copy of a text lands in one chunk
+    chunks.clear()
+
+    def fake_stats_inference(texts, registry, batch_size):
+        results, _ = fake_batch_inference(texts, registry, batch_size)
+        unique = len(set(texts))
+        return results, {"unique_texts": unique, "duplicate_texts": len(texts) - unique,
+                         "tokens_processed": 3 * unique, "tokens_padded": unique,
+                         "forward_ms": {"finbert": 1.5}, "full_analysis_mode": "sequential"}
+
+    batch_analyze.run_batch_inference = fake_stats_inference
+    os.environ["NLP_BULK_CHUNK_SIZE"] = "2"
+    try:
+        texts = ["a", "b", "a", "c", "b", "d", "a"]
+        results, run_stats = await batch_analyze.run_bulk_inference(texts, None, 8)
+    finally:
+        batch_analyze.run_batch_inference = original
+        del os.environ["NLP_BULK_CHUNK_SIZE"]
+
+    assert chunks == [["a", "a", "a", "b", "b"], ["c", "d"]]
+    assert [r["emotion"] for r in results] == texts
+    assert run_stats["unique_texts"] == 4 and run_stats["duplicate_texts"] == 3
+    assert run_stats["padding_ratio"] == 0.25 and run_stats["forward_ms"] == {"finbert": 3.0}
+    assert run_stats["full_analysis_mode"] == "sequential"
+    print(f"[PASS] Bulk request split into lane chunks, stats merged: {run_stats}")
+
+    # A client gone mid-stream surfaces as ClientDisconnect, not a send() error
+    from starlette.requests import ClientDisconnect
+
+    async def broken_send(message):
+        raise OSError("connection reset")
+
+    response = batch_analyze.DuplexStreamingResponse(
+        body(b"row\n"), media_type="application/x-ndjson", upload_done=asyncio.Event()
+    )
+    try:
+        await response({"type": "http", "asgi": {"spec_version": "2.4"}}, None, broken_send)
+        assert False, "send() failure should raise"
+    except ClientDisconnect:
+        pass
+    print("[PASS] Failed send() raises ClientDisconnect")
+
+    # Under ASGI < 2.4 the response never reads request body messages
+    # while the upload is still being read
+    received, sent = [], []
+
+    async def receive():
+        received.append(True)
+        return {"type": "http.request", "body": b"", "more_body": True}
+
+    async def send(message):
+        sent.append(message.get("body"))
+
+    response = batch_analyze.DuplexStreamingResponse(
+        body(b"a\n", b"b\n"), media_type="application/x-ndjson", upload_done=asyncio.Event()
+    )
+    await response({"type": "http", "asgi": {"spec_version": "2.3"}}, receive, send)
+    assert received == [] and sent == [None, b"a\n", b"b\n", b""]
+    print("[PASS] Streaming response leaves the request body to request.stream()")
+
+    # Client disconnects through the endpoint (ASGI 2.3): one worker, so the
+    # first chunk runs and the rest queue behind it
+    from fastapi import FastAPI
+    from app.core.executor import shutdown_executor
+
+    api = FastAPI()
+    api.include_router(batch_analyze.router)
+    api.state.models = None
+    calls = []
+
+    def slow_batch_inference(texts, registry, batch_size):
+        calls.append(list(texts))
+        time.sleep(0.2)
+        return fake_batch_inference(texts, registry, batch_size)
+
+    async def post_stream(messages):
+        """Run the endpoint; receive() plays `messages`, then hangs."""
+        queue = list(messages)
+        sent = []
+
+        async def receive():
+            if not queue:
+                await asyncio.Event().wait()
+            delay, message = queue.pop(0)
+            await asyncio.sleep(delay)
+            return message
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "http_version": "1.1",
+            "method": "POST", "scheme": "http", "path": "/batch-analyze/stream", "raw_path": b"/batch-analyze/stream",
+            "root_path": "", "query_string": b"", "headers": [(b"content-type", b"application/x-ndjson")],
+            "client": ("test", 1), "server": ("testserver", 80),
+        }
+        started = time.perf_counter()
+        await asyncio.wait_for(api(scope, receive, send), timeout=5)
+        return sent, time.perf_counter() - started
+
+    rows = b"".join(f'"t{i}"\n'.encode() for i in range(6))
+    batch_analyze.run_batch_inference = slow_batch_inference
+    os.environ["NLP_INFERENCE_WORKERS"] = "1"
+    os.environ["NLP_STREAM_CHUNK_SIZE"] = "2"
+    os.environ["NLP_STREAM_MAX_INFLIGHT"] = "4"  # The whole upload is read at once
+    shutdown_executor()
+    try:
+        # Gone partway through the upload: ClientDisconnect from
+        # request.stream() ends the stream and cancels queued chunks
+        sent, elapsed = await post_stream([
+            (0, {"type": "http.request", "body": rows[:12], "more_body": True}),
+            (0.05, {"type": "http.disconnect"}),
+        ])
+        assert elapsed < 0.2 and sent[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+        await asyncio.sleep(0.3)
+        assert calls == [["t0", "t1"]]
+        print("[PASS] Disconnect mid-upload ends the stream, queued chunks cancelled")
+
+        # Gone after the upload: normal disconnect handling is back
+        calls.clear()
+        sent, elapsed = await post_stream([
+            (0, {"type": "http.request", "body": rows, "more_body": False}),
+            (0.05, {"type": "http.disconnect"}),
+        ])
+        assert elapsed < 0.2 and not any(message.get("body") for message in sent)
+        await asyncio.sleep(0.3)
+        assert calls == [["t0", "t1"]]
+        print("[PASS] Disconnect after the upload detected, queued chunks cancelled")
+    finally:
+        batch_analyze.run_batch_inference = original
+        del os.environ["NLP_INFERENCE_WORKERS"], os.environ["NLP_STREAM_CHUNK_SIZE"]
+        del os.environ["NLP_STREAM_MAX_INFLIGHT"]
+        shutdown_executor()
+
+    print("\n[OK] Batch stream tests passed!")
+
+
+async def test_jobs_module():
+    """Test background batch jobs with disk persistence."""
+    print("\n" + "=" * 60)
+    print("TEST: Batch Jobs")
+    print("=" * 60)
+
+    import tempfile
+    from app.api import jobs
+    from app.api.jobs import JobManager, JobStatus, JobStore
+
+    chunks = []
+
+    def fake_job_chunk(texts, registry, batch_size):
+        chunks.append(list(texts))
+        return [{"sentiment": 0.1, "emotion": t, "entities": [], "confidence": 0.9} for t in texts]
+
+    original = jobs.run_job_chunk
+    jobs.run_job_chunk = fake_job_chunk
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "jobs.db")
+
+            # A job interrupted after its first chunk (as if the process died)
+            store = JobStore(path)
+            interrupted = store.create([f"old {i}" for i in range(5)])
+            assert store.claim(interrupted.id, "dead-worker", lease_seconds=0.01)
+            assert store.save_chunk(
+                interrupted.id, [(0, {"sentiment": 0.0, "emotion": "old 0", "entities": [], "confidence": 1.0})],
+                0.5, "dead-worker", lease_seconds=0.01,
+            )
+            store.close()
+            await asyncio.sleep(0.02)  # Lease expired
+
+            manager = JobManager(store=JobStore(path), workers=1, chunk_size=2)
+            await manager.start(registry=None)
+            job = await manager.submit([f"text {i}" for i in range(5)], batch_size=8)
+            assert job.status == JobStatus.QUEUED
+
+            for _ in range(200):
+                if all(manager.get(j).is_finished for j in (interrupted.id, job.id)):
+                    break
+                await asyncio.sleep(0.01)
+
+            resumed = manager.get(interrupted.id)
+            assert resumed.status == JobStatus.COMPLETED and resumed.processed == 5
+            assert chunks[:2] == [["old 1", "old 2"], ["old 3", "old 4"]]
+            print("[PASS] Interrupted job resumed after its last chunk")
+
+            done = manager.get(job.id)
+            progress = done.progress()
+            assert done.status == JobStatus.COMPLETED and progress["percent"] == 100.0
+            assert progress["throughput_per_sec"] is not None and progress["eta_seconds"] is None
+            page = manager.store.results(job.id, offset=2, limit=2)
+            assert [idx for idx, _ in page] == [2, 3] and page[0][1]["emotion"] == "text 2"
+            print(f"[PASS] Job completed in chunks, results paginated: {progress}")
+
+            # Finished jobs never change state
+            assert manager.cancel(job.id).status == JobStatus.COMPLETED
+            assert manager.get_stats()["completed"] == 2
+            await manager.stop()
+            print("[PASS] Finished jobs are immutable")
+
+            # Claims are atomic: a running job with a live lease cannot be
+            # taken, an expired one can; the old owner then stops writing
+            store = JobStore(path)
+            shared = store.create(["a", "b"])
+            assert store.claim(shared.id, "worker-1", lease_seconds=60)
+            assert not store.claim(shared.id, "worker-2", lease_seconds=60)
+            assert store.expired() == []
+            assert store.save_chunk(shared.id, [(0, {"emotion": "a"})], 0.1, "worker-1", lease_seconds=0.01)
+            await asyncio.sleep(0.02)
+            assert [job.id for job in store.expired()] == [shared.id]
+            assert store.claim(shared.id, "worker-2", lease_seconds=60)
+            assert not store.save_chunk(shared.id, [(1, {"emotion": "b"})], 0.1, "worker-1", lease_seconds=60)
+            assert not store.set_status(shared.id, JobStatus.COMPLETED, owner="worker-1")
+            assert store.get(shared.id).processed == 1 and store.results(shared.id, 0, 2) == [(0, {"emotion": "a"})]
+            store.close()
+            print("[PASS] Job claims leased; a lost lease stops the old owner")
+
+            # Two managers on one database (two gunicorn workers) run each
+            # job once, whichever claims it first
+            chunks.clear()
+            managers = [JobManager(store=JobStore(path), workers=2, chunk_size=2) for _ in range(2)]
+            await managers[0].start(registry=None)
+            submitted = [await managers[0].submit([f"job{j} {i}" for i in range(4)]) for j in range(3)]
+            await managers[1].start(registry=None)
+            for job in submitted:
+                managers[1]._queue.put_nowait(job.id)  # As if both saw every job
+            for _ in range(200):
+                if all(managers[0].get(job.id).is_finished for job in submitted):
+                    break
+                await asyncio.sleep(0.01)
+            ran = sorted(text for chunk in chunks for text in chunk)
+            assert ran == sorted(f"job{j} {i}" for j in range(3) for i in range(4))
+            assert all(managers[0].get(job.id).processed == 4 for job in submitted)
+            for manager in managers:
+                await manager.stop()
+            print("[PASS] Managers sharing a database run each job once")
+    finally:
+        jobs.run_job_chunk = original
+
+    print("\n[OK] Batch jobs tests passed!")
+
+
+def test_model_loading_module():
+    """Test parallel, serial and lazy model loading, /ready and job readiness."""
+    print("\n" + "=" * 60)
+    print("TEST: Model Loading")
+    print("=" * 60)
+
+    from app import models
+
+    import tempfile
+    import threading
+    from types import SimpleNamespace
+    from fastapi.testclient import TestClient
+    from app.api import jobs
+    from app.api.jobs import JobManager, JobStatus, JobStore
+
+    class FakePipe:
+        tokenizer = SimpleNamespace()
+
+        def __call__(self, inputs, **kwargs):
+            return [{"label": "positive", "score": 0.9} for _ in inputs]
+
+    loads = []
+    active = {"now": 0, "peak": 0}
+    failing = set()
+    lock = threading.Lock()
+
+    def fake_load_pipeline_safe(task, model_name, **kwargs):
+        with lock:
+            loads.append(model_name)
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.1)
+        with lock:
+            active["now"] -= 1
+        return None if model_name in failing else FakePipe()
+
+    def new_registry(mode):
+        loads.clear()
+        active.update(now=0, peak=0)
+        registry = models.create_registry()
+        registry.loading_mode = mode
+        return registry
+
+    original = models.load_pipeline_safe
+    models.load_pipeline_safe = fake_load_pipeline_safe
+    try:
+        # Parallel: loads overlap, startup takes about one load instead of five
+        registry = new_registry(models.PARALLEL_LOADING)
+        assert not registry.is_ready()
+        start = time.perf_counter()
+        models.load_models(registry)
+        elapsed = time.perf_counter() - start
+        assert len(loads) == len(models.MODEL_SPECS) and active["peak"] > 1
+        assert elapsed < 0.1 * len(models.MODEL_SPECS)
+        assert registry.is_ready()
+        assert {state.state for state in registry.get_load_states()} == {models.LOADED}
+        print(f"[PASS] Parallel loading: peak {active['peak']} loads at once, {elapsed:.2f}s")
+
+        registry = new_registry(models.SERIAL_LOADING)
+        models.load_models(registry)
+        assert len(loads) == len(models.MODEL_SPECS) and active["peak"] == 1
+        print("[PASS] Serial loading: one model at a time")
+
+        # Lazy: nothing loads up front; concurrent first calls load once
+        registry = new_registry(models.LAZY_LOADING)
+        models.install_lazy_pipelines(registry)
+        assert loads == [] and registry.is_ready()
+        lazy = registry.finbert
+        outputs = []
+        threads = [threading.Thread(target=lambda: outputs.append(lazy(["Apple rose"]))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert [out[0]["label"] for out in outputs] == ["positive"] * 4
+        assert loads == [models.MODEL_SPECS["finbert"][1]]
+        assert registry.is_model_loaded("finbert") and not registry.is_model_loaded("finbert_tone")
+        assert not isinstance(registry.finbert, models.LazyPipeline)
+        print("[PASS] Lazy loading: loaded once, on first use")
+
+        # A failed lazy load raises and makes the model unready
+        failing.add(models.MODEL_SPECS["emotion_classifier"][1])
+        try:
+            registry.emotion_classifier(["text"])
+            raise AssertionError("Failed lazy load should raise")
+        except RuntimeError:
+            pass
+        failing.clear()
+        assert registry.load_states["emotion_classifier"].state == models.FAILED
+        assert not registry.is_ready() and registry.is_ready(["finbert", "ner_model"])
+        print("[PASS] Failed lazy load reported as not ready")
+
+        # /ready: 503 until the required models are loaded, 200 after
+        from app.main import app
+
+        registry = new_registry(models.PARALLEL_LOADING)
+        app.state.models = registry
+        client = TestClient(app)
+        response = client.get("/ready")
+        assert response.status_code == 503 and response.json()["ready"] is False
+        models.load_models(registry, ["finbert"])
+        assert client.get("/ready").status_code == 503
+        models.load_models(registry)
+        response = client.get("/ready")
+        assert response.status_code == 200 and response.json()["models_loaded"] == len(models.MODEL_SPECS)
+        print("[PASS] /ready returns 503 while loading, 200 once loaded")
+
+        # Jobs queued while models load start only once they are ready
+        async def run_job_while_loading(path):
+            registry = new_registry(models.PARALLEL_LOADING)
+            manager = JobManager(store=JobStore(path), workers=1, chunk_size=2)
+            await manager.start(registry)
+            job = await manager.submit(["a", "b", "c"], batch_size=8)
+            await asyncio.sleep(0.1)
+            assert manager.get(job.id).status == JobStatus.QUEUED and chunks == []
+
+            await asyncio.to_thread(models.load_models, registry)
+            for _ in range(200):
+                if manager.get(job.id).is_finished:
+                    break
+                await asyncio.sleep(0.01)
+            assert manager.get(job.id).status == JobStatus.COMPLETED
+            assert chunks == [["a", "b"], ["c"]]
+            await manager.stop()
+
+        chunks = []
+
+        def fake_job_chunk(texts, registry, batch_size):
+            assert registry.is_ready()
+            chunks.append(list(texts))
+            return [{"sentiment": 0.1, "emotion": "joy", "entities": [], "confidence": 0.9} for _ in texts]
+
+        original_chunk, original_poll = jobs.run_job_chunk, jobs.READY_POLL_SECONDS
+        jobs.run_job_chunk, jobs.READY_POLL_SECONDS = fake_job_chunk, 0.01
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                asyncio.run(run_job_while_loading(os.path.join(tmp, "jobs.db")))
+        finally:
+            jobs.run_job_chunk, jobs.READY_POLL_SECONDS = original_chunk, original_poll
+        print("[PASS] Jobs wait until the models are ready")
+    finally:
+        models.load_pipeline_safe = original
+
+    print("\n[OK] Model loading tests passed!")
+
+
+def _fake_stream_registry(delays=None, calls=None):
+    """
+    ModelRegistry of stand-in pipelines that sleep `delays[key]` seconds
+    per call and record (key, texts, started, finished) in `calls`.
+    """
+    from app.models import ModelRegistry
+
+    delays = delays or {}
+    outputs = {
+        "finbert": lambda text: {"label": "positive", "score": 0.9},
+        "finbert_tone": lambda text: {"label": "Positive", "score": 0.8},
+        "twitter_sentiment": lambda text: {"label": "LABEL_2", "score": 0.7},
+        "emotion_classifier": lambda text: [{"label": "joy", "score": 0.6}, {"label": "fear", "score": 0.4}],
+        "ner_model": lambda text: [{"word": text.split()[0], "entity_group": "ORG", "score": 0.99,
+                                    "start": 0, "end": len(text.split()[0])}],
+    }
+
+    def fake_pipeline(key):
+        def pipe(inputs, **kwargs):
+            texts = [inputs] if isinstance(inputs, str) else list(inputs)
+            started = time.perf_counter()
+            time.sleep(delays.get(key, 0.0))
+            if calls is not None:
+                calls.append((key, texts, started, time.perf_counter()))
+            results = [outputs[key](text) for text in texts]
+            # A single string: classifiers return [result], NER the entity list
+            if isinstance(inputs, str) and key == "ner_model":
+                return results[0]
+            return results
+        return pipe
+
+    return ModelRegistry(**{key: fake_pipeline(key) for key in outputs})
+
+
+async def _read_sse(stream):
+    """Parse an SSE stream into (event, data) pairs."""
+    import json
+
+    frames = "".join([chunk async for chunk in stream]).split("\n\n")
+    events = []
+    for frame in filter(None, frames):
+        event_line, data_line = frame.split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+async def test_sse_batch_stream():
+    """Test pipelined /stream/batch SSE events."""
+    print("\n" + "=" * 60)
+    print("TEST: SSE Batch Stream")
+    print("=" * 60)
+
+    from app import streaming
+
+    from app.core.executor import shutdown_executor
+
+    calls = []
+    registry = _fake_stream_registry(
+        delays={"finbert": 0.1, "twitter_sentiment": 0.1, "emotion_classifier": 0.1, "ner_model": 0.1},
+        calls=calls,
+    )
+    texts = [f"Company{i} shares rose" for i in range(5)]
+    before = streaming.get_streaming_stats()["batch"]
+
+    os.environ["NLP_INFERENCE_WORKERS"] = "8"
+    os.environ["NLP_SSE_SUB_BATCH"] = "2"
+    shutdown_executor()
+    try:
+        events = await _read_sse(streaming.stream_batch_analysis(texts, registry))
+    finally:
+        del os.environ["NLP_INFERENCE_WORKERS"], os.environ["NLP_SSE_SUB_BATCH"]
+        shutdown_executor()
+
+    # One call per model per sub-batch of 2; the next sub-batch is queued
+    # while the current one runs
+    sub_batches = [[f"Company{i} shares rose" for i in range(s, min(s + 2, 5))] for s in (0, 2, 4)]
+    for key in ("finbert", "finbert_tone", "twitter_sentiment", "emotion_classifier", "ner_model"):
+        assert sorted(batch for k, batch, _, _ in calls if k == key) == sub_batches, key
+    first_end = max(end for key, batch, _, end in calls if batch == sub_batches[0])
+    second_start = min(start for key, batch, start, _ in calls if batch == sub_batches[1])
+    assert second_start < first_end
+    print(f"[PASS] {len(calls)} batched model calls over 3 sub-batches, pipelined")
+
+    # Per text: text_start, start, progress x4, model_complete x4, complete, text_complete
+    assert events[0] == ("batch_start", {"total_texts": 5, "models": ["finance", "social", "emotion", "ner"]})
+    for index, text in enumerate(texts):
+        tagged = [event for event, data in events if data.get("text_index") == index]
+        assert tagged[:2] == ["text_start", "start"] and tagged[-2:] == ["complete", "text_complete"]
+        assert tagged.count("progress") == 4 and tagged.count("model_complete") == 4
+        completed = {data["result_type"]: data["result"] for event, data in events
+                     if event == "model_complete" and data["text_index"] == index}
+        assert completed["ner"]["entities"][0]["entity"] == f"Company{index}"
+        assert completed["emotion"]["primary_emotion"] == "joy"
+        full = next(data["full_result"] for event, data in events
+                    if event == "complete" and data["text_index"] == index)
+        assert full["text"] == text and full["social_sentiment"]["label"] == "positive"
+        assert full["finance_sentiment"]["ensemble"]["label"] == "positive"
+    assert all("text_index" in data for event, data in events[1:-1])
+    # Each text's events are contiguous, texts in input order
+    indices = [data["text_index"] for event, data in events[1:-1]]
+    assert indices == sorted(indices)
+    print("[PASS] Events tagged with text_index, per-text results complete")
+
+    event, summary = events[-1]
+    assert event == "batch_complete" and summary["total_texts"] == 5
+    assert [result["text"] for result in summary["results"]] == texts
+    after = streaming.get_streaming_stats()["batch"]
+    assert after["streams"] == before["streams"] + 1 and after["completed"] == before["completed"] + 1
+    assert after["cancelled_work_units"] == before["cancelled_work_units"]
+    print(f"[PASS] batch_complete carries all {len(texts)} results in order")
+
+    print("\n[OK] SSE batch stream tests passed!")
+
+
+async def test_sse_single_stream():
+    """Test concurrent /stream/analyze SSE events and first-result latency."""
+    print("\n" + "=" * 60)
+    print("TEST: SSE Single Stream")
+    print("=" * 60)
+
+    from app import streaming
+
+    from app.core.executor import shutdown_executor
+
+    # Slowest model first: results arrive in completion order
+    registry = _fake_stream_registry(
+        delays={"finbert": 0.3, "twitter_sentiment": 0.05, "emotion_classifier": 0.2, "ner_model": 0.1},
+    )
+    latency = streaming._latency["single"]
+    streams, completed = latency.streams, latency.completed
+
+    os.environ["NLP_INFERENCE_WORKERS"] = "4"
+    shutdown_executor()
+    try:
+        start = time.perf_counter()
+        events = await _read_sse(streaming.stream_single_analysis("Apple shares rose", registry))
+        elapsed = time.perf_counter() - start
+    finally:
+        del os.environ["NLP_INFERENCE_WORKERS"]
+        shutdown_executor()
+
+    names = [event for event, _ in events]
+    assert names == ["start"] + ["progress"] * 4 + ["model_complete"] * 4 + ["complete"]
+    done = [data for event, data in events if event == "model_complete"]
+    assert [data["model"] for data in done] == ["social", "ner", "emotion", "finance"]
+    assert [data["step"] for data in done] == [2, 4, 3, 1]
+    assert elapsed < 0.5  # Concurrent: about the slowest model, not the 0.65s sum
+    print(f"[PASS] Models ran concurrently, results in completion order ({elapsed:.2f}s)")
+
+    full = events[-1][1]["full_result"]
+    assert full["text"] == "Apple shares rose" and full["ner"]["entities"][0]["entity"] == "Apple"
+    assert full["finance_sentiment"]["ensemble"]["label"] == "positive"
+    assert full["emotion"]["primary_emotion"] == "joy" and full["social_sentiment"]["label"] == "positive"
+    print("[PASS] complete event carries every model's result")
+
+    # Time to first result is the fastest model, not the first in order
+    assert latency.streams == streams + 1 and latency.completed == completed + 1
+    first_ms, total_ms = latency.first_result_ms[-1], latency.total_ms[-1]
+    assert 40 <= first_ms < 250 and total_ms >= 290 and first_ms < total_ms
+    stats = streaming.get_streaming_stats()["single"]
+    assert stats["p50_first_result_ms"] > 0 and stats["p99_total_ms"] >= stats["p50_total_ms"]
+    print(f"[PASS] First result after {first_ms:.0f}ms, stream done after {total_ms:.0f}ms")
+
+    print("\n[OK] SSE single stream tests passed!")
+
+
+def test_ws_analyze():
+    """Test the multiplexed /ws/analyze WebSocket channel."""
+    print("\n" + "=" * 60)
+    print("TEST: WebSocket Channel")
+    print("=" * 60)
+
+    from app.main import app
+
+    from fastapi.testclient import TestClient
+    from app.core.executor import shutdown_executor
+
+    def read_until_done(ws, ids):
+        """Messages until every id in `ids` has ended."""
+        messages, open_ids = [], set(ids)
+        while open_ids:
+            message = ws.receive_json()
+            messages.append(message)
+            if message["event"] in ("complete", "batch_complete", "error", "cancelled"):
+                open_ids.discard(message["id"])
+        return messages
+
+    app.state.models = _fake_stream_registry(
+        delays={"finbert": 0.2, "twitter_sentiment": 0.1, "emotion_classifier": 0.1, "ner_model": 0.1},
+    )
+    os.environ["NLP_INFERENCE_WORKERS"] = "8"
+    os.environ["NLP_WS_MAX_REQUESTS"] = "2"
+    shutdown_executor()
+    try:
+        with TestClient(app).websocket_connect("/ws/analyze") as ws:
+            # Two requests on one connection, events interleaved by id
+            ws.send_json({"type": "analyze", "id": "a", "text": "Apple shares rose"})
+            ws.send_json({"type": "batch", "id": 7, "texts": ["Oil fell", "Gold rose"], "models": ["ner"]})
+            messages = read_until_done(ws, ["a", 7])
+            ids = [message["id"] for message in messages]
+            assert set(ids) == {"a", 7}
+            assert ids != sorted(ids, key=ids.index)  # Not one request after the other
+            single = [m for m in messages if m["id"] == "a"]
+            assert single[0]["event"] == "start" and single[-1]["event"] == "complete"
+            assert single[-1]["data"]["full_result"]["ner"]["entities"][0]["entity"] == "Apple"
+            batch = [m for m in messages if m["id"] == 7]
+            assert batch[-1]["event"] == "batch_complete" and batch[-1]["data"]["total_texts"] == 2
+            print(f"[PASS] Two requests multiplexed: {len(single)} + {len(batch)} messages interleaved")
+
+            # Cancelling one request leaves the other running
+            ws.send_json({"type": "analyze", "id": "slow", "text": "Apple shares rose"})
+            ws.send_json({"type": "analyze", "id": "keep", "text": "Tesla shares fell"})
+            ws.send_json({"type": "cancel", "id": "slow"})
+            messages = read_until_done(ws, ["slow", "keep"])
+            assert [m["event"] for m in messages if m["id"] == "slow"][-1] == "cancelled"
+            assert not any(m["event"] == "complete" for m in messages if m["id"] == "slow")
+            assert [m for m in messages if m["id"] == "keep"][-1]["event"] == "complete"
+            print("[PASS] Cancelled request stopped, the other completed")
+
+            # NLP_WS_MAX_REQUESTS in flight per connection
+            for request_id in ("r1", "r2", "r3"):
+                ws.send_json({"type": "analyze", "id": request_id, "text": "Apple shares rose"})
+            messages = read_until_done(ws, ["r1", "r2", "r3"])
+            rejected = [m for m in messages if m["id"] == "r3"]
+            assert len(rejected) == 1 and "Too many requests" in rejected[0]["data"]["error"]
+            assert all(m["event"] != "error" for m in messages if m["id"] in ("r1", "r2"))
+            print("[PASS] Requests over NLP_WS_MAX_REQUESTS rejected")
+
+            # Malformed messages are answered with an error; the connection stays open
+            ws.send_text("not json")
+            assert ws.receive_json() == {"id": None, "event": "error", "data": {"error": "Message must be a JSON object"}}
+            ws.send_json({"type": "subscribe", "id": "x"})
+            assert "Unknown message type" in ws.receive_json()["data"]["error"]
+            ws.send_json({"type": "analyze", "text": "No id"})
+            assert "'id'" in ws.receive_json()["data"]["error"]
+            ws.send_json({"type": "analyze", "id": "empty", "text": ""})
+            invalid = ws.receive_json()
+            assert invalid["id"] == "empty" and invalid["data"]["error"] == "Invalid request"
+            ws.send_json({"type": "analyze", "id": "ok", "text": "Still open"})
+            assert read_until_done(ws, ["ok"])[-1]["event"] == "complete"
+            print("[PASS] Malformed messages rejected, connection kept")
+    finally:
+        del os.environ["NLP_INFERENCE_WORKERS"], os.environ["NLP_WS_MAX_REQUESTS"]
+        shutdown_executor()
+
+    print("\n[OK] WebSocket channel tests passed!")
+
+
+async def test_sse_disconnect():
+    """Test that SSE streams drop their inference when the client disconnects."""
+    print("\n" + "=" * 60)
+    print("TEST: SSE Client Disconnect")
+    print("=" * 60)
+
+    from app import streaming
+
+    from app.core.executor import STREAMING_LANE, get_executor, shutdown_executor
+
+    def disconnect_after(polls):
+        """is_disconnected() stub: the client leaves at the given poll."""
+        checks = []
+
+        async def is_disconnected():
+            checks.append(True)
+            return len(checks) >= polls
+
+        return is_disconnected
+
+    calls = []
+    registry = _fake_stream_registry(delays={"twitter_sentiment": 0.2, "ner_model": 0.2}, calls=calls)
+    texts = [f"Company{i} shares rose" for i in range(6)]
+
+    # One worker: the first model call runs, everything else queues behind it
+    os.environ["NLP_INFERENCE_WORKERS"] = "1"
+    os.environ["NLP_SSE_SUB_BATCH"] = "2"
+    os.environ["NLP_SSE_DISCONNECT_POLL_MS"] = "20"
+    shutdown_executor()
+    try:
+        batch_latency = streaming._latency["batch"]
+        cancelled_units = batch_latency.cancelled_work_units
+        disconnects = streaming._sse_stats["disconnects"]
+        lane_cancelled = get_executor().get_stats()["lanes"][STREAMING_LANE]["cancelled"]
+
+        events = await _read_sse(streaming.stream_batch_analysis(
+            texts, registry, ["social", "ner"], is_disconnected=disconnect_after(3),
+        ))
+        names = [event for event, _ in events]
+        assert "model_complete" not in names and "batch_complete" not in names
+        # Closed while the first sub-batch ran; its second text was still buffered
+        assert names.count("text_start") == 1
+        assert streaming._sse_stats["disconnects"] == disconnects + 1
+
+        # Running call: its result is discarded. Queued: sub-batch 0 NER and
+        # sub-batch 1 (both models). Never launched: sub-batch 2 (both models)
+        assert batch_latency.cancelled_work_units == cancelled_units + 4 + 2
+        await asyncio.sleep(0.3)
+        assert [(key, called) for key, called, _, _ in calls] == [("twitter_sentiment", texts[:2])]
+        lanes = get_executor().get_stats()["lanes"][STREAMING_LANE]
+        assert lanes["cancelled"] == lane_cancelled + 3 and lanes["queued"] == 0
+        print(f"[PASS] Batch stream closed on disconnect: 1 call ran, 3 queued calls dropped, "
+              f"{batch_latency.cancelled_work_units - cancelled_units} work units cancelled")
+
+        # Single text: models still queued are dropped
+        calls.clear()
+        single = streaming._latency["single"]
+        cancelled_units = single.cancelled_work_units
+        events = await _read_sse(streaming.stream_single_analysis(
+            "Apple shares rose", registry, ["social", "ner"], is_disconnected=disconnect_after(3),
+        ))
+        assert [event for event, _ in events] == ["start", "progress", "progress"]
+        assert single.cancelled_work_units == cancelled_units + 2
+        await asyncio.sleep(0.3)
+        assert [key for key, _, _, _ in calls] == ["twitter_sentiment"]
+        print("[PASS] Single stream closed on disconnect, queued model dropped")
+    finally:
+        for name in ("NLP_INFERENCE_WORKERS", "NLP_SSE_SUB_BATCH", "NLP_SSE_DISCONNECT_POLL_MS"):
+            del os.environ[name]
+        shutdown_executor()
+
+    print("\n[OK] SSE disconnect tests passed!")
+
+
+async def test_admission_module():
+    """Test admission control and deadline-aware load shedding."""
+    print("\n" + "=" * 60)
+    print("TEST: Admission Control")
+    print("=" * 60)
+
+    from app.core.admission import (
+        AdmissionController,
+        AdmissionLimit,
+        AdmissionRejected,
+        parse_deadline_ms,
+    )
+
+    controller = AdmissionController(limits={"batch": AdmissionLimit(max_concurrent=1, max_queue=1)}, enabled=True)
+
+    # One running, one queued; a third is shed
+    running = await controller.acquire("batch", cost=10)
+    queued = asyncio.create_task(controller.acquire("batch", cost=10))
+    await asyncio.sleep(0)
+    try:
+        await controller.acquire("batch")
+        assert False, "Expected queue_full rejection"
+    except AdmissionRejected as e:
+        assert e.reason == "queue_full" and e.retry_after_header == "1"
+    print("[PASS] Full queue rejected")
+
+    running.release()
+    running.release()  # Idempotent
+    second = await queued
+    stats = controller.get_stats()["classes"]["batch"]
+    assert stats["in_flight"] == 1 and stats["waiting"] == 0 and stats["admitted"] == 2
+    print("[PASS] Queued request admitted when a slot frees")
+
+    # Teach the estimator 100ms per text, then send a request whose
+    # deadline is shorter than the queue it would join
+    second.release()
+    controller._lane("batch").ms_per_unit = 100.0
+    third = await controller.acquire("batch", cost=50)
+    try:
+        await controller.acquire("batch", cost=5, deadline_ms=1000)
+        assert False, "Expected deadline rejection"
+    except AdmissionRejected as e:
+        assert e.reason == "deadline" and e.retry_after >= 2.5
+        assert int(e.retry_after_header) >= 3
+    print("[PASS] Deadline shorter than estimated wait rejected up front")
+
+    # With no usable estimate the deadline bounds the time spent queued
+    controller._lane("batch").ms_per_unit = 0.0
+    try:
+        await controller.acquire("batch", deadline_ms=20)
+        assert False, "Expected deadline_expired rejection"
+    except AdmissionRejected as e:
+        assert e.reason == "deadline_expired"
+    third.release()
+    stats = controller.get_stats()["classes"]["batch"]
+    assert stats["rejected_deadline"] == 1 and stats["rejected_deadline_expired"] == 1
+    assert stats["in_flight"] == 0 and stats["waiting"] == 0
+    assert controller._lane("batch").semaphore._value == 1
+    print(f"[PASS] Deadline expiry while queued rejected: {stats}")
+
+    # A slot freed right as the deadline fires never leaks its permit
+    for _ in range(20):
+        controller._lane("batch").ms_per_unit = 0.0
+        holder = await controller.acquire("batch")
+        asyncio.get_running_loop().call_later(0.005, holder.release)
+        try:
+            (await controller.acquire("batch", deadline_ms=5)).release()
+        except AdmissionRejected as e:
+            assert e.reason == "deadline_expired"
+        await asyncio.sleep(0.01)
+    lane = controller._lane("batch")
+    assert lane.semaphore._value == 1 and lane.in_flight == 0 and lane.waiting == 0
+    print("[PASS] Permit count restored after deadline races")
+
+    disabled = AdmissionController(limits={"batch": AdmissionLimit(1, 0)}, enabled=False)
+    tickets = [await disabled.acquire("batch") for _ in range(5)]
+    for ticket in tickets:
+        ticket.release()
+    assert parse_deadline_ms({"X-Deadline-Ms": "250"}) == 250.0
+    assert parse_deadline_ms({"X-Deadline-Ms": "soon"}) is None
+    print("[PASS] Disabled controller admits everything; deadline header parsed")
+
+    # Deadline path end to end: a request that cannot get a slot within
+    # X-Deadline-Ms is shed with 429 and a Retry-After hint
+    import app.core.admission as admission
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    previous = admission._controller
+    admission._controller = AdmissionController(limits={"single": AdmissionLimit(0, 1)}, enabled=True)
+    try:
+        response = TestClient(app).post(
+            "/sentiment/finance", json={"text": "Apple shares rose"}, headers={"X-Deadline-Ms": "20"}
+        )
+        assert response.status_code == 429
+        assert response.json()["reason"] == "deadline_expired" and "Retry-After" in response.headers
+        lane = admission._controller._lane("single")
+        assert lane.waiting == 0 and lane.in_flight == 0 and lane.semaphore._value == 0
+    finally:
+        admission._controller = previous
+    print("[PASS] Expired X-Deadline-Ms answered with 429")
+
+    print("\n[OK] Admission control tests passed!")
+
+
+def test_serialization_module():
+    """Test fast JSON encoding and FastJSONResponse."""
+    print("\n" + "=" * 60)
+    print("TEST: Serialization")
+    print("=" * 60)
+
+    import json
+    from app.core.serialization import dumps, dumps_str, get_json_backend
+    from app.responses import FastJSONResponse
+    from app.schemas import EmotionScore, NERResponse, NEREntity
+
+    value = {"label": "positive", "score": 0.91, "text": "Überraschung", 3: [1, None, True]}
+    encoded = dumps(value)
+    assert encoded.startswith(b'{"label":"positive","score":0.91,')
+    assert "Überraschung".encode("utf-8") in encoded
+    assert json.loads(encoded) == {**{k: v for k, v in value.items() if k != 3}, "3": [1, None, True]}
+    assert json.loads(dumps_str(value)) == json.loads(encoded)
+    print(f"[PASS] Compact UTF-8 JSON via {get_json_backend()}")
+
+    # Non-native values: models, objects with .item(), integers past 64 bits
+    class Scalar:
+        def item(self):
+            return 0.5
+
+    encoded = dumps({"score": Scalar(), "emotion": EmotionScore(emotion="joy", score=0.7), "big": 2 ** 70})
+    assert json.loads(encoded) == {"score": 0.5, "emotion": {"emotion": "joy", "score": 0.7}, "big": 2 ** 70}
+    print("[PASS] Non-native values converted; oversized integers fall back to json")
+
+    response = NERResponse(
+        text="Apple in Cupertino",
+        entities=[NEREntity(entity="Apple", entity_type="ORG", confidence=0.99, start=0, end=5)],
+        entity_count=1,
+    )
+    rendered = FastJSONResponse(response)
+    assert rendered.media_type == "application/json"
+    assert json.loads(rendered.body) == response.model_dump()
+    assert json.loads(FastJSONResponse({"count": 2}).body) == {"count": 2}
+    print("[PASS] FastJSONResponse renders models and dicts")
+
+    print("\n[OK] Serialization tests passed!")
+
+
 def test_llm_schemas():
     """Test LLM schemas and validation."""
     print("\n" + "=" * 60)
@@ -266,8 +2044,27 @@ def main():
     print("#" * 60)
 
     test_cache_module()
+    test_model_cache_module()
+    test_single_flight_module()
     test_batching_module()
+    test_tokenization_module()
+    test_classify_encoded()
+    test_truncation_module()
     test_adaptive_module()
+    asyncio.run(test_executor_module())
+    asyncio.run(test_microbatch_module())
+    asyncio.run(test_batch_stream_module())
+    asyncio.run(test_jobs_module())
+    test_model_loading_module()
+    asyncio.run(test_sse_batch_stream())
+    asyncio.run(test_sse_single_stream())
+    test_ws_analyze()
+    asyncio.run(test_sse_disconnect())
+    asyncio.run(test_admission_module())
+    test_serialization_module()
+    test_parallel_module()
+    test_backends_module()
+    test_procpool_module()
     test_llm_schemas()
     test_summary_schemas()
     test_summary_storage()